@@ -0,0 +1,109 @@
+"""
+Benchmark: batched first-filing checks against the NumPy history index.
+
+Builds a synthetic full-market history (scrips x categories x filings over
+several years) and times the first-filing verdicts for a batch of candidates
+in one vectorized query, against a per-candidate scan of Python
+``Announcement`` lists as the reference.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_history_index.py --rows 1000000 --candidates 5000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from first_filings.exchange import Announcement
+from first_filings.history_index import HistoryIndex
+
+CATEGORIES = ["Analyst Call Intimation", "Press Release", "PPT"]
+END = datetime(2026, 10, 19)
+
+
+def synthetic_history(rows, scrips, years, seed=11):
+    rng = random.Random(seed)
+    days = years * 365
+    return [
+        Announcement(
+            scrip_code=str(500000 + rng.randrange(scrips)),
+            company_name="",
+            date=END - timedelta(days=rng.randrange(days)),
+            category=rng.choice(CATEGORIES),
+            description="",
+        )
+        for _ in range(rows)
+    ]
+
+
+def list_scan(history_by_key, candidates, lookback_years):
+    """Reference: filter each candidate's Python list of filings."""
+    lookback = timedelta(days=lookback_years * 365)
+    verdicts = []
+    for a in candidates:
+        start = (a.date - lookback).date()
+        end = a.date.date()
+        count = sum(
+            1
+            for d in history_by_key.get((a.scrip_code, a.category), ())
+            if start <= d.date() <= end
+        )
+        verdicts.append(count <= 1)
+    return verdicts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--scrips", type=int, default=6000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--candidates", type=int, default=5000)
+    parser.add_argument("--lookback-years", type=int, default=2)
+    args = parser.parse_args()
+
+    history = synthetic_history(args.rows, args.scrips, args.years)
+    start = END - timedelta(days=args.years * 365)
+
+    t = time.perf_counter()
+    index = HistoryIndex()
+    for category in CATEGORIES:
+        index.extend(
+            category, (a for a in history if a.category == category), start, END
+        )
+    build = time.perf_counter() - t
+
+    candidates = random.Random(3).sample(history, args.candidates)
+
+    t = time.perf_counter()
+    by_category = {}
+    for position, a in enumerate(candidates):
+        by_category.setdefault(a.category, []).append(position)
+    verdicts = [None] * len(candidates)
+    for category, positions in by_category.items():
+        batch = index.first_filing_verdicts(
+            [candidates[p].scrip_code for p in positions],
+            [category] * len(positions),
+            [candidates[p].date for p in positions],
+            args.lookback_years,
+        )
+        for p, verdict in zip(positions, batch):
+            verdicts[p] = verdict
+    indexed = time.perf_counter() - t
+
+    history_by_key = {}
+    for a in history:
+        history_by_key.setdefault((a.scrip_code, a.category), []).append(a.date)
+    t = time.perf_counter()
+    reference = list_scan(history_by_key, candidates, args.lookback_years)
+    scanned = time.perf_counter() - t
+
+    assert verdicts == reference, "index and list scan disagree"
+    print(f"rows={args.rows} candidates={args.candidates}")
+    print(f"index build          {build:8.3f}s")
+    print(f"indexed verdicts     {indexed:8.3f}s")
+    print(f"list scan verdicts   {scanned:8.3f}s  x{scanned / indexed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
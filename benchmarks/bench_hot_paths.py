@@ -0,0 +1,224 @@
+"""
+Micro-benchmarks: CPU-side hot paths on synthetic feeds, with no network.
+
+Cases:
+    bse_parse     Project raw BSE rows and build Announcements (DT_TM parsing)
+    nse_fetch     NSEClient.fetch_announcements on a fresh feed: projection,
+                  keyword classification, date parsing, Announcements
+    nse_buffered  The same on a buffered feed: date parsing and Announcements
+    t12m_scan     BSEClient.get_scrip_info scanning a T12M price series for
+                  five announcement dates
+    save_output   utils.save_output serializing that many enriched filings
+                  (to the null device)
+
+For each case and row count it reports the best wall time of ``--repeat``
+runs, throughput, and (in a separate, traced run) tracemalloc peak memory
+and bytes per row. ``--json`` saves the results; ``--compare`` prints the
+speed-up against a saved run, so parser or data-structure changes can be
+compared on the same synthetic data.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_hot_paths.py --rows 10000,100000,1000000
+    PYTHONPATH=src python benchmarks/bench_hot_paths.py --cases bse_parse --json before.json
+    PYTHONPATH=src python benchmarks/bench_hot_paths.py --cases bse_parse --compare before.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import time
+import tracemalloc
+from datetime import timedelta
+
+import synthetic
+from first_filings import utils
+from first_filings.bse_client import ANNOUNCEMENT_FIELDS as BSE_FIELDS
+from first_filings.bse_client import INTERNED_FIELDS as BSE_INTERNED
+from first_filings.bse_client import BSEClient
+from first_filings.exchange import project_fields
+from first_filings.nse_client import NSEClient
+
+
+class FakeBSE:
+    """Stands in for ``bse.BSE``: scrip info with a synthetic T12M series."""
+
+    def __init__(self, t12m=()):
+        self.t12m = list(t12m)
+
+    def lookup(self, scrip_code):
+        return {"symbol": "SYNTH", "company_name": "Synthetic Ltd"}
+
+    def quote(self, scrip_code):
+        return {"LTP": 123.45}
+
+    def getScripTradingStats(self, scrip_code):
+        return {"MktCapFull": "1,23,456.78"}
+
+    def resultsSnapshot(self, scrip_code):
+        return {"results_in_crores": {}}
+
+    def equityPriceVolumeT12M(self, scrip_code):
+        return {"Data": {"data": self.t12m}}
+
+    def exit(self):
+        pass
+
+
+class FakeNSE:
+    """Stands in for ``nse.NSE``: serves one synthetic announcement feed."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def announcements(self, **kwargs):
+        return self.rows
+
+
+def bse_parse(rows):
+    raw = synthetic.bse_rows(rows)
+    client = BSEClient(bse=FakeBSE())
+
+    def run():
+        return [
+            client._to_announcement(
+                project_fields(row, BSE_FIELDS, BSE_INTERNED), "PPT"
+            )
+            for row in raw
+        ]
+
+    return run
+
+
+def nse_client(rows):
+    client = NSEClient(nse=FakeNSE(synthetic.nse_rows(rows)))
+    start, end = synthetic.END - timedelta(days=730), synthetic.END
+    return client, lambda: client.fetch_announcements(start, end, "Press Release")
+
+
+def nse_fetch(rows):
+    client, fetch = nse_client(rows)
+
+    def run():
+        client.clear_buffers()
+        return fetch()
+
+    return run
+
+
+def nse_buffered(rows):
+    client, fetch = nse_client(rows)
+    fetch()
+    return fetch
+
+
+def t12m_scan(rows):
+    client = BSEClient(bse=FakeBSE(synthetic.t12m_rows(rows)))
+    dates = [synthetic.END - timedelta(days=30 * i) for i in range(5)]
+
+    def run():
+        return client.get_scrip_info("500001", dates[0], price_dates=dates[1:])
+
+    return run
+
+
+def save_output(rows):
+    data = synthetic.filings(rows)
+
+    # Serialization only: the document is written to the null device
+    def run():
+        return utils.save_output(data, 0, 2, filename=os.devnull)
+
+    return run
+
+
+CASES = {
+    "bse_parse": bse_parse,
+    "nse_fetch": nse_fetch,
+    "nse_buffered": nse_buffered,
+    "t12m_scan": t12m_scan,
+    "save_output": save_output,
+}
+
+
+def measure(case, rows, repeat):
+    run = CASES[case](rows)
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    result = run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    best = min(times)
+    return {
+        "case": case,
+        "rows": rows,
+        "seconds": best,
+        "rows_per_second": rows / best if best else None,
+        "peak_mib": (peak - baseline) / 2**20,
+        "bytes_per_row": (peak - baseline) / rows,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--rows",
+        default="10000,100000",
+        help="Comma-separated row counts (e.g. 10000,100000,1000000).",
+    )
+    parser.add_argument(
+        "--cases",
+        default=",".join(CASES),
+        help=f"Comma-separated cases ({', '.join(CASES)}).",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Write the results to this file.")
+    parser.add_argument("--compare", help="Results file from an earlier run.")
+    args = parser.parse_args()
+
+    cases = [case.strip() for case in args.cases.split(",") if case.strip()]
+    unknown = sorted(set(cases) - set(CASES))
+    if unknown:
+        parser.error(f"Unknown cases: {', '.join(unknown)}")
+    row_counts = [int(rows) for rows in args.rows.split(",")]
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {(r["case"], r["rows"]): r for r in json.load(f)["results"]}
+
+    print(
+        f"{'case':<13} {'rows':>9} {'best s':>9} {'rows/s':>12} {'peak MiB':>9} {'B/row':>7}"
+        + ("  speed-up" if baseline else "")
+    )
+    results = []
+    for case in cases:
+        for rows in row_counts:
+            r = measure(case, rows, args.repeat)
+            results.append(r)
+            line = (
+                f"{case:<13} {rows:>9} {r['seconds']:>9.4f} {r['rows_per_second']:>12,.0f}"
+                f" {r['peak_mib']:>9.1f} {r['bytes_per_row']:>7.0f}"
+            )
+            before = baseline.get((case, rows))
+            if before:
+                line += f"  {before['seconds'] / r['seconds']:7.2f}x"
+            print(line, flush=True)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"repeat": args.repeat, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
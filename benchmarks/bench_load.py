@@ -0,0 +1,115 @@
+"""
+Load test: concurrent pooled clients against the local mock exchange.
+
+Runs the real ``bse`` library, ``BSEClient`` and ``retry_exchange`` against
+``mock_exchange.MockExchange`` with the given latency, fault and rate-limit
+settings: one paginated period fetch, then ``get_scrip_info`` for each
+distinct scrip from ``--workers`` threads sharing a ``ClientPool``. Reports
+wall time, request throughput, responses by status and peak concurrency.
+
+Retry backoff is the production ``retry_exchange`` policy unless
+``--fast-retries`` is given, which retries immediately (same attempts).
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_load.py --rows 2000 --workers 8 --latency 0.02,0.2
+    PYTHONPATH=src python benchmarks/bench_load.py --fail-rate 0.1 --fail-status 429 --fast-retries
+"""
+
+import argparse
+import contextlib
+import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import mock_exchange
+from first_filings.bse_client import BSEClient
+from first_filings.pool import ClientPool
+
+
+def announcements(rows, companies):
+    now = datetime.now().replace(microsecond=0)
+    return [
+        mock_exchange.bse_row(
+            500000 + i % companies,
+            now - timedelta(minutes=i),
+            "Press Release / Media Release",
+            i,
+        )
+        for i in range(rows)
+    ]
+
+
+def run(args):
+    latency = [float(x) for x in args.latency.split(",")]
+    server = mock_exchange.MockExchange(
+        bse_announcements=announcements(args.rows, args.companies),
+        latency=latency[0] if len(latency) == 1 else tuple(latency),
+        fail_rate=args.fail_rate,
+        fail_status=args.fail_status,
+        rate_limit=args.rate_limit,
+    )
+    retries = (
+        mock_exchange.fast_retries(BSEClient)
+        if args.fast_retries
+        else contextlib.nullcontext()
+    )
+
+    with tempfile.TemporaryDirectory() as folder, server, retries:
+        pool = ClientPool(
+            lambda: BSEClient(bse=server.connect_bse(folder)), size=args.workers
+        )
+        end = datetime.now()
+        started = time.perf_counter()
+
+        with pool.checkout() as client:
+            filings = client.fetch_announcements(
+                end - timedelta(days=30), end, "Press Release"
+            )
+        fetched = time.perf_counter()
+
+        def enrich(scrip_code):
+            with pool.checkout() as client:
+                return client.get_scrip_info(scrip_code, end)
+
+        scrips = sorted({a.scrip_code for a in filings})
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            infos = list(executor.map(enrich, scrips))
+        finished = time.perf_counter()
+        pool.close()
+
+    stats = dict(server.stats)
+    return {
+        "announcements": len(filings),
+        "scrips": len(scrips),
+        "enriched": sum(1 for info in infos if info and info.get("symbol")),
+        "fetch_seconds": fetched - started,
+        "enrich_seconds": finished - fetched,
+        "requests_per_second": stats.get("requests", 0) / (finished - started),
+        "stats": stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--companies", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--latency", default="0", help="Seconds, or a min,max range (e.g. 0.02,0.2)."
+    )
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--fail-status", type=int, default=503)
+    parser.add_argument("--rate-limit", type=int, default=None)
+    parser.add_argument("--fast-retries", action="store_true")
+    args = parser.parse_args()
+
+    # The per-page politeness delay would dominate a local run
+    with patch("first_filings.config.BSE_REQUEST_DELAY", 0):
+        print(json.dumps(run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Memory benchmark: peak and retained memory of a large BSE "General" fetch.
+
+Serves synthetic BSE announcement pages (the full ~27-field rows the API
+returns, 50 per page) from an in-process fake library and measures, with
+``tracemalloc``, a ``PPT`` lookup, which downloads both "Investor
+Presentation" and the large "General" subcategory. Retained memory is what
+stays alive afterwards: the returned announcements plus the buffered General
+feed.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_memory.py --rows 100000
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from datetime import datetime
+from unittest.mock import patch
+
+from first_filings.bse_client import BSEClient
+from synthetic import PAGE_SIZE, bse_rows
+
+
+class FakeBSE:
+    """Stands in for ``bse.BSE``; each page is freshly decoded like a real response."""
+
+    def __init__(self, rows):
+        self.pages = [
+            json.dumps(
+                {
+                    "Table": rows[i : i + PAGE_SIZE],
+                    "Table1": [{"ROWCNT": len(rows)}],
+                }
+            )
+            for i in range(0, len(rows), PAGE_SIZE)
+        ]
+
+    def announcements(self, page_no, subcategory=None, **kwargs):
+        if subcategory != "General" or page_no > len(self.pages):
+            return {"Table": [], "Table1": [{"ROWCNT": 0}]}
+        return json.loads(self.pages[page_no - 1])
+
+    def exit(self):
+        pass
+
+
+def measure(rows):
+    client = BSEClient(bse=FakeBSE(bse_rows(rows)))
+    gc.collect()
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    with patch("first_filings.config.BSE_REQUEST_DELAY", 0):
+        result = client.fetch_announcements(
+            datetime(2024, 10, 19), datetime(2026, 10, 19), "PPT"
+        )
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return len(result), (peak - baseline) / 2**20, (retained - baseline) / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    matched, peak, retained = measure(args.rows)
+    print(f"rows={args.rows} matched={matched}")
+    print(f"peak     {peak:8.1f} MiB")
+    print(f"retained {retained:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Micro-benchmark: NSE keyword classification on a synthetic feed.
+
+Compares the previous per-category nested substring loop (one pass over the
+feed per category) against ``KeywordClassifier.classify`` (one pass that tags
+every category), plus a combined-regex variant for reference.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_nse_classifier.py --rows 200000
+"""
+
+import argparse
+import random
+import re
+import timeit
+
+from first_filings import config
+from first_filings.classifier import KeywordClassifier
+
+FILLER = (
+    "board meeting outcome of the company intimation under regulation 30 sebi "
+    "listing obligations disclosure requirements newspaper publication trading "
+    "window closure certificate compliance shareholding pattern"
+).split()
+
+MATCHES = [
+    "Analysts/Institutional Investor Meet/Con. Call Updates",
+    "Press Release",
+    "Investor Presentation",
+    "Media Release",
+]
+
+
+def synthetic_descriptions(rows, match_rate=0.1, seed=42):
+    """Generate NSE-like announcement descriptions."""
+    rng = random.Random(seed)
+    descriptions = []
+    for _ in range(rows):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(4, 14))]
+        if rng.random() < match_rate:
+            words.append(rng.choice(MATCHES))
+        descriptions.append(" ".join(words).title())
+    return descriptions
+
+
+def per_category_loop(descriptions, category_keywords):
+    """Previous behaviour: one nested-loop pass per requested category."""
+    matched = 0
+    for keywords in category_keywords.values():
+        lowered_keywords = [kw.lower() for kw in keywords]
+        for desc in descriptions:
+            desc_lower = desc.lower()
+            for kw in lowered_keywords:
+                if kw in desc_lower:
+                    matched += 1
+                    break
+    return matched
+
+
+def single_pass(descriptions, classifier):
+    """New behaviour: each description classified once into all categories."""
+    classify = classifier.classify
+    return sum(len(classify(desc)) for desc in descriptions)
+
+
+def combined_regex(descriptions, category_keywords):
+    """Reference: one alternation regex over all keywords."""
+    keyword_categories = {}
+    for category, keywords in category_keywords.items():
+        for kw in keywords:
+            keyword_categories.setdefault(kw.lower(), set()).add(category)
+    pattern = re.compile(
+        "(?=("
+        + "|".join(
+            re.escape(kw) for kw in sorted(keyword_categories, key=len, reverse=True)
+        )
+        + "))"
+    )
+    matched = 0
+    for desc in descriptions:
+        found = set()
+        for m in pattern.finditer(desc.lower()):
+            found |= keyword_categories[m.group(1)]
+        matched += len(found)
+    return matched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    keywords = config.NSE_CATEGORY_KEYWORDS
+    descriptions = synthetic_descriptions(args.rows)
+    classifier = KeywordClassifier(keywords)
+
+    cases = {
+        "per-category loop": lambda: per_category_loop(descriptions, keywords),
+        "single-pass classifier": lambda: single_pass(descriptions, classifier),
+        "combined regex": lambda: combined_regex(descriptions, keywords),
+    }
+
+    print(f"rows={args.rows} categories={len(keywords)}")
+    baseline = None
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        baseline = baseline or best
+        print(
+            f"{name:<24} {best:8.3f}s  {args.rows / best:12,.0f} rows/s  "
+            f"x{baseline / best:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
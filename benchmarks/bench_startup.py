@@ -0,0 +1,93 @@
+"""
+Startup benchmark for the first-filings CLI.
+
+Measures cold-process import time of ``first_filings.cli``, ``--help``
+wall time, and (with ``--network``) time to the first exchange request.
+Each measurement runs in a fresh interpreter so nothing is cached in-process.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_startup.py
+    PYTHONPATH=src python benchmarks/bench_startup.py --network --exchange bse
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ("bse", "nse", "httpx", "requests")
+
+IMPORT_PROBE = (
+    "import sys, time; t = time.perf_counter(); import first_filings.cli; "
+    "print(time.perf_counter() - t); "
+    f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+)
+
+FIRST_REQUEST_PROBE = """
+import time
+t = time.perf_counter()
+from datetime import datetime
+from first_filings.clients import create_client
+client = create_client({exchange!r})
+t_client = time.perf_counter()
+today = datetime.now()
+client.fetch_announcements(today, today, category="Press Release")
+print(t_client - t, time.perf_counter() - t)
+"""
+
+
+def run_python(code, env):
+    """Run ``code`` in a fresh interpreter and return (wall seconds, stdout)."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return time.perf_counter() - start, result.stdout.strip().splitlines()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--network", action="store_true")
+    parser.add_argument("--exchange", default="bse")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+
+    import_times, help_times = [], []
+    heavy = ""
+    for _ in range(args.runs):
+        _, out = run_python(IMPORT_PROBE, env)
+        import_times.append(float(out[0]))
+        heavy = out[1] if len(out) > 1 else ""
+        wall, _ = run_python(
+            "import sys; sys.argv = ['first-filings', '--help']\n"
+            "from first_filings.cli import main\n"
+            "try:\n    main()\nexcept SystemExit:\n    pass",
+            env,
+        )
+        help_times.append(wall)
+
+    print(
+        f"import first_filings.cli  median {statistics.median(import_times) * 1000:7.1f} ms"
+    )
+    print(
+        f"first-filings --help      median {statistics.median(help_times) * 1000:7.1f} ms (process wall)"
+    )
+    print(f"heavy modules imported    {heavy or 'none'}")
+
+    if args.network:
+        wall, out = run_python(FIRST_REQUEST_PROBE.format(exchange=args.exchange), env)
+        client_s, first_s = (float(v) for v in out[-1].split())
+        print(f"{args.exchange} client construction {client_s * 1000:7.1f} ms")
+        print(f"{args.exchange} first request      {first_s * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+"""
+Local stand-in for the BSE and NSE HTTP APIs, for offline load and
+resilience testing.
+
+Serves the endpoints the ``bse`` and ``nse`` libraries call for this
+project, so the real libraries, clients and ``retry_exchange`` run
+unchanged against it:
+
+    BSE  /bse/api/AnnSubCategoryGetData/w   announcements, paginated
+                                            (``Table``, ``Table1[0].ROWCNT``)
+         /bse/api/PeerSmartSearch/w         lookup
+         /bse/api/getScripHeaderData/w      quote
+         /bse/api/StockTrading/w            trading stats (market cap)
+         /bse/api/StockReachGraph/w         T12M price history
+         /bse/api/TabResults_PAR/w          results snapshot
+    NSE  /nse/api/corporate-announcements   announcement feed
+         /nse/api/quote-equity              quote
+         /nse/api/historical/cm/equity      price history
+
+Faults are configurable on the server (and can be changed while it runs):
+``latency`` (seconds, or a (min, max) range), ``fail_rate`` /
+``fail_first`` (inject ``fail_status``, e.g. 429 or 503) and ``rate_limit``
+(requests per second; excess requests get 429 with ``Retry-After``).
+``stats`` counts requests per endpoint and status, and the peak number of
+requests in flight.
+
+Usage (standalone, with synthetic data):
+    PYTHONPATH=src python benchmarks/mock_exchange.py --rows 10000 --latency 0.05 --fail-rate 0.05
+"""
+
+import argparse
+import json
+import pickle
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+BSE_PAGE_SIZE = 50
+
+
+def bse_row(scrip_code, when, subcategory, index, subject=None):
+    """A BSE announcement row with the fields the client reads."""
+    subject = subject or subcategory
+    return {
+        "NEWSID": f"mock-{index:08d}",
+        "SCRIP_CD": int(scrip_code),
+        "NEWSSUB": f"Company {scrip_code} Ltd - {scrip_code} - {subject}",
+        "HEADLINE": f"{subject} by Company {scrip_code} Ltd",
+        "DT_TM": when.isoformat(timespec="milliseconds"),
+        "SLONGNAME": f"Company {scrip_code} Ltd",
+        "ATTACHMENTNAME": f"mock-{index:08d}.pdf",
+        "SUBCATNAME": subcategory,
+    }
+
+
+def nse_row(symbol, when, desc, index):
+    """An NSE announcement row with the fields the client reads."""
+    return {
+        "seq_id": str(100000000 + index),
+        "symbol": symbol,
+        "sm_name": f"{symbol.title()} Limited",
+        "desc": desc,
+        "an_dt": when.strftime("%d-%b-%Y %H:%M:%S"),
+        "sort_date": when.strftime("%Y-%m-%d %H:%M:%S"),
+        "attchmntFile": f"https://nsearchives.nseindia.com/corporate/{symbol}_{index}.pdf",
+    }
+
+
+@contextmanager
+def fast_retries(*classes, wait=None):
+    """
+    Replace the backoff of every ``retry_exchange`` method of ``classes``
+    (default: none, i.e. retry at once), keeping the retry policy itself.
+    """
+    import tenacity
+
+    wait = wait or tenacity.wait_none()
+    with ExitStack() as stack:
+        for cls in classes:
+            for attr in vars(cls).values():
+                retrying = getattr(attr, "retry", None)
+                if isinstance(retrying, tenacity.BaseRetrying):
+                    stack.enter_context(patch.object(retrying, "wait", wait))
+        yield
+
+
+class MockExchange(ThreadingHTTPServer):
+    """
+    Threaded HTTP server emulating the BSE and NSE APIs over given rows.
+
+    Use as a context manager, or call ``start`` / ``stop``. Point library
+    instances at it with ``connect_bse`` / ``connect_nse``.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        bse_announcements=(),
+        nse_announcements=(),
+        price=100.0,
+        latency=0.0,
+        fail_rate=0.0,
+        fail_first=0,
+        fail_status=503,
+        rate_limit=None,
+        seed=0,
+        port=0,
+    ):
+        super().__init__(("127.0.0.1", port), MockExchangeHandler)
+        self.bse_announcements = list(bse_announcements)
+        self.nse_announcements = list(nse_announcements)
+        self.price = price
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.rate_limit = rate_limit
+
+        self.stats = Counter()
+        self.lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._in_flight = 0
+        self._window = (0, 0)  # (second, requests served in it)
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def connect_bse(self, download_folder):
+        """A ``bse.BSE`` instance that talks to this server."""
+        from bse import BSE
+
+        bse = BSE(download_folder=download_folder)
+        bse.api_url = f"{self.url}/bse/api"
+        return bse
+
+    def connect_nse(self, download_folder):
+        """
+        An ``nse.NSE`` instance that talks to this server. An empty cookie
+        file is written first, so the library skips its nseindia.com
+        handshake.
+        """
+        from nse import NSE
+
+        folder = Path(download_folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / "nse_cookies_httpx.pkl").write_bytes(pickle.dumps({}))
+        nse = NSE(download_folder=folder, server=True)
+        nse.base_url = f"{self.url}/nse/api"
+        return nse
+
+    def admit(self):
+        """
+        Decide how to answer the next request: None to serve it, else an
+        injected (status, headers) error.
+        """
+        with self.lock:
+            self.stats["requests"] += 1
+            self._in_flight += 1
+            self.stats["peak_in_flight"] = max(
+                self.stats["peak_in_flight"], self._in_flight
+            )
+
+            if self.rate_limit:
+                second = int(time.monotonic())
+                start, served = self._window
+                served = served + 1 if start == second else 1
+                self._window = (second, served)
+                if served > self.rate_limit:
+                    return 429, {"Retry-After": "1"}
+
+            if self.stats["requests"] <= self.fail_first or (
+                self.fail_rate and self._random.random() < self.fail_rate
+            ):
+                headers = {"Retry-After": "1"} if self.fail_status == 429 else {}
+                return self.fail_status, headers
+        return None
+
+    def release(self):
+        with self.lock:
+            self._in_flight -= 1
+
+    def delay(self):
+        latency = self.latency
+        if isinstance(latency, (tuple, list)):
+            with self.lock:
+                latency = self._random.uniform(*latency)
+        if latency:
+            time.sleep(latency)
+
+    # BSE endpoints
+
+    def bse_announcements_page(self, params):
+        fmt = "%Y%m%d"
+        from_day = datetime.strptime(params["strPrevDate"], fmt).date()
+        to_day = datetime.strptime(params["strToDate"], fmt).date()
+        subcategory = params.get("subcategory", "-1")
+        scrip = params.get("strscrip")
+
+        rows = [
+            row
+            for row in self.bse_announcements
+            if from_day <= datetime.fromisoformat(row["DT_TM"]).date() <= to_day
+            and (subcategory == "-1" or row.get("SUBCATNAME") == subcategory)
+            and (not scrip or str(row["SCRIP_CD"]) == scrip)
+        ]
+        page = int(params.get("pageno", 1))
+        start = (page - 1) * BSE_PAGE_SIZE
+        return {
+            "Table": rows[start : start + BSE_PAGE_SIZE],
+            "Table1": [{"ROWCNT": len(rows)}],
+        }
+
+    def bse_lookup(self, params):
+        code = params.get("text", "")
+        if not any(str(row["SCRIP_CD"]) == code for row in self.bse_announcements):
+            return ""
+        return (
+            f'<li><a href="#"><span>Company {code} Ltd</span>'
+            f"<span>SYM{code}&nbsp;&nbsp;INE{code}01&nbsp;&nbsp;<strong>{code}</strong></span></a></li>"
+        )
+
+    def bse_quote(self, params):
+        price = f"{self.price:.2f}"
+        return {
+            "Header": {
+                "PrevClose": price,
+                "Open": price,
+                "High": price,
+                "Low": price,
+                "LTP": price,
+            }
+        }
+
+    def bse_t12m(self, params):
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        rows = [
+            {
+                "dttm": (today - timedelta(days=days)).strftime("%a %b %d %Y %H:%M:%S"),
+                "vale1": f"{self.price:.2f}",
+                "vole": 1000,
+            }
+            for days in range(365, -1, -1)
+        ]
+        return {"Data": json.dumps(rows)}
+
+    # NSE endpoints
+
+    def nse_feed(self, params):
+        fmt = "%d-%m-%Y"
+        rows = self.nse_announcements
+        if "from_date" in params:
+            from_day = datetime.strptime(params["from_date"], fmt).date()
+            to_day = datetime.strptime(params["to_date"], fmt).date()
+            rows = [
+                row
+                for row in rows
+                if from_day
+                <= datetime.strptime(row["an_dt"], "%d-%b-%Y %H:%M:%S").date()
+                <= to_day
+            ]
+        if params.get("symbol"):
+            rows = [row for row in rows if row["symbol"] == params["symbol"]]
+        return rows
+
+    def nse_quote(self, params):
+        return {
+            "info": {
+                "symbol": params.get("symbol"),
+                "companyName": f"{params.get('symbol', '').title()} Limited",
+                "activeSeries": ["EQ"],
+            },
+            "priceInfo": {"lastPrice": self.price},
+            "securityInfo": {"issuedSize": 10_000_000},
+        }
+
+    def nse_history(self, params):
+        fmt = "%d-%m-%Y"
+        from_day = datetime.strptime(params["from"], fmt)
+        to_day = datetime.strptime(params["to"], fmt)
+        days = (to_day - from_day).days
+        # Newest first, like NSE
+        return {
+            "data": [
+                {
+                    "mtimestamp": (to_day - timedelta(days=i)).strftime("%d-%b-%Y"),
+                    "chClosingPrice": self.price,
+                }
+                for i in range(days + 1)
+            ]
+        }
+
+
+ROUTES = {
+    "/bse/api/AnnSubCategoryGetData/w": MockExchange.bse_announcements_page,
+    "/bse/api/PeerSmartSearch/w": MockExchange.bse_lookup,
+    "/bse/api/getScripHeaderData/w": MockExchange.bse_quote,
+    "/bse/api/StockTrading/w": lambda server, params: {"MktCapFull": "1,000.00"},
+    "/bse/api/StockReachGraph/w": MockExchange.bse_t12m,
+    "/bse/api/TabResults_PAR/w": lambda server, params: {"col1": "(Cr)"},
+    "/nse/api/corporate-announcements": MockExchange.nse_feed,
+    "/nse/api/quote-equity": MockExchange.nse_quote,
+    "/nse/api/historical/cm/equity": MockExchange.nse_history,
+}
+
+
+class MockExchangeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        route = ROUTES.get(url.path)
+
+        injected = self.server.admit()
+        try:
+            self.server.delay()
+            if route is None:
+                self.respond(404, b"Not found")
+            elif injected:
+                status, headers = injected
+                self.respond(status, b"", headers)
+            else:
+                body = route(self.server, params)
+                if isinstance(body, str):
+                    self.respond(200, body.encode(), content_type="text/html")
+                else:
+                    self.respond(200, json.dumps(body).encode())
+        finally:
+            self.server.release()
+
+    def respond(self, status, body, headers=None, content_type="application/json"):
+        with self.server.lock:
+            self.server.stats[f"status_{status}"] += 1
+            self.server.stats[urlparse(self.path).path] += 1
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    import synthetic
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--fail-status", type=int, default=503)
+    parser.add_argument("--rate-limit", type=int, default=None)
+    args = parser.parse_args()
+
+    server = MockExchange(
+        bse_announcements=synthetic.bse_rows(args.rows),
+        nse_announcements=synthetic.nse_rows(args.rows),
+        latency=args.latency,
+        fail_rate=args.fail_rate,
+        fail_status=args.fail_status,
+        rate_limit=args.rate_limit,
+        port=args.port,
+    )
+    print(f"Serving mock BSE at {server.url}/bse/api and NSE at {server.url}/nse/api")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
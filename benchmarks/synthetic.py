@@ -0,0 +1,159 @@
+"""
+Synthetic exchange data for the benchmarks. No network access.
+
+Generators are seeded, so a given ``rows`` and ``seed`` always produce the
+same feed, and runs on different branches can be compared.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+END = datetime(2026, 10, 19)
+PAGE_SIZE = 50
+COMPANIES = 4000
+
+BSE_SUBJECTS = [
+    "Investor Presentation",
+    "Intimation Under Regulation 30",
+    "Updates",
+    "Clarification sought on news item",
+    "Disclosure under Regulation 30 - Presentation",
+]
+
+NSE_FILLER = (
+    "board meeting outcome of the company intimation under regulation 30 sebi "
+    "listing obligations disclosure requirements newspaper publication trading "
+    "window closure certificate compliance shareholding pattern"
+).split()
+
+NSE_MATCHES = [
+    "Analysts/Institutional Investor Meet/Con. Call Updates",
+    "Press Release",
+    "Investor Presentation",
+    "Media Release",
+]
+
+CATEGORIES = ["Analyst Call Intimation", "Press Release", "PPT"]
+
+
+def bse_rows(rows, seed=7):
+    """BSE announcement rows (all ~27 API fields) spread over two years."""
+    rng = random.Random(seed)
+    start = END - timedelta(days=2 * 365)
+    data = []
+    for i in range(rows):
+        scrip = 500000 + rng.randrange(COMPANIES)
+        dt = start + timedelta(minutes=rng.randrange(2 * 365 * 24 * 60))
+        subject = rng.choice(BSE_SUBJECTS)
+        data.append(
+            {
+                "NEWSID": f"{i:08d}-a1b2-4c3d-9e8f-{scrip:012d}",
+                "SCRIP_CD": scrip,
+                "XML_NAME": f"CorpAttachment_{i}.xml",
+                "NEWSSUB": f"Company {scrip} Ltd - {scrip} - {subject}",
+                "DT_TM": dt.isoformat(timespec="milliseconds"),
+                "NEWS_DT": dt.isoformat(timespec="milliseconds"),
+                "CRITICALNEWS": 0,
+                "ANNOUNCEMENT_TYPE": "A",
+                "QUARTER_ID": None,
+                "FILESTATUS": "N",
+                "ATTACHMENTNAME": f"{i:08d}-{scrip}.pdf",
+                "MORE": "",
+                "HEADLINE": f"{subject} made by Company {scrip} Ltd under Regulation 30.",
+                "CATEGORYNAME": "Company Update",
+                "OLD": 1,
+                "RN": i % PAGE_SIZE + 1,
+                "PDFFLAG": 0,
+                "NSURL": f"https://www.bseindia.com/stock-share-price/company-{scrip}/{scrip}/",
+                "SLONGNAME": f"Company {scrip} Ltd",
+                "AGENDA_ID": 0,
+                "TotalPageCnt": rows // PAGE_SIZE + 1,
+                "News_submission_dt": dt.isoformat(timespec="milliseconds"),
+                "DissemDT": dt.isoformat(timespec="milliseconds"),
+                "TimeDiff": "00:00:01",
+                "Fld_Attachsize": rng.randrange(10_000, 5_000_000),
+                "SUBCATNAME": "General",
+                "AUDIO_VIDEO_FILE": None,
+            }
+        )
+    return data
+
+
+def nse_description(rng, match_rate=0.1):
+    words = [rng.choice(NSE_FILLER) for _ in range(rng.randint(4, 14))]
+    if rng.random() < match_rate:
+        words.append(rng.choice(NSE_MATCHES))
+    return " ".join(words).title()
+
+
+def nse_rows(rows, match_rate=0.1, seed=42):
+    """NSE announcement rows, as returned by ``NSE.announcements``."""
+    rng = random.Random(seed)
+    start = END - timedelta(days=2 * 365)
+    data = []
+    for i in range(rows):
+        symbol = f"SYM{rng.randrange(COMPANIES):04d}"
+        dt = start + timedelta(seconds=rng.randrange(2 * 365 * 24 * 60 * 60))
+        data.append(
+            {
+                "symbol": symbol,
+                "desc": nse_description(rng, match_rate),
+                "dt": dt.strftime("%d%m%Y%H%M%S"),
+                "attchmntFile": f"https://nsearchives.nseindia.com/corporate/{symbol}_{i}.pdf",
+                "sm_name": f"{symbol.title()} Limited",
+                "sm_isin": f"INE{i % 1000000:06d}01",
+                "an_dt": dt.strftime("%d-%b-%Y %H:%M:%S"),
+                "sort_date": dt.strftime("%Y-%m-%d %H:%M:%S"),
+                "seq_id": str(100000000 + i),
+                "smIndustry": "Finance",
+                "orgid": None,
+                "attchmntText": "Outcome of the meeting of the board held today.",
+                "bflag": None,
+                "old_new": None,
+                "csvName": None,
+                "exchdisstime": dt.strftime("%d-%b-%Y %H:%M:%S"),
+                "difference": "00:00:02",
+                "fileSize": f"{rng.randrange(10, 5000)} KB",
+                "hasXbrl": False,
+            }
+        )
+    return data
+
+
+def t12m_rows(rows, seed=3):
+    """BSE ``equityPriceVolumeT12M`` rows ([date, price, volume]), oldest first."""
+    rng = random.Random(seed)
+    price = 100.0
+    data = []
+    for i in range(rows, 0, -1):
+        price = max(1.0, price * (1 + rng.gauss(0, 0.02)))
+        day = END - timedelta(days=i)
+        data.append(
+            [day.strftime("%a %b %d %Y 00:00:00"), f"{price:.2f}", rng.randrange(10**6)]
+        )
+    return data
+
+
+def filings(rows, seed=5):
+    """Enriched first filings ({category: [filing dict]}) for ``utils.save_output``."""
+    rng = random.Random(seed)
+    data = {}
+    for i in range(rows):
+        scrip = 500000 + rng.randrange(COMPANIES)
+        day = END - timedelta(days=rng.randrange(90))
+        data.setdefault(rng.choice(CATEGORIES), []).append(
+            {
+                "scrip_code": str(scrip),
+                "company_name": f"Company {scrip} Ltd",
+                "date": day.date().isoformat(),
+                "price_at_announcement": round(rng.uniform(5, 5000), 2),
+                "current_price": round(rng.uniform(5, 5000), 2),
+                "current_mkt_cap_cr": rng.randrange(10, 500000),
+                "attachment_url": f"https://www.bseindia.com/xml-data/corpfiling/AttachLive/{i:08d}.pdf",
+                "financial_snapshot": {
+                    "revenue": [round(rng.uniform(1, 1000), 2) for _ in range(4)],
+                    "net_profit": [round(rng.uniform(-50, 200), 2) for _ in range(4)],
+                },
+            }
+        )
+    return data
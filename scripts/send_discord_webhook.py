@@ -1,24 +1,164 @@
 import argparse
+import json
 import os
 import sys
-import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from first_filings.config import DELIVERY_LEDGER_FILE
+from first_filings.ledger import DeliveryLedger
 
 MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_DESCRIPTION = 4000
+MAX_MESSAGE_CHARS = 6000  # Discord limit across all embeds of one message
 MAX_FIELD_VALUE = 1000
+EMBED_COLOR = 3447003  # Blueish
+MAX_ATTEMPTS = 5
+REQUEST_TIMEOUT = 10
+
+# Row order of the output file's "columns"
+ROW_FIELDS = ["scrip_code", "company_name", "price_at_announcement", "current_price", "current_mkt_cap_cr", "attachment_url", "financial_snapshot"]
+
+class RateLimiter:
+    """
+    Shared pause state for one webhook, driven by Discord's X-RateLimit-*
+    and Retry-After headers, so concurrent workers back off together.
+    """
+
+    def __init__(self, sleep=time.sleep, clock=time.monotonic):
+        self.sleep = sleep
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.blocked_until = 0.0
+
+    def wait(self):
+        while True:
+            with self.lock:
+                delay = self.blocked_until - self.clock()
+            if delay <= 0:
+                return
+            self.sleep(delay)
+
+    def block_for(self, seconds):
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, self.clock() + seconds)
+
+    def update(self, response):
+        """Pause when the bucket is exhausted; return the 429 retry delay, if any."""
+        headers = response.headers
+        if headers.get("X-RateLimit-Remaining") == "0":
+            self.block_for(float(headers.get("X-RateLimit-Reset-After", 1)))
+
+        if response.status_code != 429:
+            return None
+
+        retry_after = headers.get("Retry-After")
+        if retry_after is None:
+            try:
+                retry_after = response.json().get("retry_after")
+            except ValueError:
+                retry_after = None
+        retry_after = float(retry_after or 1)
+        self.block_for(retry_after)
+        return retry_after
+
+class WebhookSender:
+    """
+    Posts messages to a Discord webhook through one pooled keep-alive
+    session. Rate limits are honoured, and 429s, 5xx responses and connection
+    errors are retried up to MAX_ATTEMPTS times.
+    """
+
+    def __init__(self, webhook_url, workers=1, session=None, sleep=time.sleep):
+        self.webhook_url = webhook_url
+        self.workers = workers
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(workers, 1))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.sleep = sleep
+        self.limiter = RateLimiter(sleep=sleep)
+
+    def post(self, payload):
+        """Post one message. Returns True once Discord accepts it."""
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            self.limiter.wait()
+            try:
+                response = self.session.post(self.webhook_url, json=payload, timeout=REQUEST_TIMEOUT)
+            except requests.RequestException as e:
+                print(f"Error sending message (attempt {attempt}): {e}")
+                self.sleep(2 ** (attempt - 1))
+                continue
+
+            retry_after = self.limiter.update(response)
+            if response.status_code in (200, 204):
+                return True
+            if retry_after is not None:
+                print(f"Rate limited; retrying in {retry_after:.2f}s")
+                continue
+            if response.status_code >= 500:
+                print(f"Server error {response.status_code} (attempt {attempt})")
+                self.sleep(2 ** (attempt - 1))
+                continue
 
-def send_embeds(webhook_url, embeds):
+            print(f"Failed to send message. Status: {response.status_code}")
+            print(response.text)
+            return False
+
+        print(f"Giving up on message after {MAX_ATTEMPTS} attempts")
+        return False
+
+    def send_all(self, messages, on_sent=None):
+        """
+        Post messages as they are produced. With one worker they arrive in
+        order; more workers post concurrently. Returns (sent, failed).
+
+        A message is a payload or a (payload, filings) pair; ``on_sent(filings)``
+        is called once Discord accepts the message.
+        """
+        def deliver(message):
+            payload, filings = message if isinstance(message, tuple) else (message, None)
+            ok = self.post(payload)
+            if ok and on_sent and filings:
+                on_sent(filings)
+            return ok
+
+        sent = failed = 0
+        if self.workers <= 1:
+            for message in messages:
+                if deliver(message):
+                    sent += 1
+                else:
+                    failed += 1
+            return sent, failed
+
+        # Bound the messages in flight so the input is still consumed lazily
+        slots = threading.BoundedSemaphore(self.workers * 2)
+        results = []
+
+        def deliver_and_release(message):
+            try:
+                return deliver(message)
+            finally:
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for message in messages:
+                slots.acquire()
+                results.append(executor.submit(deliver_and_release, message))
+
+        for future in results:
+            if future.result():
+                sent += 1
+            else:
+                failed += 1
+        return sent, failed
+
+def send_embeds(webhook_url, embeds, workers=1):
     """Send a list of embeds to Discord, chunking if necessary."""
-    for i in range(0, len(embeds), MAX_EMBEDS_PER_MESSAGE):
-        chunk = embeds[i:i + MAX_EMBEDS_PER_MESSAGE]
-        payload = {"embeds": chunk}
-        try:
-            response = requests.post(webhook_url, json=payload, timeout=10)
-            if response.status_code not in [200, 204]:
-                print(f"Failed to send embeds chunk {i}. Status: {response.status_code}")
-                print(response.text)
-        except Exception as e:
-            print(f"Error sending embeds: {e}")
+    return WebhookSender(webhook_url, workers=workers).send_all(iter_messages(embeds))
 
 def format_filing(filing):
     # filing: [scrip_code, company_name, price_at_announcement, current_price, current_mkt_cap_cr, attachment_url, financial_snapshot]
@@ -101,107 +241,156 @@ def format_filing(filing):
 
     return f"- {title} ({symbol})\n  **Price:** {fmt_price(price_at)} -> {fmt_price(curr_price)}{pct_change_str} | **MCap:** {mkt_cap_str}{fin_str}\n\n"
 
-def process_file(file_path, exchange_name):
-    with open(file_path, 'r') as f:
-        data = json.load(f)
+def iter_filings(file_path):
+    """
+    Yield (category, date, row) from an output file.
+
+    Accepts the output JSON document (``{"meta": ..., "data": ...}``) or an
+    NDJSON stream with one filing object per line, e.g. ``{"category": ...,
+    **FirstFiling.to_dict()}`` or ``{"category", "date", "row"}``. NDJSON is
+    read line by line (``-`` reads stdin), so sending starts before the stream
+    ends; the JSON document is a single value and is parsed whole.
+    """
+    f = sys.stdin if file_path == "-" else open(file_path, "r")
+    try:
+        first = f.readline()
+        try:
+            record = json.loads(first)
+        except ValueError:
+            record = None
+
+        if isinstance(record, dict) and "category" in record:
+            yield record_to_filing(record)
+            for line in f:
+                if line.strip():
+                    yield record_to_filing(json.loads(line))
+            return
+
+        data = record if record is not None else json.loads(first + f.read())
+    finally:
+        if f is not sys.stdin:
+            f.close()
 
     filings_data = data.get("data", {})
-    if not filings_data:
-        print("No data found in file.")
-        return []
-
-    embeds = []
-
-    # Structure: One or more embeds starting with Exchange Name
-    # H1: Exchange (Title of Embed)
-    # H2: Category (## Category)
-    # H3: Date (### Date)
-
-    current_embed = {
-        "title": f"{exchange_name}",
-        "color": 3447003, # Blueish
-    }
-    current_description = ""
-
-    # Sort categories to ensure consistent order
-    sorted_categories = sorted(filings_data.keys())
-
-    for category in sorted_categories:
-        dates_dict = filings_data[category]
-        if not dates_dict:
-            continue
-
-        # Add Category Header
-        cat_header = f"## {category}\n"
-
-        # Check limits for Category Header
-        if len(current_description) + len(cat_header) > 4000:
-             current_embed["description"] = current_description
-             embeds.append(current_embed)
-             current_embed = {
-                "title": f"{exchange_name} (cont.)",
-                "color": 3447003,
-             }
-             current_description = ""
-
-        current_description += cat_header
-
-        # Sort dates
-        sorted_dates = sorted(dates_dict.keys())
-
-        for date_str in sorted_dates:
-            filings_list = dates_dict[date_str]
-            if not filings_list:
-                continue
+    for category in sorted(filings_data):
+        dates_dict = filings_data[category] or {}
+        for date_str in sorted(dates_dict):
+            for row in dates_dict[date_str] or []:
+                yield category, date_str, row
+
+def record_to_filing(record):
+    """Map one NDJSON record to (category, date, row)."""
+    row = record.get("row")
+    if row is None:
+        row = [record.get(field) for field in ROW_FIELDS]
+    return record["category"], record["date"], row
+
+def iter_embed_groups(filings, exchange_name):
+    """
+    Build embeds incrementally from (category, date, row) tuples.
+
+    Yields (embed, filings in the embed). Structure: the embed title is the
+    exchange, then "## Category" and "### Date" headers. A full embed is
+    yielded as soon as the next filing does not fit, and the next one
+    restores the category/date context.
+    """
+    title = exchange_name
+    description = ""
+    included = []
+    category = date_str = None
+
+    for filing in filings:
+        filing_category, filing_date, row = filing
+        new_category = filing_category != category
+        new_date = new_category or filing_date != date_str
+        category, date_str = filing_category, filing_date
+
+        text = ""
+        if new_category:
+            text += f"## {category}\n"
+        if new_date:
+            text += f"### {date_str}\n"
+        text += format_filing(row)
+
+        if description and len(description) + len(text) > MAX_EMBED_DESCRIPTION:
+            yield {"title": title, "color": EMBED_COLOR, "description": description}, included
+            title = f"{exchange_name} (cont.)"
+            included = []
+            # Context restoration: Exchange -> Category -> Date
+            description = ""
+            if not new_category:
+                description += f"## {category} (cont.)\n"
+            if not new_date:
+                description += f"### {date_str} (cont.)\n"
+
+        description += text
+        included.append(filing)
+
+    if description:
+        yield {"title": title, "color": EMBED_COLOR, "description": description}, included
+
+def iter_embeds(filings, exchange_name):
+    """Build embeds incrementally from (category, date, row) tuples."""
+    for embed, _ in iter_embed_groups(filings, exchange_name):
+        yield embed
+
+def iter_message_groups(groups):
+    """
+    Group (embed, filings) pairs into webhook messages within Discord's count
+    and size limits. Yields (payload, filings in the message).
+    """
+    batch, included, size = [], [], 0
+    for embed, filings in groups:
+        length = len(embed.get("title", "")) + len(embed.get("description", ""))
+        if batch and (len(batch) == MAX_EMBEDS_PER_MESSAGE or size + length > MAX_MESSAGE_CHARS):
+            yield {"embeds": batch}, included
+            batch, included, size = [], [], 0
+        batch.append(embed)
+        included.extend(filings)
+        size += length
+
+    if batch:
+        yield {"embeds": batch}, included
+
+def iter_messages(embeds):
+    """Group embeds into webhook messages within Discord's count and size limits."""
+    for payload, _ in iter_message_groups((embed, []) for embed in embeds):
+        yield payload
+
+def filing_key(exchange_name, filing):
+    """Delivery ledger key of a (category, date, row) filing."""
+    category, date_str, row = filing
+    attachment_url = row[5] if len(row) > 5 else None
+    return DeliveryLedger.key(exchange_name, category, row[0], date_str, attachment_url)
 
-            # Add Date Header
-            date_header = f"### {date_str}\n"
-
-            # Check limits for Date Header
-            if len(current_description) + len(date_header) > 4000:
-                 current_embed["description"] = current_description
-                 embeds.append(current_embed)
-                 current_embed = {
-                    "title": f"{exchange_name} (cont.)",
-                    "color": 3447003,
-                 }
-                 # If we split here, we might want to re-add Category header for context?
-                 # Ideally yes, but let's keep it simple first or stick to strict hierarchy.
-                 # Re-adding category header if split happens:
-                 current_description = f"## {category} (cont.)\n"
-
-            current_description += date_header
-
-            for filing in filings_list:
-                text = format_filing(filing)
-
-                # Check limits for Content
-                if len(current_description) + len(text) > 4000:
-                    # Flush current embed
-                    current_embed["description"] = current_description
-                    embeds.append(current_embed)
-
-                    # Start new embed
-                    current_embed = {
-                        "title": f"{exchange_name} (cont.)",
-                        "color": 3447003,
-                    }
-                    # Context restoration: Exchange -> Category -> Date
-                    current_description = f"## {category} (cont.)\n### {date_str} (cont.)\n{text}"
-                else:
-                    current_description += text
-
-    # Flush remaining description
-    if current_description:
-         current_embed["description"] = current_description
-         embeds.append(current_embed)
-
-    return embeds
+def process_file(file_path, exchange_name):
+    """Return all embeds for an output file."""
+    return list(iter_embeds(iter_filings(file_path), exchange_name))
+
+def send_file(file_path, exchange_name, sender, ledger=None):
+    """
+    Send an output file's filings. With a ledger, only filings it has not
+    seen are formatted and sent, and each is marked once its message is
+    accepted. Returns (sent, failed) message counts.
+    """
+    filings = iter_filings(file_path)
+    on_sent = None
+    if ledger is not None:
+        filings = (f for f in filings if filing_key(exchange_name, f) not in ledger)
+
+        def on_sent(sent_filings):
+            ledger.mark(filing_key(exchange_name, f) for f in sent_filings)
+
+    messages = iter_message_groups(iter_embed_groups(filings, exchange_name))
+    return sender.send_all(messages, on_sent=on_sent)
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Send JSON output to Discord as Embeds.")
-    parser.add_argument("file_path", help="Path to the JSON output file.")
+    parser = argparse.ArgumentParser(description="Send JSON or NDJSON output to Discord as Embeds.")
+    parser.add_argument("file_path", help="Path to the JSON output file or NDJSON stream ('-' for stdin).")
     parser.add_argument("--exchange", required=True, help="Name of the Exchange (e.g. BSE, NSE Mainboard)")
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent posts (1 keeps messages in order).")
+    parser.add_argument("--ledger", default=DELIVERY_LEDGER_FILE, help="Delivery ledger of filings already sent.")
+    parser.add_argument("--resend", action="store_true", help="Send every filing, ignoring the delivery ledger.")
 
     args = parser.parse_args()
 
@@ -210,18 +399,23 @@ if __name__ == "__main__":
         print("Error: DISCORD_WEBHOOK_URL environment variable not set.")
         sys.exit(0)
 
-    if not os.path.exists(args.file_path):
+    if args.file_path != "-" and not os.path.exists(args.file_path):
         print(f"File not found: {args.file_path}")
         sys.exit(1)
 
+    ledger = DeliveryLedger.load(args.ledger)
     try:
-        embeds = process_file(args.file_path, args.exchange)
-        if embeds:
-            send_embeds(webhook_url, embeds)
-            print(f"Sent {len(embeds)} embeds to Discord.")
+        sender = WebhookSender(webhook_url, workers=args.workers)
+        sent, failed = send_file(args.file_path, args.exchange, sender, ledger=None if args.resend else ledger)
+        if sent or failed:
+            print(f"Sent {sent} messages to Discord ({failed} failed).")
         else:
-            print("No filings to send.")
+            print("No new filings to send.")
+        if failed:
+            sys.exit(1)
 
     except Exception as e:
         print(f"Error processing/sending: {e}")
         sys.exit(1)
+    finally:
+        ledger.save()
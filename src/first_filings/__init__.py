@@ -0,0 +1,3 @@
+from .api import FirstFiling, run
+
+__all__ = ["FirstFiling", "run"]
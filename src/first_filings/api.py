@@ -0,0 +1,247 @@
+import logging
+from dataclasses import asdict, dataclass
+from datetime import date as date_type, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+from . import config
+from .clients import NSE_SEGMENTS, create_client
+from .core import FirstFilingAnalyzer
+
+logger = logging.getLogger(__name__)
+
+EXCHANGES = ("bse", *NSE_SEGMENTS)
+PERIODS = ("day", "wtd", "mtd", "qtd")
+DATE_FORMATS = ("%d-%m-%Y", "%Y-%m-%d")
+
+
+@dataclass(frozen=True)
+class FirstFiling:
+    """A confirmed first filing, enriched with price and market data."""
+
+    category: str
+    scrip_code: str
+    company_name: Optional[str]
+    date: date_type
+    price_at_announcement: Optional[float] = None
+    current_price: Optional[float] = None
+    current_mkt_cap_cr: Optional[float] = None
+    attachment_url: Optional[str] = None
+    financial_snapshot: Optional[dict] = None
+    # Only set when several lookbacks are evaluated
+    days_since_previous: Optional[int] = None
+    first_within_years: Optional[Dict[int, bool]] = None
+
+    @classmethod
+    def from_dict(cls, category: str, filing: dict) -> "FirstFiling":
+        """Build a FirstFiling from a filing dict returned by the analyzer."""
+        return cls(
+            category=category,
+            scrip_code=filing["scrip_code"],
+            company_name=filing.get("company_name"),
+            date=date_type.fromisoformat(filing["date"]),
+            price_at_announcement=filing.get("price_at_announcement"),
+            current_price=filing.get("current_price"),
+            current_mkt_cap_cr=filing.get("current_mkt_cap_cr"),
+            attachment_url=filing.get("attachment_url"),
+            financial_snapshot=filing.get("financial_snapshot"),
+            days_since_previous=filing.get("days_since_previous"),
+            first_within_years=filing.get("first_within_years"),
+        )
+
+    def to_dict(self) -> dict:
+        """
+        Return the filing dict used by ``utils.build_output`` (no category,
+        ISO date string).
+        """
+        data = asdict(self)
+        del data["category"]
+        data["date"] = self.date.isoformat()
+        return data
+
+
+def get_date_range(date_obj, period):
+    """
+    Calculate from_date and to_date based on period.
+    date_obj is datetime object.
+    Returns (from_date, to_date).
+    """
+    to_date = date_obj
+
+    if period == "day":
+        from_date = to_date
+    elif period == "wtd":
+        # Monday of the current week
+        from_date = to_date - timedelta(days=to_date.weekday())
+    elif period == "mtd":
+        from_date = to_date.replace(day=1)
+    elif period == "qtd":
+        month = ((to_date.month - 1) // 3) * 3 + 1
+        from_date = to_date.replace(month=month, day=1)
+    else:
+        # Fallback to day
+        from_date = to_date
+
+    return from_date, to_date
+
+
+def parse_date(value) -> datetime:
+    """
+    Parse a reference date (datetime, date, DD-MM-YYYY or YYYY-MM-DD),
+    defaulting to today.
+    """
+    if not value:
+        return datetime.now()
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date_type):
+        return datetime.combine(value, datetime.min.time())
+
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(str(value), fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date: {value} (use DD-MM-YYYY or YYYY-MM-DD)")
+
+
+def parse_categories(value) -> List[str]:
+    """
+    Resolve categories (labels or CLI flag names) to category labels.
+    Defaults to all categories.
+    """
+    if not value:
+        return list(config.FILING_SUBCATEGORY.keys())
+
+    if isinstance(value, str):
+        value = [value]
+
+    categories = []
+    for name in value:
+        label = config.CLI_FLAGS.get(name, name)
+        if label not in config.FILING_SUBCATEGORY:
+            raise ValueError(f"Invalid category: {name}")
+        categories.append(label)
+    return categories
+
+
+def parse_lookback_years(value) -> Union[int, List[int]]:
+    """
+    Parse one lookback or several (a list or "1,2,3") into an int or a sorted
+    list of distinct ints.
+    """
+    if isinstance(value, str):
+        value = [part for part in value.split(",") if part.strip()]
+    elif not isinstance(value, (list, tuple)):
+        value = [value]
+
+    try:
+        years = sorted({int(part) for part in value})
+    except (TypeError, ValueError):
+        raise ValueError(
+            "lookback_years must be an integer or a list of integers"
+        ) from None
+    if not years or years[0] < 1:
+        raise ValueError("lookback_years must be positive")
+
+    return years[0] if len(years) == 1 else years
+
+
+def run(
+    exchange: str = "bse",
+    date: Union[datetime, date_type, str, None] = None,
+    period: str = "day",
+    categories: Union[str, Iterable[str], None] = None,
+    lookback_years: Union[int, Sequence[int], str] = 2,
+    analyzer: Optional[FirstFilingAnalyzer] = None,
+    enrich_level: Optional[str] = None,
+    deadline: Optional[float] = None,
+) -> Iterator[FirstFiling]:
+    """
+    Find first-time filings and yield each one as soon as it is enriched.
+
+    Args:
+        exchange: bse, nse-main or nse-sme.
+        date: Reference date. Defaults to today.
+        period: day, wtd, mtd or qtd.
+        categories: Category labels or CLI flag names. Defaults to all.
+        lookback_years: Years of history a filing must be the first in. With
+            several (e.g. ``[1, 2, 3]``), filings first within the shortest are
+            yielded with ``days_since_previous`` and ``first_within_years``,
+            all from one history fetch per candidate.
+        analyzer: Analyzer to run with, e.g. one built on a pooled client.
+            Its ``failed_checks_count`` is updated as the generator runs.
+            By default a client for ``exchange`` is created and closed when
+            the generator finishes.
+        enrich_level: none (no enrichment calls), price (price and market
+            cap) or full (also announcement-day price and financials).
+            Defaults to the analyzer's level, full unless configured.
+        deadline: Seconds the run may take, counted from the first
+            ``next()``. Checks that need the exchange run after locally
+            answered ones, and no new request is started once the deadline
+            is near; what was skipped is in ``analyzer.deadline_report()``.
+
+    Raises:
+        ValueError: If an argument is invalid.
+
+    Example:
+        >>> for filing in first_filings.run("nse-main", period="wtd"):
+        ...     print(filing.category, filing.company_name)
+    """
+    exchange = exchange.lower()
+    if exchange not in EXCHANGES:
+        raise ValueError(f"Invalid exchange: {exchange}")
+
+    period = period.lower()
+    if period not in PERIODS:
+        raise ValueError(f"Invalid period: {period}")
+
+    from_date, to_date = get_date_range(parse_date(date), period)
+    categories = parse_categories(categories)
+    lookback_years = parse_lookback_years(lookback_years)
+    if enrich_level is not None and enrich_level not in config.ENRICH_LEVELS:
+        raise ValueError(f"Invalid enrich level: {enrich_level}")
+    if deadline is not None and deadline <= 0:
+        raise ValueError("deadline must be positive")
+    logger.info(
+        f"Running analysis: exchange={exchange}, {from_date:%Y-%m-%d} to {to_date:%Y-%m-%d}, categories={categories}"
+    )
+
+    return _iter_first_filings(
+        exchange,
+        from_date,
+        to_date,
+        categories,
+        lookback_years,
+        analyzer,
+        enrich_level,
+        deadline,
+    )
+
+
+def _iter_first_filings(
+    exchange,
+    from_date,
+    to_date,
+    categories,
+    lookback_years,
+    analyzer,
+    enrich_level,
+    deadline,
+):
+    owns_client = analyzer is None
+    if owns_client:
+        analyzer = FirstFilingAnalyzer(create_client(exchange))
+    # Applies to this run only; the caller's analyzer keeps its own level
+    own_level = analyzer.enrich_level
+    if enrich_level is not None:
+        analyzer.enrich_level = enrich_level
+    analyzer.start_deadline(deadline)
+
+    try:
+        for category, filing in analyzer.iter_analyze(
+            from_date, to_date, categories, lookback_years
+        ):
+            yield FirstFiling.from_dict(category, filing)
+    finally:
+        analyzer.enrich_level = own_level
+        if owns_client:
+            analyzer.exchange_client.close()
@@ -1,21 +1,87 @@
 import logging
+import tempfile
 import time
 from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence
 from bse import BSE
 from . import config
-from .exchange import ExchangeClient, Announcement
+from .buffers import FeedBuffer
+from .classifier import KeywordClassifier
+from .exchange import ExchangeClient, Announcement, project_fields
+from .pool import tune_http_session
 from .retries import retry_exchange, should_retry_exception
+from .utils import read_bhavcopy
 
 
 logger = logging.getLogger(__name__)
 
+# Fields of a raw BSE announcement row the client reads; the rest are
+# dropped as each page arrives to keep large history fetches small.
+ANNOUNCEMENT_FIELDS = (
+    "NEWSID",
+    "SCRIP_CD",
+    "SLONGNAME",
+    "DT_TM",
+    "NEWSSUB",
+    "HEADLINE",
+    "ATTACHMENTNAME",
+)
+INTERNED_FIELDS = ("SLONGNAME",)
+
 
 class BSEClient(ExchangeClient):
-    def __init__(self):
-        self.bse = BSE(download_folder=".")
+    def __init__(self, bse=None, hedger=None):
+        self.bse = bse if bse is not None else BSE(download_folder=".")
+        self.hedger = hedger
+        tune_http_session(getattr(self.bse, "session", None))
+        self.general_classifier = KeywordClassifier(
+            {
+                category: [keywords] if isinstance(keywords, str) else keywords
+                for category, keywords in config.FILING_SUBCATEGORY_GENERAL_KEYWORD.items()
+            }
+        )
+        self._general_buffer = FeedBuffer(
+            config.FEED_BUFFER_SIZE, config.FEED_BUFFER_TTL
+        )
+
+    def close(self):
+        """Close the underlying BSE session."""
+        self.bse.exit()
+
+    def clear_buffers(self) -> None:
+        """Drop buffered General-subcategory pages."""
+        self._general_buffer.clear()
 
     @retry_exchange
-    def fetch_paginated_announcements(
+    def _fetch_page(
+        self, page_no, from_date, to_date, category, subcategory, scripcode, segment
+    ) -> dict:
+        """
+        Fetch one announcements page. Retried on its own, so a transient
+        failure does not re-download the pages already consumed.
+        """
+        # Add a small delay to be polite and avoid rate limits/timeouts
+        time.sleep(config.BSE_REQUEST_DELAY)
+
+        # Log fetch attempt
+        logger.info(
+            f"Fetching page {page_no} for {subcategory} ({from_date} to {to_date})"
+        )
+
+        return self._call(
+            "announcements",
+            self.bse.announcements,
+            page_no=page_no,
+            from_date=from_date,
+            to_date=to_date,
+            category=category,
+            subcategory=subcategory,
+            scripcode=str(scripcode) if scripcode else None,
+            segment=segment,
+        )
+
+    def iter_paginated_announcements(
         self,
         from_date,
         to_date,
@@ -23,70 +89,112 @@ class BSEClient(ExchangeClient):
         subcategory,
         scripcode=None,
         segment="equity",
-    ):
+    ) -> Iterator[dict]:
         """
-        Fetch all paginated announcements for given filters.
+        Yield announcements for given filters page by page, projected to
+        ANNOUNCEMENT_FIELDS.
+
+        Pages are requested lazily: a caller that stops consuming early skips
+        the remaining page requests.
         """
-        all_ann = []
+        fetched = 0
         total_count = None
 
         for page_count in range(1, config.BSE_MAX_PAGES + 1):
             try:
-                # Add a small delay to be polite and avoid rate limits/timeouts
-                time.sleep(config.BSE_REQUEST_DELAY)
-
-                # Log fetch attempt
-                logger.info(
-                    f"Fetching page {page_count} for {subcategory} ({from_date} to {to_date})"
-                )
-
-                data = self.bse.announcements(
-                    page_no=page_count,
-                    from_date=from_date,
-                    to_date=to_date,
-                    category=category,
-                    subcategory=subcategory,
-                    scripcode=str(scripcode) if scripcode else None,
-                    segment=segment,
+                data = self._fetch_page(
+                    page_count,
+                    from_date,
+                    to_date,
+                    category,
+                    subcategory,
+                    scripcode,
+                    segment,
                 )
+            except Exception as e:
+                logger.error(f"Error fetching page {page_count}: {e}")
+                raise e
 
-                if total_count is None:
-                    # Get total count from the first successful response
-                    table1 = data.get("Table1")
-                    if table1 and isinstance(table1, list) and len(table1) > 0:
-                        total_count = table1[0].get("ROWCNT", 0)
-                    else:
-                        total_count = 0
-
-                page_ann = data.get("Table", [])
-                if page_ann:
-                    all_ann.extend(page_ann)
+            if total_count is None:
+                # Get total count from the first successful response
+                table1 = data.get("Table1")
+                if table1 and isinstance(table1, list) and len(table1) > 0:
+                    total_count = table1[0].get("ROWCNT", 0)
+                else:
+                    total_count = 0
 
-                # Check if we have fetched all announcements
-                if (
-                    total_count is not None and len(all_ann) >= total_count
-                ) or not page_ann:
-                    break
+            page_ann = data.get("Table", [])
+            fetched += len(page_ann)
+            for ann in page_ann:
+                yield project_fields(ann, ANNOUNCEMENT_FIELDS, INTERNED_FIELDS)
 
-            except Exception as e:
-                logger.error(f"Error fetching page {page_count}: {e}")
-                raise e  # Re-raise to trigger retry
+            # Check if we have fetched all announcements
+            if (total_count is not None and fetched >= total_count) or not page_ann:
+                break
         else:
             logger.warning(
                 f"Reached maximum pages ({config.BSE_MAX_PAGES}) for {subcategory} ({from_date} to {to_date})"
             )
 
-        return all_ann
+    def fetch_paginated_announcements(
+        self,
+        from_date,
+        to_date,
+        category,
+        subcategory,
+        scripcode=None,
+        segment="equity",
+    ) -> List[dict]:
+        """
+        Fetch all paginated announcements for given filters.
+        Rows are projected to ANNOUNCEMENT_FIELDS.
+        """
+        return list(
+            self.iter_paginated_announcements(
+                from_date, to_date, category, subcategory, scripcode, segment
+            )
+        )
 
     def fetch_announcements(
-        self, from_date, to_date, category, subcategory=None, scrip_code=None
+        self,
+        from_date,
+        to_date,
+        category,
+        subcategory=None,
+        scrip_code=None,
+        limit: Optional[int] = None,
+        errors: Optional[list] = None,
     ) -> list[Announcement]:
         """
         Fetch announcements and map to standardized Announcement objects.
         If category is a label (e.g. "Analyst Call Intimation"), fetch all corresponding BSE subcategories.
+        With ``limit``, stop (and skip the remaining pages) once that many are found.
+        A subcategory that fails is skipped; its exception is appended to ``errors``.
+        """
+        return list(
+            islice(
+                self.iter_announcements(
+                    from_date, to_date, category, subcategory, scrip_code, errors
+                ),
+                limit,
+            )
+        )
+
+    def iter_announcements(
+        self,
+        from_date,
+        to_date,
+        category,
+        subcategory=None,
+        scrip_code=None,
+        errors: Optional[list] = None,
+    ) -> Iterator[Announcement]:
         """
-        all_announcements = []
+        Yield mapped, filtered Announcement objects page by page.
 
+        A subcategory whose pages fail is logged and skipped, so the result
+        is partial; the exception is appended to ``errors`` if given.
+        """
         # Determine subcategories to fetch
         subcats_to_fetch = []
         if subcategory:
@@ -97,84 +205,128 @@ class BSEClient(ExchangeClient):
             logger.warning(
                 f"Category label '{category}' not found in BSE config. Skipping."
             )
-            return []
+            return
 
         for subcat in subcats_to_fetch:
             try:
-                raw_announcements = self.fetch_paginated_announcements(
-                    from_date=from_date,
-                    to_date=to_date,
-                    category=config.FILING_CATEGORY,
-                    subcategory=subcat,
-                    scripcode=scrip_code,
-                )
-
-                # Filter if needed (e.g. valid checks or keywords)
-                if (
-                    subcat == config.SUBCATEGORY_GENERAL
-                    and category in config.FILING_SUBCATEGORY_GENERAL_KEYWORD
-                ):
-                    keyword = config.FILING_SUBCATEGORY_GENERAL_KEYWORD[category]
-                    keyword_lower = keyword.lower()
-                    filtered_raw = []
-                    for filing in raw_announcements:
-                        newssub = filing.get("NEWSSUB") or ""
-                        headline = filing.get("HEADLINE") or ""
-                        if (keyword_lower in newssub.lower()) or (
-                            keyword_lower in headline.lower()
-                        ):
-                            filtered_raw.append(filing)
-                    raw_announcements = filtered_raw
+                if subcat == config.SUBCATEGORY_GENERAL:
+                    raw_announcements = self._iter_general(
+                        from_date, to_date, category, scrip_code
+                    )
+                else:
+                    raw_announcements = self.iter_paginated_announcements(
+                        from_date=from_date,
+                        to_date=to_date,
+                        category=config.FILING_CATEGORY,
+                        subcategory=subcat,
+                        scripcode=scrip_code,
+                    )
 
                 for ann in raw_announcements:
                     try:
-                        dt_str = ann.get("DT_TM")
-                        if dt_str:
-                            try:
-                                dt = datetime.fromisoformat(dt_str)
-                            except ValueError:
-                                dt = datetime.now()
-                        else:
-                            dt = datetime.now()
-
-                        attachment_name = ann.get("ATTACHMENTNAME")
-                        attachment_url = None
-                        if attachment_name:
-                            attachment_url = f"https://www.bseindia.com/xml-data/corpfiling/AttachLive/{attachment_name}"
-
-                        all_announcements.append(
-                            Announcement(
-                                scrip_code=str(ann.get("SCRIP_CD")),
-                                company_name=ann.get("SLONGNAME", ""),
-                                date=dt,
-                                category=category,  # Use the high-level label
-                                description=ann.get("NEWSSUB")
-                                or ann.get("HEADLINE")
-                                or "",
-                                attachment_url=attachment_url,
-                            )
-                        )
+                        announcement = self._to_announcement(ann, category)
                     except Exception as e:
                         logger.error(f"Error parsing announcement: {e}")
                         continue
+                    yield announcement
             except Exception as e:
                 logger.error(f"Error fetching BSE subcategory {subcat}: {e}")
+                if errors is not None:
+                    errors.append(e)
                 continue
 
-        return all_announcements
+    def _to_announcement(self, ann: dict, category: str) -> Announcement:
+        """Map a raw BSE row to an Announcement under a category label."""
+        dt_str = ann.get("DT_TM")
+        if dt_str:
+            try:
+                dt = datetime.fromisoformat(dt_str)
+            except ValueError:
+                dt = datetime.now()
+        else:
+            dt = datetime.now()
+
+        attachment_name = ann.get("ATTACHMENTNAME")
+        attachment_url = None
+        if attachment_name:
+            attachment_url = f"https://www.bseindia.com/xml-data/corpfiling/AttachLive/{attachment_name}"
+
+        return Announcement(
+            scrip_code=str(ann.get("SCRIP_CD")),
+            company_name=ann.get("SLONGNAME", ""),
+            date=dt,
+            category=category,  # Use the high-level label
+            description=ann.get("NEWSSUB") or ann.get("HEADLINE") or "",
+            attachment_url=attachment_url,
+            announcement_id=ann.get("NEWSID"),
+        )
+
+    def _iter_general(
+        self, from_date, to_date, category: str, scrip_code: Optional[str] = None
+    ) -> Iterator[dict]:
+        """
+        Yield the "General" subcategory filings relevant to a category label.
+
+        General pages are downloaded once per (range, scrip) and every row is
+        classified against all keyword categories in a single pass; other
+        keyword categories are then filtered from the buffered result. Only a
+        complete download is buffered, so stopping early never leaves a
+        truncated feed behind.
+        """
+        key = (from_date, to_date, scrip_code)
+        keyword_filtered = category in self.general_classifier.categories
+
+        classified = self._general_buffer.get(key)
+        if classified is not None:
+            for filing, categories in classified:
+                if not keyword_filtered or category in categories:
+                    yield filing
+            return
+
+        classified = []
+        classify = self.general_classifier.classify
+        for filing in self.iter_paginated_announcements(
+            from_date=from_date,
+            to_date=to_date,
+            category=config.FILING_CATEGORY,
+            subcategory=config.SUBCATEGORY_GENERAL,
+            scripcode=scrip_code,
+        ):
+            categories = classify(filing.get("NEWSSUB") or "") | classify(
+                filing.get("HEADLINE") or ""
+            )
+            classified.append((filing, categories))
+            if not keyword_filtered or category in categories:
+                yield filing
+
+        self._general_buffer.put(key, classified)
 
     @retry_exchange
-    def get_scrip_info(self, scrip_code: str, announcement_date: datetime) -> dict:
+    def get_scrip_info(
+        self,
+        scrip_code: str,
+        announcement_date: datetime,
+        price_dates: Sequence[datetime] = (),
+        level: str = "full",
+        errors: Optional[list] = None,
+    ) -> dict:
+        if errors is None:
+            errors = []
         symbol = None
         company_name = None
         current_price = None
         current_mkt_cap_cr = None
         price_at_announcement = None
         financial_snapshot = None
+        # Closing price on or before each requested date
+        target_dates = [announcement_date.date()] + [d.date() for d in price_dates]
+        prices = {}
 
         try:
             # 1. Basic Info
             try:
+                # Not hedged: lookup feeds the BSE instance's shared symbol
+                # parser, which an abandoned duplicate would keep resetting
                 lookup_result = self.bse.lookup(str(scrip_code))
                 if lookup_result:
                     symbol = lookup_result.get("symbol")
@@ -183,24 +335,32 @@ class BSEClient(ExchangeClient):
                 if should_retry_exception(e):
                     raise e
                 logger.warning(f"Error lookup BSE info for {scrip_code}: {e}")
+                errors.append(e)
 
             # 2. Current Price
             try:
-                quote = self.bse.quote(str(scrip_code))
+                quote = self._call("quote", self.bse.quote, str(scrip_code))
                 if quote:
                     current_price = quote.get("LTP")
             except Exception as e:
                 if should_retry_exception(e):
                     raise e
                 logger.warning(f"Error fetching BSE quote for {scrip_code}: {e}")
+                errors.append(e)
 
             # 3. Market Cap
             try:
                 # Use getScripTradingStats in bse >= 3.2.0
                 if hasattr(self.bse, "getScripTradingStats"):
-                    trading_info = self.bse.getScripTradingStats(str(scrip_code))
+                    trading_info = self._call(
+                        "getScripTradingStats",
+                        self.bse.getScripTradingStats,
+                        str(scrip_code),
+                    )
                 else:
-                    trading_info = self.bse.stockTrading(str(scrip_code))
+                    trading_info = self._call(
+                        "stockTrading", self.bse.stockTrading, str(scrip_code)
+                    )
 
                 if trading_info:
                     # Format is like "19,21,678.78"
@@ -215,11 +375,24 @@ class BSEClient(ExchangeClient):
                     raise e
                 logger.warning(f"Error fetching BSE trading info for {scrip_code}: {e}")
 
+            if level == "price":
+                # Price and market cap only: skip the snapshot and T12M series
+                return {
+                    "symbol": symbol,
+                    "company_name": company_name,
+                    "current_price": current_price,
+                    "price_at_announcement": None,
+                    "current_mkt_cap_cr": current_mkt_cap_cr,
+                    "financial_snapshot": None,
+                }
+
             # 4. Financial Snapshot
             try:
                 # Use resultsSnapshot for bse >= 3.2.0
                 if hasattr(self.bse, "resultsSnapshot"):
-                    snapshot = self.bse.resultsSnapshot(str(scrip_code))
+                    snapshot = self._call(
+                        "resultsSnapshot", self.bse.resultsSnapshot, str(scrip_code)
+                    )
                     if snapshot and "results_in_crores" in snapshot:
                         financial_snapshot = snapshot["results_in_crores"]
             except Exception as e:
@@ -230,14 +403,16 @@ class BSEClient(ExchangeClient):
             # 5. Historical Price
             # T12M data
             try:
-                hist_data = self.bse.equityPriceVolumeT12M(str(scrip_code))
+                hist_data = self._call(
+                    "equityPriceVolumeT12M",
+                    self.bse.equityPriceVolumeT12M,
+                    str(scrip_code),
+                )
                 if hist_data and "Data" in hist_data and "data" in hist_data["Data"]:
                     # data is list of [DateStr, Price, Vol]
                     # DateStr format: 'Thu Feb 20 2025 00:00:00'
-                    target_date = announcement_date.date()
-
                     rows = hist_data["Data"]["data"]
-                    best_date = None
+                    best_dates = {}
 
                     for row in rows:
                         if len(row) >= 2:
@@ -248,14 +423,20 @@ class BSEClient(ExchangeClient):
                                 d = datetime.strptime(
                                     d_str, "%a %b %d %Y %H:%M:%S"
                                 ).date()
-
-                                if d <= target_date:
-                                    # Keep track of the latest available trading date up to the announcement
-                                    if best_date is None or d > best_date:
-                                        best_date = d
-                                        price_at_announcement = float(p_str)
+                                price = float(p_str)
                             except ValueError:
                                 continue
+
+                            for target_date in target_dates:
+                                # Keep track of the latest available trading date up to the announcement
+                                if d <= target_date and (
+                                    target_date not in best_dates
+                                    or d > best_dates[target_date]
+                                ):
+                                    best_dates[target_date] = d
+                                    prices[target_date] = price
+
+                    price_at_announcement = prices.get(target_dates[0])
             except Exception as e:
                 if should_retry_exception(e):
                     raise e
@@ -267,8 +448,9 @@ class BSEClient(ExchangeClient):
             if should_retry_exception(e):
                 raise e
             logger.error(f"Error getting scrip info for {scrip_code}: {e}")
+            errors.append(e)
 
-        return {
+        info = {
             "symbol": symbol,
             "company_name": company_name,
             "current_price": current_price,
@@ -276,3 +458,19 @@ class BSEClient(ExchangeClient):
             "current_mkt_cap_cr": current_mkt_cap_cr,
             "financial_snapshot": financial_snapshot,
         }
+        if price_dates:
+            info["prices_at_announcement"] = {d: prices.get(d) for d in target_dates}
+        return info
+
+    @retry_exchange
+    def bulk_prices(self, day: datetime) -> Optional[Dict[str, float]]:
+        """Closing prices by scrip code from the day's BSE bhavcopy."""
+        with tempfile.TemporaryDirectory() as folder:
+            try:
+                # Not hedged: a duplicate would write the same file
+                path = self.bse.bhavcopyReport(day, folder)
+            except RuntimeError as e:
+                # Not a trading day, or not published yet
+                logger.info(f"No BSE bhavcopy for {day:%Y-%m-%d}: {e}")
+                return None
+            return read_bhavcopy(path, "FinInstrmId")
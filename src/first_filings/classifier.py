@@ -0,0 +1,71 @@
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Tuple
+
+_NO_CATEGORIES: FrozenSet[str] = frozenset()
+
+
+class KeywordClassifier:
+    """
+    Keyword matcher compiled once from a {category: [keywords]} mapping.
+
+    Keywords are lowercased and de-duplicated up front: a keyword that
+    contains another keyword of the same category can never add a match, so
+    it is dropped. ``classify`` then scans a description once and returns
+    every category it belongs to.
+
+    Each keyword test is a plain substring search, which CPython runs in C;
+    for keyword tables of this size it is faster than a combined regex (see
+    ``benchmarks/bench_nse_classifier.py``).
+    """
+
+    def __init__(self, category_keywords: Mapping[str, Iterable[str]]):
+        self.categories: FrozenSet[str] = frozenset(category_keywords)
+        self._keywords_by_category: Dict[str, Tuple[str, ...]] = {}
+
+        categories_by_keyword: Dict[str, set] = {}
+        for category, keywords in category_keywords.items():
+            lowered = {kw.lower() for kw in keywords if kw}
+            # Drop keywords made redundant by a shorter keyword they contain
+            minimal = [
+                kw for kw in lowered if not any(o != kw and o in kw for o in lowered)
+            ]
+            minimal.sort(key=len)
+            self._keywords_by_category[category] = tuple(minimal)
+            for kw in minimal:
+                categories_by_keyword.setdefault(kw, set()).add(category)
+
+        self._table: List[Tuple[str, FrozenSet[str]]] = sorted(
+            ((kw, frozenset(cats)) for kw, cats in categories_by_keyword.items()),
+            key=lambda item: len(item[0]),
+        )
+
+    def keywords(self, category: str) -> Tuple[str, ...]:
+        """Return the compiled (lowercased, minimal) keywords for a category."""
+        return self._keywords_by_category.get(category, ())
+
+    def classify(self, text: str) -> FrozenSet[str]:
+        """
+        Return every category whose keywords occur in ``text``.
+        """
+        if not text:
+            return _NO_CATEGORIES
+
+        text_lower = text.lower()
+        found = _NO_CATEGORIES
+        for kw, cats in self._table:
+            if kw in text_lower:
+                # Most rows match one keyword: reuse its frozenset as-is
+                found = cats if not found else found | cats
+        return found
+
+    def matches(self, text: str, category: str) -> bool:
+        """
+        Return True if ``text`` contains any keyword of ``category``.
+        """
+        if not text:
+            return False
+
+        text_lower = text.lower()
+        for kw in self._keywords_by_category.get(category, ()):
+            if kw in text_lower:
+                return True
+        return False
@@ -1,48 +1,96 @@
 import click
 import logging
 import json
+import os
 import sys
 from datetime import datetime, timedelta
 from . import config
 from . import utils
-from .bse_client import BSEClient
-
-try:
-    from .nse_client import NSEClient
-except ImportError:
-    NSEClient = None
-
+from .api import get_date_range, parse_lookback_years, run as run_analysis
+from .clients import create_client
 from .core import FirstFilingAnalyzer
+from .last_filing import load_table, table_path
+from .negative_cache import load_cache
+from .pool import ClientPool
+from .shards import ShardCache, cache_root as shard_cache_root
+from .verdicts import load_store
 
 logger = logging.getLogger(__name__)
 
 
-def get_date_range(date_obj, period):
+def select_categories(analyst_calls, press_releases, presentations):
     """
-    Calculate from_date and to_date based on period.
-    date_obj is datetime object.
-    Returns (from_date, to_date).
+    Map the category flags to category labels.
+    Defaults to all categories if none is selected.
     """
-    to_date = date_obj
+    selected_categories = []
+    if analyst_calls:
+        if hasattr(config, "CLI_FLAGS") and "analyst_calls" in config.CLI_FLAGS:
+            selected_categories.append(config.CLI_FLAGS["analyst_calls"])
+        else:
+            selected_categories.append("Analyst Call Intimation")
+
+    if press_releases:
+        if hasattr(config, "CLI_FLAGS") and "press_releases" in config.CLI_FLAGS:
+            selected_categories.append(config.CLI_FLAGS["press_releases"])
+        else:
+            selected_categories.append("Press Release")
 
-    if period == "day":
-        from_date = to_date
-    elif period == "wtd":
-        # Monday of the current week
-        from_date = to_date - timedelta(days=to_date.weekday())
-    elif period == "mtd":
-        from_date = to_date.replace(day=1)
-    elif period == "qtd":
-        month = ((to_date.month - 1) // 3) * 3 + 1
-        from_date = to_date.replace(month=month, day=1)
-    else:
-        # Fallback to day
-        from_date = to_date
+    if presentations:
+        if hasattr(config, "CLI_FLAGS") and "presentations" in config.CLI_FLAGS:
+            selected_categories.append(config.CLI_FLAGS["presentations"])
+        else:
+            selected_categories.append("PPT")
 
-    return from_date, to_date
+    # Default to all if none selected
+    if not selected_categories:
+        selected_categories = list(config.FILING_SUBCATEGORY.keys())
+
+    return selected_categories
+
+
+def parse_lookback(value):
+    """Click callback: parse --lookback-years into an int or a list of ints."""
+    try:
+        return parse_lookback_years(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
 
 
-@click.command()
+class DefaultCommandGroup(click.Group):
+    """
+    Command group that falls back to a default subcommand, so
+    ``first-filings --exchange bse`` keeps working next to
+    ``first-filings serve``. A leading help option shows the group's own
+    help, with every subcommand.
+    """
+
+    def __init__(self, *args, default_command="run", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+
+    def parse_args(self, ctx, args):
+        if not args or (
+            args[0] not in self.commands and args[0] not in ctx.help_option_names
+        ):
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
+@click.group(
+    cls=DefaultCommandGroup,
+    default_command="run",
+    context_settings={"help_option_names": ["-h", "--help"]},
+)
+def main():
+    """
+    Identify first-time corporate filings on BSE and NSE.
+
+    Without a subcommand, options are passed to `run`.
+    """
+
+
+@main.command("run")
 @click.option(
     "--date",
     type=click.DateTime(formats=["%d-%m-%Y", "%Y-%m-%d"]),
@@ -57,9 +105,9 @@ def get_date_range(date_obj, period):
 )
 @click.option(
     "--lookback-years",
-    type=int,
-    default=2,
-    help="Number of years to look back for history.",
+    default="2",
+    callback=lambda ctx, param, value: parse_lookback(value),
+    help="Years to look back for history. A list such as 1,2,3 reports the verdict for each lookback and days since the previous filing.",
 )
 @click.option(
     "-a", "--analyst-calls", is_flag=True, help="Fetch Analyst Call Intimations"
@@ -75,133 +123,180 @@ def get_date_range(date_obj, period):
     default="bse",
     help="Exchange to fetch from.",
 )
-def main(
-    date, period, lookback_years, analyst_calls, press_releases, presentations, exchange
+@click.option(
+    "--enrich-level",
+    type=click.Choice(config.ENRICH_LEVELS, case_sensitive=False),
+    default=config.ENRICH_LEVEL,
+    help="Enrichment per first filing: none (no calls), price (price and market cap) or full (also announcement-day price and financials).",
+)
+@click.option(
+    "--deadline",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Seconds the run may take. Checks answered locally run first; work that would overrun is skipped and listed in the output's meta.",
+)
+@click.option(
+    "--shard-days",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Fetch multi-day periods in shards of this many days (1 = per day, 7 = per week), concurrently on pooled clients. Closed shards are cached, so a later mtd/qtd run only fetches new days.",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Reuse first-filing verdicts stored by earlier runs: only announcements not judged before are checked and enriched.",
+)
+@click.option(
+    "--refresh-prices",
+    is_flag=True,
+    help="With --incremental, update reused filings' prices from the exchange bhavcopy instead of per-scrip calls.",
+)
+@click.option(
+    "--hedge",
+    is_flag=True,
+    help="Duplicate exchange requests that outlast their endpoint's p95 latency and use the first response; counters go to the output's meta.",
+)
+@click.option(
+    "--history-index",
+    is_flag=True,
+    help="Answer covered history checks from the local NumPy index and extend it (requires numpy).",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Keep polling today's announcements and check only new arrivals.",
+)
+@click.option(
+    "--interval",
+    type=click.IntRange(min=1),
+    default=config.WATCH_INTERVAL,
+    help="Seconds between polls in --watch mode.",
+)
+def run(
+    date,
+    period,
+    lookback_years,
+    analyst_calls,
+    press_releases,
+    presentations,
+    exchange,
+    enrich_level,
+    deadline,
+    shard_days,
+    incremental,
+    refresh_prices,
+    hedge,
+    history_index,
+    watch,
+    interval,
 ):
     """
     Fetch and analyze corporate announcements to identify first-time filings.
+
+    This is the default command. Use `first-filings serve` to run a
+    long-lived daemon with warm sessions instead.
     """
     # Setup logging
     utils.setup_logging()
 
     # 1. Determine categories
-    selected_categories = []
-    if analyst_calls:
-        if hasattr(config, "CLI_FLAGS") and "analyst_calls" in config.CLI_FLAGS:
-            selected_categories.append(config.CLI_FLAGS["analyst_calls"])
-        else:
-            selected_categories.append("Analyst Call Intimation")
-
-    if press_releases:
-        if hasattr(config, "CLI_FLAGS") and "press_releases" in config.CLI_FLAGS:
-            selected_categories.append(config.CLI_FLAGS["press_releases"])
-        else:
-            selected_categories.append("Press Release")
-
-    if presentations:
-        if hasattr(config, "CLI_FLAGS") and "presentations" in config.CLI_FLAGS:
-            selected_categories.append(config.CLI_FLAGS["presentations"])
-        else:
-            selected_categories.append("PPT")
-
-    # Default to all if none selected
-    if not selected_categories:
-        selected_categories = list(config.FILING_SUBCATEGORY.keys())
+    selected_categories = select_categories(
+        analyst_calls, press_releases, presentations
+    )
 
     logger.info(
         f"Starting FirstFilings with date={date}, period={period}, lookback={lookback_years}, categories={selected_categories}, exchange={exchange}"
     )
 
-    total_filings_found = 0
-    filings_data = {}  # Structure: {Category: [filing_dict, ...]}
-
+    hedger = None
+    client_pool = None
     try:
         from_date, to_date = get_date_range(date, period)
         logger.info(
             f"Date range: {from_date.strftime('%Y-%m-%d')} to {to_date.strftime('%Y-%m-%d')}"
         )
 
-        exchange_client = None
-        if exchange == "bse":
-            exchange_client = BSEClient()
-        elif exchange == "nse-main":
-            if NSEClient is None:
-                raise ImportError(
-                    "NSEClient could not be imported. Ensure 'nse' library is available."
-                )
-            exchange_client = NSEClient(segment="equities")
-        elif exchange == "nse-sme":
-            if NSEClient is None:
-                raise ImportError(
-                    "NSEClient could not be imported. Ensure 'nse' library is available."
-                )
-            exchange_client = NSEClient(segment="sme")
-
-        if not exchange_client:
-            raise ValueError(f"Invalid exchange: {exchange}")
+        # Exchange libraries are imported only now, for the selected exchange
+        if hedge:
+            from .hedging import Hedger
+
+            hedger = Hedger()
+        exchange_client = create_client(exchange, hedger=hedger)
+        shard_cache = None
+        if shard_days:
+            # Shards run concurrently, each on its own pooled session
+            client_pool = ClientPool(lambda: create_client(exchange, hedger=hedger))
+            shard_cache = ShardCache(shard_cache_root(exchange))
+        index = None
+        if history_index:
+            from .history_index import index_path, load_index
+
+            index = load_index(exchange, create=True)
+        # Built by `first-filings update-table`; consulted before remote history
+        table = load_table(exchange)
+        # Scrips whose lookup or quote definitively failed in recent runs
+        negative_cache = load_cache(exchange)
+        # Verdicts of earlier runs over overlapping periods
+        verdict_store = load_store(exchange) if incremental else None
+        analyzer = FirstFilingAnalyzer(
+            exchange_client,
+            history_index=index,
+            last_filing_table=table,
+            enrich_level=enrich_level.lower(),
+            negative_cache=negative_cache,
+            shard_days=shard_days,
+            client_pool=client_pool,
+            shard_cache=shard_cache,
+            verdict_store=verdict_store,
+            refresh_prices=refresh_prices,
+        )
+        filename = f"{exchange.replace('-', '_')}_output.json"
 
-        analyzer = FirstFilingAnalyzer(exchange_client)
+        if watch:
+            watch_announcements(
+                analyzer, selected_categories, lookback_years, interval, filename
+            )
+            if table is not None:
+                table.save(table_path(exchange))
+            negative_cache.save()
+            if verdict_store is not None:
+                verdict_store.save()
+            return
 
         # 2. Fetch announcements for the period
-        announcements_by_cat = analyzer.fetch_announcements(
-            from_date, to_date, categories=selected_categories
-        )
-
         # 3. Check for first filings & Enrich
-        for category_label, filings in announcements_by_cat.items():
-            if not filings:
-                continue
-
-            for filing in filings:
-                # filing is Announcement object
-                scrip_cd = filing.scrip_code
-                company_name = filing.company_name
-                filing_date_obj = filing.date
-
-                if not scrip_cd:
-                    logger.warning(
-                        f"Skipping filing with no Scrip Code/Symbol: {filing}"
-                    )
-                    continue
-
-                try:
-                    is_first = analyzer.is_first_filing(
-                        scrip_cd,
-                        category_label,
-                        filing_date_obj,
-                        lookback_years,
-                        company_name,
-                    )
-
-                    if is_first:
-                        logger.info(
-                            f"Found first filing: {category_label} - {company_name}"
-                        )
-
-                        # Enrich Data
-                        enriched_data = analyzer.enrich_filing_data(
-                            scrip_cd,
-                            filing_date_obj,
-                            company_name=company_name,
-                            attachment_url=filing.attachment_url,
-                        )
-
-                        if enriched_data:
-                            if category_label not in filings_data:
-                                filings_data[category_label] = []
-                            filings_data[category_label].append(enriched_data)
-                            total_filings_found += 1
-
-                except Exception as e:
-                    logger.error(f"Error processing filing for {company_name}: {e}")
+        filings_data = {}
+        for filing in run_analysis(
+            exchange,
+            date=date,
+            period=period,
+            categories=selected_categories,
+            lookback_years=lookback_years,
+            analyzer=analyzer,
+            deadline=deadline,
+        ):
+            filings_data.setdefault(filing.category, []).append(filing.to_dict())
+        total_filings_found = sum(len(filings) for filings in filings_data.values())
+
+        if index is not None:
+            index.save(index_path(exchange))
+        if table is not None:
+            table.save(table_path(exchange))
+        negative_cache.save()
+        if verdict_store is not None:
+            verdict_store.save()
+        if shard_cache is not None:
+            shard_cache.prune()
 
         # 4. Save Output
-        filename = f"{exchange.replace('-', '_')}_output.json"
         output_path = utils.save_output(
             filings_data,
             analyzer.failed_checks_count,
             lookback_years,
             filename=filename,
+            enrich_level=analyzer.enrich_level,
+            deadline_report=analyzer.deadline_report(),
+            hedge_report=hedger.report() if hedger else None,
         )
 
         # 5. Print CLI JSON
@@ -214,6 +309,316 @@ def main(
         # Print error JSON
         print(json.dumps({"status": "error", "error": str(e)}, indent=2))
         sys.exit(1)
+    finally:
+        if client_pool is not None:
+            client_pool.close()
+        if hedger is not None:
+            logger.info(f"Request hedging: {hedger.report()}")
+            hedger.close()
+
+
+def watch_announcements(
+    analyzer, selected_categories, lookback_years, interval, filename, max_cycles=None
+):
+    """
+    Poll today's announcements every ``interval`` seconds until interrupted.
+
+    Each cycle checks only announcements not seen earlier in the day, adds
+    new first filings to the output file and prints a one-line JSON summary.
+    """
+    from .watch import AnnouncementWatcher
+
+    watcher = AnnouncementWatcher(analyzer, selected_categories, lookback_years)
+    filings_data = {category: [] for category in selected_categories}
+    totals = {"total_filings_found": 0, "output_file": None}
+
+    def on_cycle(cycle, new_announcements, new_filings):
+        found = 0
+        for category, filings in new_filings.items():
+            filings_data.setdefault(category, []).extend(filings)
+            found += len(filings)
+
+        totals["total_filings_found"] += found
+        totals["output_file"] = utils.save_output(
+            filings_data,
+            analyzer.failed_checks_count,
+            lookback_years,
+            filename=filename,
+            enrich_level=analyzer.enrich_level,
+        )
+        print(
+            json.dumps(
+                {
+                    "status": "watching",
+                    "cycle": cycle,
+                    "new_announcements": new_announcements,
+                    "new_filings": found,
+                    "total_filings_found": totals["total_filings_found"],
+                    "output_file": totals["output_file"],
+                }
+            ),
+            flush=True,
+        )
+
+    logger.info(f"Watching today's announcements every {interval}s")
+    try:
+        watcher.run(interval, on_cycle, max_cycles=max_cycles)
+    except KeyboardInterrupt:
+        logger.info("Watch interrupted")
+
+    utils.print_cli_json(
+        totals["output_file"],
+        totals["total_filings_found"],
+        analyzer.failed_checks_count,
+    )
+
+
+@main.command("build-index")
+@click.option(
+    "--date",
+    type=click.DateTime(formats=["%d-%m-%Y", "%Y-%m-%d"]),
+    default=lambda: datetime.now().strftime("%d-%m-%Y"),
+    help="Last day to index (DD-MM-YYYY or YYYY-MM-DD). Defaults to today.",
+)
+@click.option(
+    "--years",
+    type=click.IntRange(min=1),
+    default=3,
+    help="Years of history to index (at least the lookback you use).",
+)
+@click.option(
+    "-e",
+    "--exchange",
+    type=click.Choice(["bse", "nse-main", "nse-sme"], case_sensitive=False),
+    default="bse",
+    help="Exchange to index.",
+)
+def build_index(date, years, exchange):
+    """
+    Backfill the NumPy history index used by `run --history-index`.
+
+    Downloads every category's full-market history once; later runs answer
+    covered first-filing checks locally and extend the index with each period.
+    """
+    from .history_index import index_path, load_index
+
+    utils.setup_logging()
+    try:
+        index = load_index(exchange, create=True)
+        if index is None:
+            raise RuntimeError(
+                "The history index requires numpy (pip install firstfilings[index])"
+            )
+
+        to_date = date
+        from_date = to_date - timedelta(days=years * 365)
+        exchange_client = create_client(exchange)
+        incomplete = []
+        for category in config.FILING_SUBCATEGORY:
+            logger.info(f"Indexing {category} from {from_date} to {to_date}")
+            errors = []
+            announcements = exchange_client.fetch_announcements(
+                from_date=from_date, to_date=to_date, category=category, errors=errors
+            )
+            if errors:
+                # A partial feed would mark unfetched days as covered
+                logger.error(f"Not indexing {category}: {len(errors)} requests failed")
+                incomplete.append(category)
+                continue
+            index.extend(category, announcements, from_date, to_date)
+        exchange_client.close()
+
+        path = index_path(exchange)
+        index.save(path)
+        print(
+            json.dumps(
+                {
+                    "status": "success",
+                    "filings_indexed": len(index),
+                    "incomplete_categories": incomplete,
+                    "path": str(path),
+                },
+                indent=2,
+            )
+        )
+    except Exception as e:
+        logger.exception("Critical error while building the history index")
+        print(json.dumps({"status": "error", "error": str(e)}, indent=2))
+        sys.exit(1)
+
+
+@main.command("update-table")
+@click.option(
+    "--date",
+    type=click.DateTime(formats=["%d-%m-%Y", "%Y-%m-%d"]),
+    default=lambda: datetime.now().strftime("%d-%m-%Y"),
+    help="Last day to record (DD-MM-YYYY or YYYY-MM-DD). Defaults to today.",
+)
+@click.option(
+    "--years",
+    type=click.IntRange(min=1),
+    default=3,
+    help="Years of history to backfill for categories not yet in the table.",
+)
+@click.option(
+    "-e",
+    "--exchange",
+    type=click.Choice(["bse", "nse-main", "nse-sme"], case_sensitive=False),
+    default="bse",
+    help="Exchange to update.",
+)
+def update_table(date, years, exchange):
+    """
+    Build or incrementally update the last-filing-date table.
+
+    Each category is fetched from the first day not yet covered (or
+    `--years` back on the first build) through `--date`; a day still open
+    when recorded is fetched again. Meant to run
+    nightly, so that daily runs answer most checks without remote history.
+    """
+    utils.setup_logging()
+    try:
+        table = load_table(exchange, create=True)
+        to_date = date
+        exchange_client = create_client(exchange)
+        incomplete = []
+        for category in config.FILING_SUBCATEGORY:
+            through = table.covered_through(category)
+            if through is None:
+                from_date = to_date - timedelta(days=years * 365)
+            else:
+                from_date = datetime.combine(
+                    through + timedelta(days=1), datetime.min.time()
+                )
+            if from_date.date() > to_date.date():
+                logger.info(f"Last-filing table for {category} is up to date")
+                continue
+
+            logger.info(f"Recording {category} from {from_date} to {to_date}")
+            errors = []
+            announcements = exchange_client.fetch_announcements(
+                from_date=from_date, to_date=to_date, category=category, errors=errors
+            )
+            if errors:
+                # Left for the next update rather than recorded as covered
+                logger.error(f"Not recording {category}: {len(errors)} requests failed")
+                incomplete.append(category)
+                continue
+            table.update(category, announcements, from_date, to_date)
+        exchange_client.close()
+
+        path = table_path(exchange)
+        table.save(path)
+        print(
+            json.dumps(
+                {
+                    "status": "success",
+                    "entries": len(table),
+                    "incomplete_categories": incomplete,
+                    "path": str(path),
+                },
+                indent=2,
+            )
+        )
+    except Exception as e:
+        logger.exception("Critical error while updating the last-filing table")
+        print(json.dumps({"status": "error", "error": str(e)}, indent=2))
+        sys.exit(1)
+
+
+@main.command("export-snapshot")
+@click.argument("path", type=click.Path(dir_okay=False))
+@click.option(
+    "-e",
+    "--exchange",
+    "exchanges",
+    type=click.Choice(["bse", "nse-main", "nse-sme"], case_sensitive=False),
+    multiple=True,
+    help="Exchange to include (repeatable). Defaults to every exchange with state.",
+)
+def export_snapshot(path, exchanges):
+    """
+    Pack the history index, last-filing table and negative cache into one
+    compressed, versioned snapshot file (e.g. a CI artifact).
+    """
+    from .snapshot import export_snapshot as export
+
+    utils.setup_logging()
+    try:
+        manifest = export(path, exchanges or ("bse", "nse-main", "nse-sme"))
+        print(
+            json.dumps(
+                {
+                    "status": "success",
+                    "path": path,
+                    "exchanges": manifest["exchanges"],
+                    "files": len(manifest["files"]),
+                },
+                indent=2,
+            )
+        )
+    except Exception as e:
+        logger.exception("Critical error while exporting the snapshot")
+        print(json.dumps({"status": "error", "error": str(e)}, indent=2))
+        sys.exit(1)
+
+
+@main.command("import-snapshot")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+def import_snapshot(path):
+    """
+    Restore a snapshot written by `export-snapshot` into the local cache.
+
+    Files in the snapshot replace local ones; run `update-table`
+    afterwards to sync only the days since it was taken.
+    """
+    from .snapshot import import_snapshot as restore
+
+    utils.setup_logging()
+    try:
+        manifest = restore(path)
+        print(
+            json.dumps(
+                {
+                    "status": "success",
+                    "created_at": manifest["created_at"],
+                    "exchanges": manifest["exchanges"],
+                    "files": len(manifest["files"]),
+                },
+                indent=2,
+            )
+        )
+    except Exception as e:
+        logger.exception("Critical error while importing the snapshot")
+        print(json.dumps({"status": "error", "error": str(e)}, indent=2))
+        sys.exit(1)
+
+
+@main.command("serve")
+@click.option("--host", default="127.0.0.1", help="Interface to bind to.")
+@click.option("--port", type=int, default=config.SERVE_PORT, help="Port to listen on.")
+@click.option(
+    "--pool-size",
+    type=int,
+    default=config.CLIENT_POOL_SIZE,
+    help="Warm clients kept per exchange (concurrent analyses per exchange).",
+)
+def serve(host, port, pool_size):
+    """
+    Run a daemon that keeps exchange sessions warm and answers analysis
+    requests over a local JSON HTTP API (POST /analyze, GET /health).
+    """
+    from .server import serve_forever
+
+    utils.setup_logging()
+    print(
+        json.dumps(
+            {"status": "serving", "url": f"http://{host}:{port}", "pid": os.getpid()},
+            indent=2,
+        ),
+        flush=True,
+    )
+    serve_forever(host, port, pool_size=pool_size)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,45 @@
+import logging
+from .exchange import ExchangeClient
+
+logger = logging.getLogger(__name__)
+
+# CLI exchange name -> NSE segment
+NSE_SEGMENTS = {"nse-main": "equities", "nse-sme": "sme"}
+
+
+def create_client(exchange: str, hedger=None) -> ExchangeClient:
+    """
+    Construct the client for an exchange.
+
+    Exchange libraries (``bse``, ``nse[server]``) are heavy to import, so
+    they are only imported here, once an exchange has actually been selected.
+
+    Args:
+        exchange: One of ``bse``, ``nse-main`` or ``nse-sme``.
+        hedger: Optional ``hedging.Hedger`` for the client's requests.
+
+    Returns:
+        A ready-to-use ExchangeClient.
+
+    Raises:
+        ImportError: If the exchange library is not installed.
+        ValueError: If the exchange is unknown.
+    """
+    exchange = exchange.lower()
+
+    if exchange == "bse":
+        from .bse_client import BSEClient
+
+        return BSEClient(hedger=hedger)
+
+    if exchange in NSE_SEGMENTS:
+        try:
+            from .nse_client import NSEClient
+        except ImportError as e:
+            raise ImportError(
+                "NSEClient could not be imported. Ensure 'nse' library is available."
+            ) from e
+
+        return NSEClient(segment=NSE_SEGMENTS[exchange], hedger=hedger)
+
+    raise ValueError(f"Invalid exchange: {exchange}")
@@ -10,6 +10,54 @@ RETRY_MULTIPLIER = 2  # Multiplier for exponential backoff
 BSE_REQUEST_DELAY = 0.35  # Seconds to wait between BSE pagination requests
 BSE_MAX_PAGES = 10000  # Maximum number of pages to fetch to avoid infinite loops
 
+# Request hedging (--hedge): duplicate slow idempotent reads
+HEDGE_PERCENTILE = 95  # Hedge once a request outlasts this latency percentile
+HEDGE_WINDOW = 200  # Recent latencies kept per endpoint
+HEDGE_MIN_SAMPLES = 20  # Latencies needed before an endpoint is hedged
+HEDGE_MIN_DELAY = 0.25  # Seconds; never hedge sooner than this
+HEDGE_MAX_RATIO = 0.1  # At most this share of requests is duplicated
+HEDGE_MAX_WORKERS = 16  # Threads running hedged requests
+
+# Connection pooling
+CLIENT_POOL_SIZE = 4  # Warm exchange clients (sessions) kept per pool
+# Keep-alive connections per host in each session: enough for every pool
+# worker and hedge thread at once (requests' default of 10 makes them wait)
+HTTP_POOL_MAXSIZE = CLIENT_POOL_SIZE + HEDGE_MAX_WORKERS
+
+# Feed buffering (shares one download across category lookups)
+FEED_BUFFER_SIZE = 8  # Raw feeds kept per client
+FEED_BUFFER_TTL = 120  # Seconds before a buffered feed is re-fetched
+
+# Daemon (first-filings serve)
+SERVE_PORT = 8765  # Default local port for the JSON API
+
+# Intraday watch (first-filings --watch)
+WATCH_INTERVAL = 300  # Seconds between polls of today's announcements
+
+# Enrichment (--enrich-level)
+ENRICH_LEVELS = ("none", "price", "full")  # Enrichment sub-requests per scrip
+ENRICH_LEVEL = "full"  # none: no calls; price: price and market cap; full: + announcement price, financials
+
+# Persistent state
+CACHE_DIR = ".cache"  # Root folder for state reused across runs
+NSE_SESSION_DIR = f"{CACHE_DIR}/nse"  # NSE library cookie store
+NSE_SESSION_TTL = 6 * 60 * 60  # Seconds before persisted NSE cookies are discarded
+NSE_COOKIE_GLOB = "nse_cookies*.pkl"  # Cookie files written by the nse library
+HISTORY_INDEX_DIR = f"{CACHE_DIR}/history"  # NumPy history index per exchange
+LAST_FILING_DIR = f"{CACHE_DIR}/last_filing"  # Last-filing-date table per exchange
+RECORD_GAP_DAYS = (
+    7  # Uncovered days before a run's period fetched to keep coverage contiguous
+)
+DELIVERY_LEDGER_FILE = f"{CACHE_DIR}/delivered.json"  # Filings already sent to sinks
+DELIVERY_LEDGER_RETENTION_DAYS = 120  # Longer than the longest period (qtd)
+NEGATIVE_CACHE_DIR = f"{CACHE_DIR}/unresolved"  # Scrips enrichment skips, per exchange
+NEGATIVE_CACHE_TTL_DAYS = 7  # Days before an unresolved scrip is retried
+SHARD_CACHE_DIR = f"{CACHE_DIR}/shards"  # Closed period-fetch shards per exchange
+SHARD_CACHE_RETENTION_DAYS = 120  # Longer than the longest period (qtd)
+VERDICT_STORE_DIR = f"{CACHE_DIR}/verdicts"  # First-filing verdicts per exchange
+VERDICT_RETENTION_DAYS = 120  # Longer than the longest period (qtd)
+BHAVCOPY_LOOKBACK_DAYS = 7  # Days to walk back for the latest bulk price report
+
 # Filing categories
 FILING_CATEGORY = "Company Update"
 SUBCATEGORY_GENERAL = "General"
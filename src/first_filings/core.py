@@ -1,16 +1,99 @@
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from datetime import date, datetime, timedelta
 import logging
-from typing import Optional, List, Dict
+import time
+from typing import Optional, List, Dict, Iterator, Sequence, Set, Tuple, Union
 from . import config
 from .exchange import ExchangeClient, Announcement
+from .negative_cache import NO_SYMBOL, unresolved_reason
+from .shards import is_closed, merge_shards, shard_ranges
+from .verdicts import refresh_price, verdict_key
 
 logger = logging.getLogger(__name__)
 
+# Marks a check the history index did not answer
+NOT_INDEXED = object()
+# Marks a scrip whose enrichment was not requested
+NOT_ENRICHED = object()
+# Marks a first-filing check that failed (no verdict)
+CHECK_FAILED = object()
+
+
+def lookback_list(lookback_years: Union[int, Sequence[int]]) -> List[int]:
+    """Normalize one lookback or a list of lookbacks to a sorted list."""
+    if isinstance(lookback_years, int):
+        return [lookback_years]
+    return sorted(set(lookback_years))
+
+
+def skipped_record(category_label: str, filing: Announcement) -> dict:
+    """Describe an announcement whose check was skipped at the deadline."""
+    return {
+        "category": category_label,
+        "scrip_code": filing.scrip_code,
+        "company_name": filing.company_name,
+        "date": filing.date.date().isoformat(),
+        "attachment_url": filing.attachment_url,
+    }
+
+
+def first_within(
+    filing_date: datetime, previous: Optional[date], lookbacks: Sequence[int]
+) -> Dict[int, bool]:
+    """
+    Return, per lookback, whether a filing with the given previous filing
+    date is the first of its kind within that many years.
+    """
+    return {
+        years: previous is None
+        or previous < (filing_date - timedelta(days=years * 365)).date()
+        for years in lookbacks
+    }
+
 
 class FirstFilingAnalyzer:
-    def __init__(self, exchange_client: ExchangeClient):
+    def __init__(
+        self,
+        exchange_client: ExchangeClient,
+        history_index=None,
+        last_filing_table=None,
+        enrich_level: str = config.ENRICH_LEVEL,
+        negative_cache=None,
+        shard_days: Optional[int] = None,
+        client_pool=None,
+        shard_cache=None,
+        verdict_store=None,
+        refresh_prices: bool = False,
+    ):
+        if enrich_level not in config.ENRICH_LEVELS:
+            raise ValueError(f"Invalid enrich level: {enrich_level}")
         self.exchange_client = exchange_client
         self.failed_checks_count = 0
+        # none: no enrichment calls; price: price and market cap; full: everything
+        self.enrich_level = enrich_level
+        # Optional HistoryIndex (history_index.py) answering covered checks locally
+        self.history_index = history_index
+        # Optional LastFilingTable (last_filing.py), consulted before remote history
+        self.last_filing_table = last_filing_table
+        # Optional NegativeCache (negative_cache.py) of scrips enrichment skips
+        self.negative_cache = negative_cache
+        # Period fetches split into shard_days-day shards, run on pooled
+        # clients (ClientPool) if given; closed shards kept in a ShardCache
+        self.shard_days = shard_days
+        self.client_pool = client_pool
+        self.shard_cache = shard_cache
+        # Optional VerdictStore (verdicts.py): announcements with a stored
+        # verdict are not checked again, stored first filings are reused
+        self.verdict_store = verdict_store
+        # Reused filings get current prices from one bulk download
+        self.refresh_prices = refresh_prices
+        self._bulk_prices = None
+        # Categories whose last fetch_announcements result is partial
+        self.incomplete_categories = set()
+        # Announcements the last evaluation left without a verdict
+        self.unchecked = []
+        self.start_deadline(None)
 
     def fetch_announcements(
         self,
@@ -21,21 +104,44 @@ class FirstFilingAnalyzer:
         """
         Fetch all announcements for each category label in a date range.
         Returns a dict: {category_label: [Announcement]}
+
+        With ``shard_days``, a range longer than one day is fetched in
+        shards (see ``_fetch_sharded``). Categories the client could only
+        fetch in part are listed in ``incomplete_categories``.
         """
         logger.info(f"Fetching announcements from {from_date} to {to_date}")
         results = {}
+        self.incomplete_categories = set()
 
         target_categories = (
             categories if categories else config.FILING_SUBCATEGORY.keys()
         )
 
+        if self.shard_days and from_date.date() < to_date.date():
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                logger.warning("Deadline reached: not fetching announcements")
+                self.skipped_categories.extend(target_categories)
+                return results
+            return self._fetch_sharded(from_date, to_date, list(target_categories))
+
         for category_label in target_categories:
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                logger.warning(f"Deadline reached: not fetching {category_label}")
+                self.skipped_categories.append(category_label)
+                continue
+
             try:
                 # Delegate fetching/filtering to the client
+                errors = []
                 results_list = self.exchange_client.fetch_announcements(
-                    from_date=from_date, to_date=to_date, category=category_label
+                    from_date=from_date,
+                    to_date=to_date,
+                    category=category_label,
+                    errors=errors,
                 )
                 results[category_label] = results_list
+                if errors:
+                    self.incomplete_categories.add(category_label)
 
             except Exception as e:
                 logger.error(f"Failed to fetch announcements for {category_label}: {e}")
@@ -43,6 +149,766 @@ class FirstFilingAnalyzer:
 
         return results
 
+    def _fetch_sharded(
+        self,
+        from_date: datetime,
+        to_date: datetime,
+        categories: List[str],
+    ) -> Dict[str, List[Announcement]]:
+        """
+        Fetch a date range as ``shard_days``-day shards and merge each
+        category's shards, deduplicated by announcement identity.
+
+        Each shard is one task fetching every category on one client, so
+        the clients' feed buffers are still shared across categories. Tasks
+        run concurrently on ``client_pool`` clients, or one by one on the
+        analyzer's client without a pool. Shards whose days are all over
+        are read from, and written to, ``shard_cache``; a shard the client
+        fetched only in part is not cached. A category with a failed shard
+        is left out, as when an unsharded fetch fails.
+        """
+        shards = shard_ranges(from_date, to_date, self.shard_days)
+        fetched = {}  # (category, shard number) -> announcements
+        pending = {}  # shard number -> categories to fetch
+        for number, (start, end) in enumerate(shards):
+            for category_label in categories:
+                cached = None
+                if self.shard_cache is not None and is_closed(end):
+                    cached = self.shard_cache.get(category_label, start, end)
+                if cached is None:
+                    pending.setdefault(number, []).append(category_label)
+                else:
+                    fetched[(category_label, number)] = cached
+        logger.info(
+            f"Fetching {len(pending)} of {len(shards)} shards of {self.shard_days} days"
+        )
+
+        def fetch_shard(
+            number: int,
+        ) -> Tuple[Dict[str, List[Announcement]], Set[str]]:
+            start, end = shards[number]
+            shard_results = {}
+            partial = set()
+            with self._shard_client() as client:
+                for category_label in pending[number]:
+                    errors = []
+                    try:
+                        shard_results[category_label] = client.fetch_announcements(
+                            from_date=start,
+                            to_date=end,
+                            category=category_label,
+                            errors=errors,
+                        )
+                    except Exception as e:
+                        logger.error(
+                            f"Failed to fetch {category_label} for {start:%Y-%m-%d} to {end:%Y-%m-%d}: {e}"
+                        )
+                    if errors:
+                        partial.add(category_label)
+            return shard_results, partial
+
+        workers = self.client_pool.size if self.client_pool is not None else 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for number, (shard_results, partial) in zip(
+                pending, executor.map(fetch_shard, pending)
+            ):
+                start, end = shards[number]
+                self.incomplete_categories.update(partial)
+                for category_label, announcements in shard_results.items():
+                    fetched[(category_label, number)] = announcements
+                    if self.shard_cache is None or not is_closed(end):
+                        continue
+                    if category_label in partial:
+                        logger.warning(
+                            f"Not caching partial {category_label} shard {start:%Y-%m-%d} to {end:%Y-%m-%d}"
+                        )
+                    else:
+                        self.shard_cache.put(category_label, start, end, announcements)
+
+        results = {}
+        for category_label in categories:
+            parts = [fetched.get((category_label, n)) for n in range(len(shards))]
+            if any(part is None for part in parts):
+                logger.error(
+                    f"Failed to fetch announcements for {category_label}: incomplete shards"
+                )
+                continue
+            results[category_label] = merge_shards(parts)
+        return results
+
+    @contextmanager
+    def _shard_client(self):
+        """A pooled client for one shard task, or the analyzer's own client."""
+        if self.client_pool is None:
+            with nullcontext(self.exchange_client) as client:
+                yield client
+        else:
+            with self.client_pool.checkout() as client:
+                yield client
+
+    def iter_evaluate(
+        self,
+        announcements_by_cat: Dict[str, List[Announcement]],
+        lookback_years: Union[int, Sequence[int]],
+    ) -> Iterator[Tuple[str, dict]]:
+        """
+        Check each announcement for a first filing and enrich the confirmed ones.
+        Yields (category_label, filing_dict) once all checks have finished,
+        as each filing is enriched (see ``iter_enrich``).
+
+        With several lookbacks, one history fetch over the longest window
+        gives the previous filing date; a filing is reported if it is first
+        within the shortest lookback, with ``days_since_previous`` and a
+        ``first_within_years`` verdict per lookback.
+
+        With a verdict store, announcements already judged are not checked
+        again. Stored first filings enriched at the current level are
+        yielded first as stored (prices refreshed in bulk with
+        ``refresh_prices``); others are enriched again.
+
+        Announcements whose check failed or was skipped at the deadline are
+        listed in ``unchecked``.
+        """
+        self.unchecked = []
+        lookbacks = lookback_list(lookback_years)
+        multi = len(lookbacks) > 1
+        # ((category, position), category_label, Announcement, history fields)
+        confirmed = []
+        # (category_label, stored filing dict)
+        reused = []
+        # Checks that need the exchange run after every locally answered one
+        remote = []
+
+        for category_order, (category_label, filings) in enumerate(
+            announcements_by_cat.items()
+        ):
+            if not filings:
+                continue
+
+            if multi:
+                indexed = self._indexed_previous_dates(
+                    category_label, filings, lookbacks[-1]
+                )
+            else:
+                indexed = self._indexed_verdicts(category_label, filings, lookbacks[0])
+
+            for position, filing in enumerate(filings):
+                if not filing.scrip_code:
+                    logger.warning(
+                        f"Skipping filing with no Scrip Code/Symbol: {filing}"
+                    )
+                    continue
+
+                order = (category_order, position)
+                stored = self._stored_verdict(category_label, filing, lookbacks)
+                if stored is not None:
+                    if not stored["first"]:
+                        continue
+                    if stored["filing"] and stored["enrich_level"] == self.enrich_level:
+                        reused.append((category_label, stored["filing"]))
+                    else:
+                        confirmed.append(
+                            (order, category_label, filing, stored["history"] or {})
+                        )
+                    continue
+
+                if position in indexed:
+                    history = self._checked(
+                        category_label, filing, lookbacks, indexed[position]
+                    )
+                elif self._answered_locally(category_label, filing, lookbacks[-1]):
+                    history = self._checked(category_label, filing, lookbacks)
+                else:
+                    remote.append((order, category_label, filing))
+                    continue
+
+                if history is not None:
+                    confirmed.append((order, category_label, filing, history))
+
+        if remote:
+            logger.info(f"{len(remote)} checks need remote history after local answers")
+        for order, category_label, filing in remote:
+            if self._deadline_near():
+                self.skipped_checks.append(skipped_record(category_label, filing))
+                self.unchecked.append(filing)
+                continue
+
+            started = time.monotonic()
+            history = self._checked(category_label, filing, lookbacks)
+            self._observe_check(time.monotonic() - started)
+            if history is not None:
+                confirmed.append((order, category_label, filing, history))
+
+        if self.skipped_checks:
+            logger.warning(
+                f"Deadline reached: skipped {len(self.skipped_checks)} history checks"
+            )
+
+        if reused:
+            logger.info(f"Reusing {len(reused)} first filings from earlier runs")
+            prices = self._refreshed_prices() if self.refresh_prices else None
+            for category_label, stored_filing in reused:
+                if prices:
+                    stored_filing = refresh_price(stored_filing, prices)
+                yield category_label, stored_filing
+
+        # Report in feed order, whatever order the checks ran in
+        confirmed.sort(key=lambda item: item[0])
+        confirmed = [item[1:] for item in confirmed]
+        if self.verdict_store is None:
+            yield from self.iter_enrich(confirmed)
+            return
+
+        # Store each first filing with its output once enriched
+        pending = {
+            (
+                category_label,
+                filing.scrip_code,
+                filing.date.date().isoformat(),
+                filing.attachment_url,
+            ): (
+                filing,
+                history,
+            )
+            for category_label, filing, history in confirmed
+        }
+        for category_label, enriched_data in self.iter_enrich(confirmed):
+            filing, history = pending.pop(
+                (
+                    category_label,
+                    enriched_data["scrip_code"],
+                    enriched_data["date"],
+                    enriched_data["attachment_url"],
+                ),
+                (None, None),
+            )
+            if filing is not None:
+                # Filings left unenriched at the deadline are enriched next run
+                enriched = enriched_data["scrip_code"] not in self.unenriched_scrips
+                self.verdict_store.put(
+                    verdict_key(category_label, filing, lookbacks),
+                    filing.date,
+                    first=True,
+                    history=history,
+                    filing=enriched_data if enriched else None,
+                    enrich_level=self.enrich_level if enriched else None,
+                )
+            yield category_label, enriched_data
+        # First filings dropped in enrichment keep their verdict only
+        for (category_label, *_), (filing, history) in pending.items():
+            self.verdict_store.put(
+                verdict_key(category_label, filing, lookbacks),
+                filing.date,
+                first=True,
+                history=history,
+            )
+
+    def _stored_verdict(
+        self, category_label: str, filing: Announcement, lookbacks: List[int]
+    ) -> Optional[dict]:
+        """The verdict store's entry for a check, or None."""
+        if self.verdict_store is None:
+            return None
+        return self.verdict_store.get(verdict_key(category_label, filing, lookbacks))
+
+    def _checked(
+        self,
+        category_label: str,
+        filing: Announcement,
+        lookbacks: List[int],
+        indexed=NOT_INDEXED,
+    ) -> Optional[dict]:
+        """
+        ``_check_filing``, storing negative verdicts. Returns the history
+        fields of a first filing, else None (not first, or the check failed).
+        First filings are stored once enriched.
+        """
+        history = self._check_filing(category_label, filing, lookbacks, indexed)
+        if history is CHECK_FAILED:
+            self.unchecked.append(filing)
+            return None
+        if history is None and self.verdict_store is not None:
+            self.verdict_store.put(
+                verdict_key(category_label, filing, lookbacks), filing.date, first=False
+            )
+        return history
+
+    def _refreshed_prices(self) -> Optional[Dict[str, float]]:
+        """
+        Latest closing prices from the client's bulk source, walking back
+        from today to the last published report. Fetched once per analyzer.
+        """
+        if self._bulk_prices is None:
+            self._bulk_prices = {}
+            day = datetime.now()
+            for _ in range(config.BHAVCOPY_LOOKBACK_DAYS):
+                try:
+                    prices = self.exchange_client.bulk_prices(day)
+                except Exception as e:
+                    logger.warning(f"Could not fetch bulk prices: {e}")
+                    break
+                if prices:
+                    logger.info(f"Refreshing prices from the {day:%Y-%m-%d} bhavcopy")
+                    self._bulk_prices = prices
+                    break
+                day -= timedelta(days=1)
+        return self._bulk_prices
+
+    def _check_filing(
+        self,
+        category_label: str,
+        filing: Announcement,
+        lookbacks: List[int],
+        indexed=NOT_INDEXED,
+    ) -> Optional[dict]:
+        """
+        Run the first-filing check for one announcement, using the history
+        index's answer if given. Returns the history fields to add to the
+        filing (empty with a single lookback) if it is a first filing, None
+        if it is not, and CHECK_FAILED if the check could not be made.
+        """
+        company_name = filing.company_name
+        failed_before = self.failed_checks_count
+        try:
+            if len(lookbacks) > 1:
+                if indexed is not NOT_INDEXED:
+                    previous = indexed
+                else:
+                    try:
+                        previous = self.previous_filing_date(
+                            filing, category_label, lookbacks[-1]
+                        )
+                    except Exception as e:
+                        logger.error(
+                            f"Failed to fetch historical filings for {company_name} - {category_label}: {e}"
+                        )
+                        self.failed_checks_count += 1
+                        return CHECK_FAILED
+
+                verdicts = first_within(filing.date, previous, lookbacks)
+                is_first = verdicts[lookbacks[0]]
+                history = {
+                    "days_since_previous": (
+                        (filing.date.date() - previous).days if previous else None
+                    ),
+                    "first_within_years": verdicts,
+                }
+            else:
+                if indexed is not NOT_INDEXED:
+                    is_first = indexed
+                else:
+                    is_first = self.is_first_filing(
+                        filing.scrip_code,
+                        category_label,
+                        filing.date,
+                        lookbacks[0],
+                        company_name,
+                    )
+                history = {}
+                if self.failed_checks_count != failed_before:
+                    # is_first_filing reports a failed history fetch as False
+                    return CHECK_FAILED
+
+            if not is_first:
+                return None
+            logger.info(f"Found first filing: {category_label} - {company_name}")
+            return history
+
+        except Exception as e:
+            logger.error(f"Error processing filing for {company_name}: {e}")
+            return CHECK_FAILED
+
+    def _answered_locally(
+        self, category_label: str, filing: Announcement, lookback_years: int
+    ) -> bool:
+        """True if the last-filing table can settle this check without a fetch."""
+        if self.last_filing_table is None:
+            return False
+        answered, _ = self.last_filing_table.previous_filing_date(
+            filing.scrip_code,
+            category_label,
+            filing.date,
+            filing.date - timedelta(days=lookback_years * 365),
+        )
+        return answered
+
+    def start_deadline(self, seconds: Optional[float]) -> None:
+        """
+        Bound the run to ``seconds`` from now (None: no deadline). Remote
+        checks and enrichment calls that would not finish in time are not
+        started; in-flight requests are not interrupted.
+        """
+        self.deadline_seconds = seconds
+        self.deadline = time.monotonic() + seconds if seconds is not None else None
+        self.skipped_categories = []
+        self.skipped_checks = []
+        self.unenriched_scrips = []
+        self._check_seconds = None
+
+    def _deadline_near(self) -> bool:
+        """True if the next remote call would likely overrun the deadline."""
+        if self.deadline is None:
+            return False
+        return time.monotonic() + (self._check_seconds or 0) >= self.deadline
+
+    def _observe_check(self, seconds: float) -> None:
+        # Moving average of remote call durations, to stop before the deadline
+        if self._check_seconds is None:
+            self._check_seconds = seconds
+        else:
+            self._check_seconds = 0.7 * self._check_seconds + 0.3 * seconds
+
+    def deadline_report(self) -> Optional[dict]:
+        """
+        Work left undone because of the deadline, for the output ``meta``.
+        None if no deadline was set.
+        """
+        if self.deadline is None:
+            return None
+        return {
+            "seconds": self.deadline_seconds,
+            "reached": bool(
+                self.skipped_categories or self.skipped_checks or self.unenriched_scrips
+            ),
+            "skipped_categories": list(self.skipped_categories),
+            "skipped_checks": list(self.skipped_checks),
+            "unenriched_scrips": list(self.unenriched_scrips),
+        }
+
+    def iter_enrich(
+        self, confirmed: List[Tuple[str, Announcement, dict]]
+    ) -> Iterator[Tuple[str, dict]]:
+        """
+        Enrichment stage, run after all first-filing checks.
+
+        Each unique scrip is enriched with one ``get_scrip_info`` call that
+        also returns the announcement-day price for every date the scrip
+        filed on, so a scrip that is first in several categories or on
+        several dates shares its current price and market cap. Results are
+        fanned back out to every filing and yielded in confirmation order.
+        Filings whose scrip cannot be enriched are dropped.
+
+        At ``enrich_level`` "none", and for scrips reached when the deadline
+        is near, no calls are made and filings carry only what the
+        announcement has. Scrips in the negative cache are not requested
+        either: those whose lookup found no symbol are dropped, those with
+        no quote are reported unenriched. Definitive failures are added to
+        the cache; scrips that resolve again are removed from it.
+        """
+        dates_by_scrip = {}
+        for _, filing, _ in confirmed:
+            dates = dates_by_scrip.setdefault(filing.scrip_code, {})
+            dates.setdefault(filing.date.date(), filing.date)
+        if confirmed and self.enrich_level != "none":
+            logger.info(
+                f"Enriching {len(confirmed)} first filings from {len(dates_by_scrip)} scrips"
+            )
+
+        infos = {}
+        for category_label, filing, history in confirmed:
+            scrip_code = filing.scrip_code
+            if self.enrich_level == "none":
+                infos[scrip_code] = NOT_ENRICHED
+            elif scrip_code not in infos:
+                unresolved = self._cached_unresolved(scrip_code)
+                if unresolved is not None:
+                    infos[scrip_code] = (
+                        None if unresolved == NO_SYMBOL else NOT_ENRICHED
+                    )
+                elif self._deadline_near():
+                    self.unenriched_scrips.append(scrip_code)
+                    infos[scrip_code] = NOT_ENRICHED
+                else:
+                    started = time.monotonic()
+                    errors = []
+                    infos[scrip_code] = self._scrip_info(
+                        scrip_code, list(dates_by_scrip[scrip_code].values()), errors
+                    )
+                    self._observe_check(time.monotonic() - started)
+                    self._record_resolution(scrip_code, infos[scrip_code], errors)
+
+            info = infos[scrip_code]
+            if info is None:
+                continue
+
+            if info is NOT_ENRICHED:
+                enriched_data = self._enriched_filing(
+                    scrip_code,
+                    filing.date,
+                    None,
+                    company_name=filing.company_name,
+                    attachment_url=filing.attachment_url,
+                    require_symbol=False,
+                )
+            else:
+                prices = info.get("prices_at_announcement")
+                if prices:
+                    info = dict(
+                        info, price_at_announcement=prices.get(filing.date.date())
+                    )
+                enriched_data = self._enriched_filing(
+                    scrip_code,
+                    filing.date,
+                    info,
+                    company_name=filing.company_name,
+                    attachment_url=filing.attachment_url,
+                )
+            if enriched_data:
+                enriched_data.update(history)
+                yield category_label, enriched_data
+
+    def _cached_unresolved(self, scrip_code) -> Optional[str]:
+        """Reason the negative cache skips the scrip, or None."""
+        if self.negative_cache is None:
+            return None
+        reason = self.negative_cache.get(scrip_code)
+        if reason is not None:
+            logger.info(
+                f"Skipping enrichment of unresolved scrip {scrip_code} ({reason})"
+            )
+        return reason
+
+    def _record_resolution(
+        self, scrip_code, info: Optional[dict], errors: Sequence[Exception] = ()
+    ) -> None:
+        """
+        Update the negative cache from a completed enrichment call. Only a
+        definite empty answer is cached, not one caused by failed requests.
+        """
+        if self.negative_cache is None or info is None:
+            # No cache, or the call raised: possibly transient, retry next run
+            return
+        reason = unresolved_reason(info)
+        if reason is None:
+            self.negative_cache.discard(scrip_code)
+        elif errors:
+            logger.info(
+                f"Not caching unresolved scrip {scrip_code} ({reason}): request failed"
+            )
+        else:
+            self.negative_cache.add(scrip_code, reason)
+
+    def _scrip_info(
+        self, scrip_code, dates: List[datetime], errors: Optional[list] = None
+    ) -> Optional[dict]:
+        """
+        One enrichment call for a scrip and every date it needs a price for.
+        Requests the client skipped after a failure are added to ``errors``.
+        """
+        try:
+            if self.enrich_level == "price":
+                return self.exchange_client.get_scrip_info(
+                    str(scrip_code), dates[0], level="price", errors=errors
+                )
+            if len(dates) == 1:
+                return self.exchange_client.get_scrip_info(
+                    str(scrip_code), dates[0], errors=errors
+                )
+            return self.exchange_client.get_scrip_info(
+                str(scrip_code), dates[0], price_dates=dates[1:], errors=errors
+            )
+        except Exception as e:
+            logger.error(f"Error enriching data for {scrip_code}: {e}")
+            return None
+
+    def evaluate(
+        self,
+        announcements_by_cat: Dict[str, List[Announcement]],
+        lookback_years: Union[int, Sequence[int]],
+    ) -> Dict[str, List[dict]]:
+        """
+        Check each announcement for a first filing and enrich the confirmed ones.
+        Returns a dict: {category_label: [filing_dict]}
+        """
+        filings_data = {}
+        for category_label, enriched_data in self.iter_evaluate(
+            announcements_by_cat, lookback_years
+        ):
+            filings_data.setdefault(category_label, []).append(enriched_data)
+        return filings_data
+
+    def iter_analyze(
+        self,
+        from_date: datetime,
+        to_date: datetime,
+        categories: Optional[List[str]],
+        lookback_years: Union[int, Sequence[int]],
+    ) -> Iterator[Tuple[str, dict]]:
+        """
+        Fetch announcements for the period and yield the enriched first filings.
+        Yields (category_label, filing_dict).
+        """
+        announcements_by_cat = self.fetch_announcements(
+            from_date, to_date, categories=categories
+        )
+        self.record_feed(announcements_by_cat, from_date, to_date)
+        yield from self.iter_evaluate(announcements_by_cat, lookback_years)
+
+    def record_feed(
+        self,
+        announcements_by_cat: Dict[str, List[Announcement]],
+        from_date: datetime,
+        to_date: datetime,
+    ) -> None:
+        """
+        Add a fetched feed to the local history stores, if any. The feed must
+        be complete for each category over the date range, so categories
+        in ``incomplete_categories`` are left out: their coverage would
+        claim filings that were never fetched.
+
+        Stores cover closed days only, so the day a previous run recorded
+        while it was open is not covered yet. Up to ``RECORD_GAP_DAYS``
+        such days before ``from_date`` are fetched and recorded along with
+        the feed, keeping coverage contiguous.
+        """
+        stores = [
+            store
+            for store in (self.history_index, self.last_filing_table)
+            if store is not None
+        ]
+        for category_label, announcements in announcements_by_cat.items():
+            if category_label in self.incomplete_categories:
+                logger.warning(f"Not recording partial {category_label} feed")
+                continue
+            start = from_date
+            gap = self._coverage_gap(stores, category_label, from_date)
+            if gap is not None:
+                try:
+                    errors = []
+                    missed = self.exchange_client.fetch_announcements(
+                        from_date=gap,
+                        to_date=from_date - timedelta(days=1),
+                        category=category_label,
+                        errors=errors,
+                    )
+                    if not errors:
+                        announcements = list(missed) + list(announcements)
+                        start = gap
+                except Exception as e:
+                    logger.error(
+                        f"Failed to fetch uncovered {category_label} days from {gap:%Y-%m-%d}: {e}"
+                    )
+            if self.history_index is not None:
+                self.history_index.extend(category_label, announcements, start, to_date)
+            if self.last_filing_table is not None:
+                self.last_filing_table.update(
+                    category_label, announcements, start, to_date
+                )
+
+    def _coverage_gap(
+        self, stores: list, category_label: str, from_date: datetime
+    ) -> Optional[datetime]:
+        """
+        Return the first uncovered day before ``from_date`` of the stores
+        covering the category, if the gap is short enough to fill.
+        """
+        starts = []
+        for store in stores:
+            through = store.covered_through(category_label)
+            if through is None:
+                continue
+            gap_days = (from_date.date() - through).days - 1
+            if 0 < gap_days <= config.RECORD_GAP_DAYS:
+                starts.append(through + timedelta(days=1))
+        if not starts:
+            return None
+        return datetime.combine(min(starts), datetime.min.time())
+
+    def analyze(
+        self,
+        from_date: datetime,
+        to_date: datetime,
+        categories: Optional[List[str]],
+        lookback_years: Union[int, Sequence[int]],
+    ) -> Dict[str, List[dict]]:
+        """
+        Fetch announcements for the period and return the enriched first filings.
+        Returns a dict: {category_label: [filing_dict]}
+        """
+        filings_data = {}
+        for category_label, enriched_data in self.iter_analyze(
+            from_date, to_date, categories, lookback_years
+        ):
+            filings_data.setdefault(category_label, []).append(enriched_data)
+        return filings_data
+
+    def _indexed_verdicts(
+        self,
+        category_label: str,
+        filings: List[Announcement],
+        lookback_years: int,
+    ) -> Dict[int, bool]:
+        """
+        Answer the first-filing check for every candidate the history index
+        covers in one vectorized query. Returns {position in filings: verdict}.
+        """
+        if self.history_index is None:
+            return {}
+
+        lookback = timedelta(days=lookback_years * 365)
+        covered = [
+            position
+            for position, filing in enumerate(filings)
+            if filing.scrip_code
+            and self.history_index.covers(
+                category_label, filing.date - lookback, filing.date
+            )
+        ]
+        if not covered:
+            return {}
+
+        verdicts = self.history_index.first_filing_verdicts(
+            [filings[position].scrip_code for position in covered],
+            [category_label] * len(covered),
+            [filings[position].date for position in covered],
+            lookback_years,
+        )
+        logger.info(
+            f"History index answered {len(covered)} of {len(filings)} {category_label} checks"
+        )
+        return dict(zip(covered, verdicts))
+
+    def _indexed_previous_dates(
+        self,
+        category_label: str,
+        filings: List[Announcement],
+        lookback_years: int,
+    ) -> Dict[int, Optional[date]]:
+        """
+        Look up the previous filing date for every candidate whose lookback
+        window the history index covers. Returns {position in filings: date}.
+        """
+        if self.history_index is None:
+            return {}
+
+        lookback = timedelta(days=lookback_years * 365)
+        covered = [
+            position
+            for position, filing in enumerate(filings)
+            if filing.scrip_code
+            and self.history_index.covers(
+                category_label, filing.date - lookback, filing.date
+            )
+        ]
+        if not covered:
+            return {}
+
+        scrip_codes = [filings[position].scrip_code for position in covered]
+        categories = [category_label] * len(covered)
+        dates = [filings[position].date for position in covered]
+        previous = self.history_index.previous_filing_dates(
+            scrip_codes, categories, dates
+        )
+        # Another filing on the same day counts as a previous one
+        same_day = self.history_index.count_filings(
+            scrip_codes, categories, dates, dates
+        )
+        previous = [
+            d.date() if count > 1 else p
+            for d, p, count in zip(dates, previous, same_day.tolist())
+        ]
+        return dict(zip(covered, previous))
+
     def is_first_filing(
         self, scrip_code, category_label, filing_date, lookback_years, company_name
     ):
@@ -54,13 +920,21 @@ class FirstFilingAnalyzer:
             f"Checking if first {category_label} for {company_name} ({scrip_code}) since {lookback_start}"
         )
 
+        if self.last_filing_table is not None:
+            answered, previous = self.last_filing_table.previous_filing_date(
+                scrip_code, category_label, filing_date, lookback_start
+            )
+            if answered:
+                return previous is None or previous < lookback_start.date()
+
         try:
-            # Fetch history
+            # Fetch history; two filings are enough to rule out a first one
             historical_filings = self.exchange_client.fetch_announcements(
                 from_date=lookback_start,
                 to_date=filing_date,
                 category=category_label,
                 scrip_code=scrip_code,
+                limit=2,
             )
 
             return len(historical_filings) == 1
@@ -72,6 +946,52 @@ class FirstFilingAnalyzer:
             self.failed_checks_count += 1
             return False
 
+    def previous_filing_date(
+        self, filing: Announcement, category_label: str, lookback_years: int
+    ) -> Optional[date]:
+        """
+        Return the date of the latest other filing of the scrip/category label
+        within the lookback period, or None if this is the only one.
+        Fetches the full window once; raises if the fetch fails.
+        """
+        lookback_start = filing.date - timedelta(days=lookback_years * 365)
+        logger.info(
+            f"Finding previous {category_label} for {filing.company_name} ({filing.scrip_code}) since {lookback_start}"
+        )
+
+        if self.last_filing_table is not None:
+            answered, previous = self.last_filing_table.previous_filing_date(
+                filing.scrip_code, category_label, filing.date, lookback_start
+            )
+            if answered:
+                if previous is None or previous < lookback_start.date():
+                    return None
+                return previous
+
+        history = self.exchange_client.fetch_announcements(
+            from_date=lookback_start,
+            to_date=filing.date,
+            category=category_label,
+            scrip_code=filing.scrip_code,
+        )
+
+        # Drop the candidate itself, matched by exchange ID, else by timestamp
+        others = list(history)
+        for position, other in enumerate(others):
+            if (
+                filing.announcement_id
+                and other.announcement_id == filing.announcement_id
+            ) or (not filing.announcement_id and other.date == filing.date):
+                del others[position]
+                break
+        else:
+            if others:
+                others.remove(max(others, key=lambda other: other.date))
+
+        if not others:
+            return None
+        return min(max(other.date for other in others).date(), filing.date.date())
+
     def enrich_filing_data(
         self, scrip_code, announcement_date_str, company_name=None, attachment_url=None
     ):
@@ -90,6 +1010,36 @@ class FirstFilingAnalyzer:
         else:
             announcement_date = datetime.now()
 
+        try:
+            # Get Enrichment Info from Exchange Client
+            info = self.exchange_client.get_scrip_info(
+                str(scrip_code), announcement_date
+            )
+        except Exception as e:
+            logger.error(f"Error enriching data for {scrip_code}: {e}")
+            return None
+
+        return self._enriched_filing(
+            scrip_code,
+            announcement_date,
+            info,
+            company_name=company_name,
+            attachment_url=attachment_url,
+        )
+
+    def _enriched_filing(
+        self,
+        scrip_code,
+        announcement_date: datetime,
+        info: Optional[dict],
+        company_name=None,
+        attachment_url=None,
+        require_symbol: bool = True,
+    ) -> Optional[dict]:
+        """
+        Build the filing dict from a ``get_scrip_info`` result. Returns None
+        if no symbol was found and ``require_symbol`` is set.
+        """
         # Initialize result
         enriched_info = {
             "symbol": None,
@@ -100,32 +1050,22 @@ class FirstFilingAnalyzer:
             "financial_snapshot": None,
         }
 
-        try:
-            # Get Enrichment Info from Exchange Client
-            info = self.exchange_client.get_scrip_info(
-                str(scrip_code), announcement_date
+        if info:
+            enriched_info.update(
+                {
+                    "symbol": info.get("symbol"),
+                    "current_price": info.get("current_price"),
+                    "price_at_announcement": info.get("price_at_announcement"),
+                    "current_mkt_cap_cr": info.get("current_mkt_cap_cr"),
+                    "financial_snapshot": info.get("financial_snapshot"),
+                }
             )
+            # Only update company name if present in info, else keep original
+            if info.get("company_name"):
+                enriched_info["company_name"] = info.get("company_name")
 
-            if info:
-                enriched_info.update(
-                    {
-                        "symbol": info.get("symbol"),
-                        "current_price": info.get("current_price"),
-                        "price_at_announcement": info.get("price_at_announcement"),
-                        "current_mkt_cap_cr": info.get("current_mkt_cap_cr"),
-                        "financial_snapshot": info.get("financial_snapshot"),
-                    }
-                )
-                # Only update company name if present in info, else keep original
-                if info.get("company_name"):
-                    enriched_info["company_name"] = info.get("company_name")
-
-            if not enriched_info["symbol"]:
-                logger.warning(f"Could not find symbol for scrip {scrip_code}")
-                return None
-
-        except Exception as e:
-            logger.error(f"Error enriching data for {scrip_code}: {e}")
+        if require_symbol and not enriched_info["symbol"]:
+            logger.warning(f"Could not find symbol for scrip {scrip_code}")
             return None
 
         return {
@@ -1,9 +1,10 @@
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
 
-@dataclass
+@dataclass(slots=True)
 class Announcement:
     scrip_code: str
     company_name: str
@@ -11,16 +12,106 @@ class Announcement:
     category: str
     description: str
     attachment_url: Optional[str] = None
+    announcement_id: Optional[str] = None  # Exchange ID (BSE NEWSID, NSE seq_id)
+
+    def __post_init__(self):
+        # Large history fetches repeat the same few categories and companies
+        if isinstance(self.category, str):
+            self.category = sys.intern(self.category)
+        if isinstance(self.company_name, str):
+            self.company_name = sys.intern(self.company_name)
+
+def announcement_key(announcement: Announcement) -> Tuple[Hashable, ...]:
+    """
+    Identity of an announcement, used to recognise it across watch polls,
+    overlapping shards and runs.
+
+    Uses the exchange ID (BSE ``NEWSID``, NSE ``seq_id``) when present, and
+    falls back to scrip, timestamp and attachment otherwise. The category is
+    part of the key because one filing can match several categories.
+    """
+    if announcement.announcement_id:
+        return (announcement.category, announcement.announcement_id)
+
+    return (
+        announcement.category,
+        announcement.scrip_code,
+        announcement.date.isoformat() if announcement.date else None,
+        announcement.attachment_url,
+    )
+
+def project_fields(row: dict, fields: Iterable[str], interned: Iterable[str] = ()) -> dict:
+    """
+    Return a copy of a raw exchange row holding only ``fields``.
+    Keys missing from the row stay missing, so ``.get`` defaults still apply.
+    String values of ``interned`` fields (e.g. company names) are interned.
+    """
+    projected = {field: row[field] for field in fields if field in row}
+    for field in interned:
+        value = projected.get(field)
+        if isinstance(value, str):
+            projected[field] = sys.intern(value)
+    return projected
 
 class ExchangeClient(ABC):
+    # Optional hedging.Hedger for slow idempotent reads (--hedge)
+    hedger = None
+
     @abstractmethod
-    def fetch_announcements(self, from_date: datetime, to_date: datetime, category: str, subcategory: Optional[str] = None, scrip_code: Optional[str] = None) -> List[Announcement]:
+    def fetch_announcements(self, from_date: datetime, to_date: datetime, category: str, subcategory: Optional[str] = None, scrip_code: Optional[str] = None, limit: Optional[int] = None, errors: Optional[list] = None) -> List[Announcement]:
+        """
+        Returns announcements for a category label in a date range.
+        With ``limit``, at most that many are returned and clients may stop fetching early.
+        Clients that skip a failed part of the fetch instead of raising append
+        its exception to ``errors``, so callers can tell a partial result
+        from a complete one (e.g. before caching it).
+        """
         pass
 
     @abstractmethod
-    def get_scrip_info(self, scrip_code: str, announcement_date: datetime) -> dict:
+    def get_scrip_info(self, scrip_code: str, announcement_date: datetime, price_dates: Sequence[datetime] = (), level: str = "full", errors: Optional[list] = None) -> dict:
         """
         Returns a dictionary with:
         symbol, company_name, current_price, price_at_announcement, current_mkt_cap_cr
+
+        With level "price" only the symbol, current price and market cap are
+        fetched (no announcement-day price or financials).
+
+        With price_dates, the dictionary also has prices_at_announcement,
+        {date: price} for announcement_date and each of price_dates, so one
+        call enriches every filing of the scrip.
+
+        A lookup or quote request that fails is logged and its field left
+        None; the exception is appended to ``errors``, so callers can tell
+        a failed request from a definite empty answer.
         """
         pass
+
+    def close(self) -> None:
+        """
+        Release network resources held by the client. No-op by default.
+        """
+        pass
+
+    def clear_buffers(self) -> None:
+        """
+        Drop any buffered announcement feeds so the next fetch hits the exchange.
+        No-op by default.
+        """
+        pass
+
+    def bulk_prices(self, day: datetime) -> Optional[Dict[str, float]]:
+        """
+        Closing price of every scrip traded on ``day`` from one bulk download
+        (the bhavcopy), keyed like ``Announcement.scrip_code``. None if the
+        exchange has no bulk source or no report for that day.
+        """
+        return None
+
+    def _call(self, endpoint: str, fn, *args, **kwargs):
+        """
+        Make one exchange library request, hedged if the client has a hedger.
+        """
+        if self.hedger is None:
+            return fn(*args, **kwargs)
+        return self.hedger.call(endpoint, fn, *args, **kwargs)
@@ -0,0 +1,153 @@
+import logging
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Optional, TypeVar
+from . import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """
+    Recent successful-request latencies per endpoint, used to decide when
+    a request has become slow enough to hedge. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        percentile: float = config.HEDGE_PERCENTILE,
+        window: int = config.HEDGE_WINDOW,
+        min_samples: int = config.HEDGE_MIN_SAMPLES,
+        min_delay: float = config.HEDGE_MIN_DELAY,
+    ):
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def threshold(self, endpoint: str) -> Optional[float]:
+        """
+        Seconds after which a request to ``endpoint`` is hedged: the
+        configured percentile of its recent latencies, at least
+        ``min_delay``. None until ``min_samples`` requests have completed.
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(endpoint, ()))
+        if len(samples) < self.min_samples:
+            return None
+        rank = min(len(samples) - 1, int(len(samples) * self.percentile / 100))
+        return max(self.min_delay, samples[rank])
+
+
+class Hedger:
+    """
+    Hedged requests for idempotent exchange reads.
+
+    ``call`` runs the request on a worker thread. If it has not returned
+    once its endpoint's latency percentile has passed, one duplicate is
+    sent and whichever succeeds first is used. A loser still queued is
+    cancelled; one already in flight cannot be interrupted, so it is left
+    to finish (bounded by the library timeout) and its result discarded.
+
+    Duplicates go through the same library call, and therefore the same
+    library rate limiter, as the original. At most ``max_ratio`` of
+    requests are hedged, so a slow exchange is not sent twice the load.
+    """
+
+    def __init__(
+        self,
+        tracker: Optional[LatencyTracker] = None,
+        max_ratio: float = config.HEDGE_MAX_RATIO,
+        max_workers: int = config.HEDGE_MAX_WORKERS,
+    ):
+        self.tracker = tracker if tracker is not None else LatencyTracker()
+        self.max_ratio = max_ratio
+        self.stats: Dict[str, Counter] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="hedge"
+        )
+        self._lock = threading.Lock()
+
+    def call(self, endpoint: str, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Call ``fn(*args, **kwargs)``, hedging it if it is slow."""
+        delay = self.tracker.threshold(endpoint)
+        primary = self._submit(endpoint, fn, args, kwargs)
+        self._count(endpoint, "requests")
+        pending = {primary}
+
+        if delay is not None:
+            done, _ = wait(pending, timeout=delay)
+            if not done and self._may_hedge():
+                logger.info(f"Hedging {endpoint} after {delay:.2f}s")
+                pending.add(self._submit(endpoint, fn, args, kwargs))
+                self._count(endpoint, "hedged")
+
+        winner = None
+        error = None
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    winner = future
+                    break
+                error = error or future.exception()
+
+        for loser in pending:
+            self._count(endpoint, "cancelled" if loser.cancel() else "abandoned")
+        if winner is None:
+            raise error
+        if winner is not primary:
+            self._count(endpoint, "hedge_wins")
+        return winner.result()
+
+    def report(self) -> dict:
+        """Hedging counters, in total and per endpoint, with current thresholds."""
+        with self._lock:
+            stats = {endpoint: dict(counts) for endpoint, counts in self.stats.items()}
+        totals = Counter()
+        for endpoint, counts in stats.items():
+            totals.update(counts)
+            threshold = self.tracker.threshold(endpoint)
+            counts["threshold_s"] = round(threshold, 3) if threshold else None
+        return {
+            "percentile": self.tracker.percentile,
+            **{key: totals[key] for key in ("requests", "hedged", "hedge_wins")},
+            "endpoints": stats,
+        }
+
+    def close(self) -> None:
+        """Stop the worker threads; requests still in flight are abandoned."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, endpoint, fn, args, kwargs):
+        def timed():
+            started = time.monotonic()
+            result = fn(*args, **kwargs)
+            # Losers are recorded too, so the percentile sees the slow tail
+            self.tracker.record(endpoint, time.monotonic() - started)
+            return result
+
+        return self._executor.submit(timed)
+
+    def _count(self, endpoint: str, key: str) -> None:
+        with self._lock:
+            self.stats.setdefault(endpoint, Counter())[key] += 1
+
+    def _may_hedge(self) -> bool:
+        with self._lock:
+            requests = sum(c["requests"] for c in self.stats.values())
+            hedged = sum(c["hedged"] for c in self.stats.values())
+        return hedged < requests * self.max_ratio
@@ -0,0 +1,320 @@
+import json
+import logging
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from . import config
+from .exchange import Announcement
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency: pip install firstfilings[index]
+    np = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+KEYS_FILE = "keys.npy"
+VOCAB_FILE = "vocab.json"
+
+# Key layout (int64): scrip id << 32 | category id << 24 | epoch day
+DAY_BITS = 24
+CATEGORY_BITS = 8
+SCRIP_SHIFT = DAY_BITS + CATEGORY_BITS
+DAY_MASK = (1 << DAY_BITS) - 1
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+DateLike = Union[date, datetime]
+
+
+def epoch_day(value: DateLike) -> int:
+    """Days since 1970-01-01 for a date or datetime."""
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def from_epoch_day(day: int) -> date:
+    return date.fromordinal(int(day) + EPOCH_ORDINAL)
+
+
+class HistoryIndex:
+    """
+    Column-oriented index of filing dates by (scrip, category).
+
+    Each filing is one int64 key (scrip id, category id, epoch day) in a
+    sorted NumPy array, so "filings of scrip s in category c between days a
+    and b" for a whole batch of candidates is two vectorized ``searchsorted``
+    calls. Scrip codes and category labels are integer-encoded through a small
+    JSON vocabulary, and the key array can be memory-mapped from disk.
+
+    The index only answers for category date ranges it fully covers (see
+    ``covers``); callers fall back to the exchange otherwise. Coverage holds
+    closed days only; the current day, whose filings added so far can still
+    be followed by others, is tracked in memory (``open_days``).
+
+    Requires the optional ``numpy`` dependency.
+    """
+
+    def __init__(
+        self,
+        keys=None,
+        scrips: Sequence[str] = (),
+        categories: Sequence[str] = (),
+        coverage: Optional[Dict[str, Tuple[int, int]]] = None,
+    ):
+        if np is None:
+            raise ImportError(
+                "HistoryIndex requires numpy (pip install firstfilings[index])"
+            )
+        self.keys = keys if keys is not None else np.empty(0, dtype=np.int64)
+        self.scrips: List[str] = list(scrips)
+        self.categories: List[str] = list(categories)
+        self._scrip_ids = {code: i for i, code in enumerate(self.scrips)}
+        self._category_ids = {label: i for i, label in enumerate(self.categories)}
+        self.coverage: Dict[str, Tuple[int, int]] = dict(coverage or {})
+        self.open_days: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _scrip_id(self, scrip_code: str) -> int:
+        scrip_id = self._scrip_ids.get(scrip_code)
+        if scrip_id is None:
+            scrip_id = len(self.scrips)
+            self.scrips.append(scrip_code)
+            self._scrip_ids[scrip_code] = scrip_id
+        return scrip_id
+
+    def _category_id(self, category: str) -> int:
+        category_id = self._category_ids.get(category)
+        if category_id is None:
+            category_id = len(self.categories)
+            if category_id >= 1 << CATEGORY_BITS:
+                raise ValueError("Too many categories for the history index")
+            self.categories.append(category)
+            self._category_ids[category] = category_id
+        return category_id
+
+    def covered_through(self, category: str) -> Optional[date]:
+        span = self.coverage.get(category)
+        return from_epoch_day(span[1]) if span else None
+
+    def covers(self, category: str, from_date: DateLike, to_date: DateLike) -> bool:
+        """
+        Return True if the index holds every filing of ``category`` in the
+        range. A range ending on the open day counts when the days before it
+        are covered: its filings so far were added by this process.
+        """
+        span = self.coverage.get(category)
+        if not span:
+            return False
+        to_day = epoch_day(to_date)
+        if to_day == self.open_days.get(category):
+            to_day -= 1
+        return span[0] <= epoch_day(from_date) and to_day <= span[1]
+
+    def extend(
+        self,
+        category: str,
+        announcements: Iterable[Announcement],
+        from_date: DateLike,
+        to_date: DateLike,
+        today: Optional[date] = None,
+    ) -> None:
+        """
+        Add the complete set of ``category`` filings for a date range.
+
+        Existing keys of the category inside the range are replaced, so
+        re-adding a range is idempotent. Coverage grows when the range
+        overlaps or touches the covered span, but only through closed days:
+        ``today`` is added as the open day, since more filings can arrive.
+        """
+        from_day, to_day = epoch_day(from_date), epoch_day(to_date)
+        category_id = self._category_id(category)
+        prefix = category_id << DAY_BITS
+
+        new_keys = np.fromiter(
+            (
+                (self._scrip_id(str(a.scrip_code)) << SCRIP_SHIFT)
+                | prefix
+                | epoch_day(a.date)
+                for a in announcements
+                if a.scrip_code and from_day <= epoch_day(a.date) <= to_day
+            ),
+            dtype=np.int64,
+        )
+
+        keys = np.asarray(self.keys)
+        stale = (
+            (((keys >> DAY_BITS) & ((1 << CATEGORY_BITS) - 1)) == category_id)
+            & ((keys & DAY_MASK) >= from_day)
+            & ((keys & DAY_MASK) <= to_day)
+        )
+        self.keys = np.sort(np.concatenate([keys[~stale], new_keys]))
+
+        today = epoch_day(today or date.today())
+        if from_day <= today <= to_day:
+            self.open_days[category] = today
+        to_day = min(to_day, today - 1)
+        if to_day < from_day:
+            return
+
+        span = self.coverage.get(category)
+        if not span:
+            self.coverage[category] = (from_day, to_day)
+        elif from_day <= span[1] + 1 and to_day >= span[0] - 1:
+            self.coverage[category] = (min(span[0], from_day), max(span[1], to_day))
+        else:
+            logger.warning(
+                f"History index range for {category} is not contiguous with {from_epoch_day(span[0])}..{from_epoch_day(span[1])}; coverage unchanged"
+            )
+
+    def _prefixes(self, scrip_codes: Sequence[str], categories: Sequence[str]):
+        """Return (scrip|category key prefixes, known mask) for a batch."""
+        scrip_ids = np.fromiter(
+            (self._scrip_ids.get(str(code), -1) for code in scrip_codes),
+            dtype=np.int64,
+            count=len(scrip_codes),
+        )
+        category_ids = np.fromiter(
+            (self._category_ids.get(label, -1) for label in categories),
+            dtype=np.int64,
+            count=len(categories),
+        )
+        known = (scrip_ids >= 0) & (category_ids >= 0)
+        prefixes = (scrip_ids << SCRIP_SHIFT) | (category_ids << DAY_BITS)
+        return prefixes, known
+
+    def count_filings(
+        self,
+        scrip_codes: Sequence[str],
+        categories: Sequence[str],
+        from_dates: Sequence[DateLike],
+        to_dates: Sequence[DateLike],
+    ):
+        """
+        Count filings per candidate between ``from_dates[i]`` and
+        ``to_dates[i]`` (inclusive days). Returns an int64 array.
+        """
+        prefixes, known = self._prefixes(scrip_codes, categories)
+        from_days = np.fromiter(
+            (epoch_day(d) for d in from_dates), dtype=np.int64, count=len(from_dates)
+        )
+        to_days = np.fromiter(
+            (epoch_day(d) for d in to_dates), dtype=np.int64, count=len(to_dates)
+        )
+
+        lo = np.searchsorted(self.keys, prefixes | from_days, side="left")
+        hi = np.searchsorted(self.keys, prefixes | to_days, side="right")
+        return np.where(known, hi - lo, 0)
+
+    def previous_filing_dates(
+        self,
+        scrip_codes: Sequence[str],
+        categories: Sequence[str],
+        dates: Sequence[DateLike],
+    ) -> List[Optional[date]]:
+        """
+        Return, per candidate, the latest filing date strictly before
+        ``dates[i]``, or None if there is none in the index.
+        """
+        prefixes, known = self._prefixes(scrip_codes, categories)
+        days = np.fromiter(
+            (epoch_day(d) for d in dates), dtype=np.int64, count=len(dates)
+        )
+
+        pos = np.searchsorted(self.keys, prefixes | days, side="left") - 1
+        found = known & (pos >= 0)
+        previous = np.where(found, self.keys[np.maximum(pos, 0)], -1)
+        found &= (previous >> DAY_BITS) == (prefixes >> DAY_BITS)
+
+        return [
+            from_epoch_day(key & DAY_MASK) if ok else None
+            for key, ok in zip(previous.tolist(), found.tolist())
+        ]
+
+    def first_filing_verdicts(
+        self,
+        scrip_codes: Sequence[str],
+        categories: Sequence[str],
+        dates: Sequence[DateLike],
+        lookback_years: int,
+    ) -> List[bool]:
+        """
+        Return, per candidate, whether it is the only filing of its category
+        for the scrip within the lookback window ending on its date.
+        """
+        from_dates = [d - timedelta(days=lookback_years * 365) for d in dates]
+        counts = self.count_filings(scrip_codes, categories, from_dates, dates)
+        return (counts <= 1).tolist()
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the key array and vocabulary to directory ``path``."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        # Write-and-rename, so a memory-mapped copy of the old keys stays valid
+        keys_tmp = path / f"{KEYS_FILE}.tmp"
+        with open(keys_tmp, "wb") as f:
+            np.save(f, np.asarray(self.keys))
+        vocab_tmp = path / f"{VOCAB_FILE}.tmp"
+        with open(vocab_tmp, "w") as f:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "scrips": self.scrips,
+                    "categories": self.categories,
+                    "coverage": self.coverage,
+                },
+                f,
+            )
+        os.replace(keys_tmp, path / KEYS_FILE)
+        os.replace(vocab_tmp, path / VOCAB_FILE)
+        logger.info(f"Saved history index with {len(self)} filings to {path}")
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "HistoryIndex":
+        """
+        Load an index saved with ``save``. With ``mmap`` the key array is
+        memory-mapped read-only instead of read into memory.
+        """
+        if np is None:
+            raise ImportError(
+                "HistoryIndex requires numpy (pip install firstfilings[index])"
+            )
+        path = Path(path)
+        with open(path / VOCAB_FILE) as f:
+            vocab = json.load(f)
+        if vocab.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported history index version in {path}")
+
+        keys = np.load(path / KEYS_FILE, mmap_mode="r" if mmap else None)
+        return cls(
+            keys=keys,
+            scrips=vocab["scrips"],
+            categories=vocab["categories"],
+            coverage={cat: tuple(span) for cat, span in vocab["coverage"].items()},
+        )
+
+
+def index_path(exchange: str) -> Path:
+    """Default on-disk location of an exchange's history index."""
+    return Path(config.HISTORY_INDEX_DIR) / exchange.replace("-", "_")
+
+
+def load_index(exchange: str, create: bool = False) -> Optional[HistoryIndex]:
+    """
+    Load the exchange's history index. Returns None if numpy is missing, and
+    an empty index (with ``create``) or None if none has been built yet.
+    """
+    if np is None:
+        logger.warning("numpy is not installed; history index disabled")
+        return None
+
+    path = index_path(exchange)
+    if not (path / VOCAB_FILE).exists():
+        logger.info(f"No history index at {path}")
+        return HistoryIndex() if create else None
+    return HistoryIndex.load(path)
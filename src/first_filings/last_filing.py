@@ -0,0 +1,216 @@
+import logging
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from . import config
+from .exchange import Announcement
+from .utils import load_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+TABLE_VERSION = 1
+# Recent filings kept per scrip and category: the candidate and the one before it
+KEEP_FILINGS = 2
+
+DateLike = Union[date, datetime]
+
+
+def as_date(value: DateLike) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def filing_identity(announcement: Announcement) -> str:
+    """Stable identity of a filing, so re-recording a range is idempotent."""
+    return str(
+        announcement.announcement_id
+        or announcement.attachment_url
+        or announcement.date.isoformat()
+    )
+
+
+class LastFilingTable:
+    """
+    Most recent filing dates per (scrip, category) for one exchange.
+
+    Built from the full-market announcement feed (``update-table``) and kept
+    current by recording each run's feed, so the daily first-filing checks are
+    dictionary lookups. Only the latest ``KEEP_FILINGS`` filings are kept per
+    scrip and category, together with the date range each category's feed
+    was recorded for (``coverage``). Coverage holds closed days only; the
+    feed of the current day, recorded so far by this process, is tracked
+    separately (``open_days``) because later filings of that day can still
+    arrive.
+
+    ``previous_filing_date`` answers only when the table can be sure; callers
+    fall back to the exchange otherwise.
+    """
+
+    def __init__(
+        self,
+        entries: Optional[Dict[str, Dict[str, List[Tuple[date, str]]]]] = None,
+        coverage: Optional[Dict[str, Tuple[date, date]]] = None,
+    ):
+        self.entries = entries or {}
+        self.coverage = dict(coverage or {})
+        self.open_days: Dict[str, date] = {}
+
+    def __len__(self) -> int:
+        return sum(len(scrips) for scrips in self.entries.values())
+
+    def covered_through(self, category: str) -> Optional[date]:
+        span = self.coverage.get(category)
+        return span[1] if span else None
+
+    def update(
+        self,
+        category: str,
+        announcements: Iterable[Announcement],
+        from_date: DateLike,
+        to_date: DateLike,
+        today: Optional[date] = None,
+    ) -> None:
+        """
+        Record the complete ``category`` feed for a date range.
+
+        Coverage grows when the range overlaps or touches the covered span,
+        but only through closed days: filings can still arrive for ``today``,
+        so it is recorded as an open day and fetched again by the next update.
+        """
+        from_day, to_day = as_date(from_date), as_date(to_date)
+        scrips = self.entries.setdefault(category, {})
+
+        for a in announcements:
+            if not a.scrip_code or not from_day <= a.date.date() <= to_day:
+                continue
+            recent = scrips.setdefault(str(a.scrip_code), [])
+            filing = (a.date.date(), filing_identity(a))
+            if filing in recent:
+                continue
+            recent.append(filing)
+            recent.sort(reverse=True)
+            del recent[KEEP_FILINGS:]
+
+        today = today or date.today()
+        if from_day <= today <= to_day:
+            self.open_days[category] = today
+        to_day = min(to_day, today - timedelta(days=1))
+        if to_day < from_day:
+            return
+
+        span = self.coverage.get(category)
+        if not span:
+            self.coverage[category] = (from_day, to_day)
+        elif from_day.toordinal() <= span[1].toordinal() + 1 and (
+            to_day.toordinal() >= span[0].toordinal() - 1
+        ):
+            self.coverage[category] = (min(span[0], from_day), max(span[1], to_day))
+        else:
+            logger.warning(
+                f"Last-filing table range for {category} is not contiguous with {span[0]}..{span[1]}; coverage unchanged"
+            )
+
+    def previous_filing_date(
+        self,
+        scrip_code: str,
+        category: str,
+        filing_date: DateLike,
+        lookback_start: DateLike,
+    ) -> Tuple[bool, Optional[date]]:
+        """
+        Look up the latest filing before a candidate, the candidate's own
+        entry excluded (another filing on the same day counts).
+
+        Returns:
+            (answered, previous date). ``previous`` is None when there is no
+            other filing since ``lookback_start``. ``answered`` is False when
+            the table cannot tell, e.g. the feed was not recorded through the
+            filing date or older filings were pushed out of the table.
+        """
+        span = self.coverage.get(category)
+        filing_day = as_date(filing_date)
+        if not span:
+            return False, None
+        if span[1] < filing_day and not (
+            # Today's candidates: closed days are covered and the open day's
+            # feed, the candidate's own filing included, was recorded so far
+            self.open_days.get(category) == filing_day
+            and span[1] == filing_day - timedelta(days=1)
+        ):
+            return False, None
+
+        recorded = [
+            day for day, _ in self.entries.get(category, {}).get(str(scrip_code), [])
+        ]
+        others = list(recorded)
+        if filing_day in others:
+            others.remove(filing_day)
+
+        before = [day for day in others if day <= filing_day]
+        if before and before[0] >= span[0]:
+            return True, before[0]
+        if not before and len(recorded) >= KEEP_FILINGS:
+            # Only later filings are kept; earlier ones were pushed out
+            return False, None
+        # No other filing since the start of coverage
+        if span[0] <= as_date(lookback_start):
+            return True, None
+        return False, None
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the table to the JSON file ``path``."""
+        write_json_atomic(
+            path,
+            {
+                "version": TABLE_VERSION,
+                "coverage": {
+                    category: [span[0].isoformat(), span[1].isoformat()]
+                    for category, span in self.coverage.items()
+                },
+                "entries": {
+                    category: {
+                        scrip: [[day.isoformat(), ident] for day, ident in recent]
+                        for scrip, recent in scrips.items()
+                    }
+                    for category, scrips in self.entries.items()
+                },
+            },
+        )
+        logger.info(f"Saved last-filing table with {len(self)} entries to {path}")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "LastFilingTable":
+        """Load a table saved with ``save``."""
+        data = load_json(path)
+        if not data or data.get("version") != TABLE_VERSION:
+            raise ValueError(f"Unsupported last-filing table in {path}")
+
+        return cls(
+            entries={
+                category: {
+                    scrip: [(date.fromisoformat(day), ident) for day, ident in recent]
+                    for scrip, recent in scrips.items()
+                }
+                for category, scrips in data["entries"].items()
+            },
+            coverage={
+                category: (date.fromisoformat(span[0]), date.fromisoformat(span[1]))
+                for category, span in data["coverage"].items()
+            },
+        )
+
+
+def table_path(exchange: str) -> Path:
+    """Default on-disk location of an exchange's last-filing table."""
+    return Path(config.LAST_FILING_DIR) / f"{exchange.replace('-', '_')}.json"
+
+
+def load_table(exchange: str, create: bool = False) -> Optional[LastFilingTable]:
+    """
+    Load the exchange's last-filing table. Returns an empty table (with
+    ``create``) or None if none has been built yet.
+    """
+    path = table_path(exchange)
+    if not path.exists():
+        logger.info(f"No last-filing table at {path}")
+        return LastFilingTable() if create else None
+    return LastFilingTable.load(path)
@@ -0,0 +1,93 @@
+import logging
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+from . import config
+from .utils import load_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+LEDGER_VERSION = 1
+
+
+class DeliveryLedger:
+    """
+    Persistent record of filings already delivered to a sink.
+
+    Filings are keyed by (exchange, category, scrip, date, attachment URL),
+    so overlapping runs (e.g. ``wtd`` after ``day``) only send what is new.
+    Sinks check ``key in ledger`` before formatting a filing and ``mark`` it
+    once the sink has accepted it. ``mark`` is thread-safe, so concurrent
+    senders can share one ledger.
+
+    Entries older than ``DELIVERY_LEDGER_RETENTION_DAYS`` are pruned on save.
+    """
+
+    def __init__(
+        self,
+        delivered: Optional[Dict[str, str]] = None,
+        path: Union[str, Path, None] = None,
+    ):
+        # key -> ISO date it was delivered
+        self.delivered: Dict[str, str] = dict(delivered or {})
+        self.path = path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(exchange, category, scrip_code, filing_date, attachment_url=None) -> str:
+        return "|".join(
+            str(part or "")
+            for part in (
+                str(exchange).lower(),
+                category,
+                scrip_code,
+                filing_date,
+                attachment_url,
+            )
+        )
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.delivered
+
+    def __len__(self) -> int:
+        return len(self.delivered)
+
+    def mark(self, keys: Iterable[str], when: Optional[date] = None) -> None:
+        """Record filings as delivered."""
+        when = (when or date.today()).isoformat()
+        with self._lock:
+            for key in keys:
+                self.delivered[key] = when
+
+    def prune(
+        self,
+        retention_days: int = config.DELIVERY_LEDGER_RETENTION_DAYS,
+        today: Optional[date] = None,
+    ) -> int:
+        """Forget deliveries older than ``retention_days``. Returns the count."""
+        cutoff = ((today or date.today()) - timedelta(days=retention_days)).isoformat()
+        with self._lock:
+            stale = [key for key, when in self.delivered.items() if when < cutoff]
+            for key in stale:
+                del self.delivered[key]
+        return len(stale)
+
+    def save(self, path: Union[str, Path, None] = None) -> None:
+        path = path or self.path
+        self.prune()
+        with self._lock:
+            data = {"version": LEDGER_VERSION, "delivered": dict(self.delivered)}
+        write_json_atomic(path, data)
+        logger.info(f"Saved delivery ledger with {len(data['delivered'])} entries")
+
+    @classmethod
+    def load(
+        cls, path: Union[str, Path] = config.DELIVERY_LEDGER_FILE
+    ) -> "DeliveryLedger":
+        """Load the ledger at ``path``, or start an empty one there."""
+        data = load_json(path, default={})
+        if data and data.get("version") != LEDGER_VERSION:
+            logger.warning(f"Ignoring delivery ledger with unknown version at {path}")
+            data = {}
+        return cls(data.get("delivered"), path=path)
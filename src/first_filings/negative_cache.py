@@ -0,0 +1,119 @@
+import logging
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Union
+from . import config
+from .utils import load_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+# Why a scrip could not be enriched
+NO_SYMBOL = "no_symbol"  # lookup found no symbol: the filing is not reported
+NO_QUOTE = "no_quote"  # no current price: the filing is reported unenriched
+
+
+def unresolved_reason(info: Optional[dict]) -> Optional[str]:
+    """
+    Classify a ``get_scrip_info`` result. Returns NO_SYMBOL or NO_QUOTE if
+    the lookup or quote came back empty, else None. Results of calls that
+    raised, or that reported failed requests in ``errors``, are not cached:
+    those failures may be transient.
+    """
+    if not info or not info.get("symbol"):
+        return NO_SYMBOL
+    if info.get("current_price") is None:
+        return NO_QUOTE
+    return None
+
+
+class NegativeCache:
+    """
+    Persistent record of scrips whose enrichment definitively failed, e.g.
+    delisted or suspended codes, for one exchange.
+
+    Each entry expires ``NEGATIVE_CACHE_TTL_DAYS`` after it was recorded;
+    until then enrichment skips the scrip instead of repeating every
+    lookup and quote request. Thread-safe, so concurrent analyses can
+    share one cache.
+    """
+
+    def __init__(
+        self,
+        entries: Optional[Dict[str, dict]] = None,
+        path: Union[str, Path, None] = None,
+    ):
+        # scrip code -> {"reason": ..., "expires": ISO date}
+        self.entries: Dict[str, dict] = dict(entries or {})
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, scrip_code, today: Optional[date] = None) -> Optional[str]:
+        """Return why the scrip is cached, or None if absent or expired."""
+        entry = self.entries.get(str(scrip_code))
+        if entry and entry["expires"] > (today or date.today()).isoformat():
+            return entry["reason"]
+        return None
+
+    def add(
+        self,
+        scrip_code,
+        reason: str,
+        ttl_days: int = config.NEGATIVE_CACHE_TTL_DAYS,
+        today: Optional[date] = None,
+    ) -> None:
+        expires = (today or date.today()) + timedelta(days=ttl_days)
+        with self._lock:
+            self.entries[str(scrip_code)] = {
+                "reason": reason,
+                "expires": expires.isoformat(),
+            }
+
+    def discard(self, scrip_code) -> None:
+        """Forget a scrip, e.g. once it resolves again."""
+        with self._lock:
+            self.entries.pop(str(scrip_code), None)
+
+    def prune(self, today: Optional[date] = None) -> int:
+        """Drop expired entries. Returns the count."""
+        today = (today or date.today()).isoformat()
+        with self._lock:
+            expired = [
+                scrip
+                for scrip, entry in self.entries.items()
+                if entry["expires"] <= today
+            ]
+            for scrip in expired:
+                del self.entries[scrip]
+        return len(expired)
+
+    def save(self, path: Union[str, Path, None] = None) -> None:
+        path = path or self.path
+        self.prune()
+        with self._lock:
+            data = {"version": CACHE_VERSION, "entries": dict(self.entries)}
+            write_json_atomic(path, data)
+        logger.info(f"Saved negative cache with {len(data['entries'])} entries")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "NegativeCache":
+        """Load the cache at ``path``, or start an empty one there."""
+        data = load_json(path, default={})
+        if data and data.get("version") != CACHE_VERSION:
+            logger.warning(f"Ignoring negative cache with unknown version at {path}")
+            data = {}
+        return cls(data.get("entries"), path=path)
+
+
+def cache_path(exchange: str) -> Path:
+    """Default on-disk location of an exchange's negative cache."""
+    return Path(config.NEGATIVE_CACHE_DIR) / f"{exchange.replace('-', '_')}.json"
+
+
+def load_cache(exchange: str) -> NegativeCache:
+    """Load the exchange's negative cache (empty if none was saved yet)."""
+    return NegativeCache.load(cache_path(exchange))
@@ -1,18 +1,134 @@
 import logging
+import tempfile
+import time
 from datetime import datetime, timedelta
-from typing import List, Optional
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
 from nse import NSE
-from .exchange import ExchangeClient, Announcement
+from .buffers import FeedBuffer
+from .classifier import KeywordClassifier
+from .exchange import ExchangeClient, Announcement, project_fields
 from . import config
-from .retries import retry_exchange, should_retry_exception
+from .retries import is_auth_failure, retry_exchange, should_retry_exception
+from .utils import read_bhavcopy
 
 logger = logging.getLogger(__name__)
 
+# Fields of a raw NSE announcement row the client reads; the rest are
+# dropped before the feed is buffered.
+ANNOUNCEMENT_FIELDS = (
+    "seq_id",
+    "symbol",
+    "sm_name",
+    "desc",
+    "an_dt",
+    "sort_date",
+    "attchmntFile",
+)
+INTERNED_FIELDS = ("symbol", "sm_name")
+
+
+def closing_price_on(rows: List[dict], target: datetime) -> Optional[float]:
+    """
+    Closing price of the latest historical row on or before ``target``.
+    Rows carry their date as ``mtimestamp`` (e.g. ``20-Feb-2026``).
+    """
+    best_date = None
+    price = None
+    for row in rows:
+        try:
+            d = datetime.strptime(row.get("mtimestamp", ""), "%d-%b-%Y").date()
+        except (TypeError, ValueError):
+            continue
+        if d <= target.date() and (best_date is None or d > best_date):
+            best_date = d
+            price = row.get("chClosingPrice")
+    return price
+
 
 class NSEClient(ExchangeClient):
-    def __init__(self, segment: str = "equities"):
+    def __init__(
+        self, segment: str = "equities", nse=None, session_dir=None, hedger=None
+    ):
         self.segment = segment
-        self.nse = NSE(download_folder=".", server=True)
+        self.hedger = hedger
+        self.session_dir = Path(session_dir or config.NSE_SESSION_DIR)
+        self.nse = nse if nse is not None else self._bootstrap()
+        self.classifier = KeywordClassifier(config.NSE_CATEGORY_KEYWORDS)
+        self._feed_buffer = FeedBuffer(config.FEED_BUFFER_SIZE, config.FEED_BUFFER_TTL)
+
+    @retry_exchange
+    def _bootstrap(self, force: bool = False):
+        """
+        Create the NSE library instance, reusing persisted session cookies.
+
+        The library keeps its handshake cookies in its download folder, so
+        pointing that at a persistent cache dir lets later runs skip the
+        handshake. Cookie files older than NSE_SESSION_TTL (or all of them
+        when ``force`` is set) are discarded first to force a fresh one.
+        """
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+        expiry = time.time() - config.NSE_SESSION_TTL
+
+        for cookie_file in self.session_dir.glob(config.NSE_COOKIE_GLOB):
+            if force or cookie_file.stat().st_mtime < expiry:
+                logger.info(f"Discarding NSE session cookies: {cookie_file}")
+                cookie_file.unlink(missing_ok=True)
+
+        return NSE(download_folder=self.session_dir, server=True)
+
+    def clear_buffers(self) -> None:
+        """Drop buffered announcement feeds."""
+        self._feed_buffer.clear()
+
+    def _fetch_classified_feed(
+        self, from_date: datetime, to_date: datetime, scrip_code: Optional[str]
+    ) -> List[Tuple[dict, FrozenSet[str]]]:
+        """
+        Download the raw NSE feed, project each row to ANNOUNCEMENT_FIELDS and
+        tag it with every category whose keywords match its description.
+        """
+        logger.info(
+            f"Fetching NSE announcements for {self.segment} from {from_date} to {to_date}"
+        )
+        raw_data = self._request(
+            "announcements",
+            index=self.segment,
+            from_date=from_date,
+            to_date=to_date,
+            symbol=scrip_code,
+        )
+
+        classify = self.classifier.classify
+        return [
+            (
+                project_fields(item, ANNOUNCEMENT_FIELDS, INTERNED_FIELDS),
+                classify(item.get("desc") or ""),
+            )
+            for item in raw_data
+        ]
+
+    def _request(self, method: str, *args, hedge: bool = True, **kwargs):
+        """
+        Call an NSE library method (hedged if the client has a hedger and
+        ``hedge`` is set), re-bootstrapping the session once if the
+        persisted cookies are rejected.
+        """
+
+        def send():
+            fn = getattr(self.nse, method)
+            if not hedge:
+                return fn(*args, **kwargs)
+            return self._call(method, fn, *args, **kwargs)
+
+        try:
+            return send()
+        except Exception as e:
+            if not is_auth_failure(e):
+                raise
+            logger.warning(f"NSE session rejected ({e}). Re-bootstrapping.")
+            self.nse = self._bootstrap(force=True)
+            return send()
 
     @retry_exchange
     def fetch_announcements(
@@ -22,47 +138,39 @@ class NSEClient(ExchangeClient):
         category: str,
         subcategory: Optional[str] = None,
         scrip_code: Optional[str] = None,
+        limit: Optional[int] = None,
+        errors: Optional[list] = None,
     ) -> List[Announcement]:
         """
         Fetch announcements from NSE and filter by keyword.
+        With ``limit``, stop mapping once that many are found. A failed
+        download raises, so nothing is ever added to ``errors``.
+
+        The raw feed for a (range, symbol) is downloaded once and each row is
+        classified into every keyword category in a single pass, so lookups
+        for other categories over the same feed reuse the buffered result.
         """
         # NSE fetch is for a specific date or date range.
         # The library supports range.
 
         all_announcements = []
 
-        logger.info(
-            f"Fetching NSE announcements for {self.segment} from {from_date} to {to_date}"
-        )
-        raw_data = self.nse.announcements(
-            index=self.segment, from_date=from_date, to_date=to_date, symbol=scrip_code
-        )
-
-        # Filter and Map
-        # detailed category mapping
-        keywords = []
-        if subcategory:
-            keywords = config.NSE_CATEGORY_KEYWORDS.get(subcategory, [])
-        elif category in config.NSE_CATEGORY_KEYWORDS:
-            # If only category is passed (though logic usually passes subcategory)
-            keywords = config.NSE_CATEGORY_KEYWORDS.get(category, [])
-
-        if not keywords and subcategory:
+        target_category = subcategory if subcategory else category
+        if target_category not in self.classifier.categories and subcategory:
             # Fallback/Log if no keywords defined
             logger.warning(f"No keywords defined for subcategory: {subcategory}")
 
-        lowered_keywords = [kw.lower() for kw in keywords]
-        for item in raw_data:
-            desc = item.get("desc", "")
-            desc_lower = desc.lower()
+        classified_feed = self._feed_buffer.get_or_load(
+            (from_date, to_date, scrip_code),
+            lambda: self._fetch_classified_feed(from_date, to_date, scrip_code),
+        )
 
-            is_match = False
-            for kw in lowered_keywords:
-                if kw in desc_lower:
-                    is_match = True
-                    break
+        for item, categories in classified_feed:
+            if limit is not None and len(all_announcements) >= limit:
+                break
+            if target_category in categories:
+                desc = item.get("desc") or ""
 
-            if is_match:
                 # Parse date
                 dt_str = item.get("an_dt")
                 dt = None
@@ -91,18 +199,29 @@ class NSEClient(ExchangeClient):
                         category=subcategory if subcategory else category,
                         description=desc,
                         attachment_url=item.get("attchmntFile"),
+                        announcement_id=item.get("seq_id"),
                     )
                 )
 
         return all_announcements
 
     @retry_exchange
-    def get_scrip_info(self, scrip_code: str, announcement_date: datetime) -> dict:
+    def get_scrip_info(
+        self,
+        scrip_code: str,
+        announcement_date: datetime,
+        price_dates: Sequence[datetime] = (),
+        level: str = "full",
+        errors: Optional[list] = None,
+    ) -> dict:
+        if errors is None:
+            errors = []
         symbol = scrip_code
         company_name = None
         current_price = None
         current_mkt_cap_cr = None
         price_at_announcement = None
+        prices = {}
 
         # Keep track of active series to fetch history
         active_series = "EQ"
@@ -110,7 +229,7 @@ class NSEClient(ExchangeClient):
         try:
             # 1. Quote Data
             try:
-                quote = self.nse.quote(symbol)
+                quote = self._request("quote", symbol)
                 if quote:
                     info = quote.get("info", {})
                     company_name = info.get("companyName") or company_name
@@ -136,34 +255,69 @@ class NSEClient(ExchangeClient):
                 if should_retry_exception(e):
                     raise e
                 logger.warning(f"Error fetching NSE quote for {symbol}: {e}")
+                errors.append(e)
 
-            # 2. Historical Price
-            try:
-                # Use a lookback window (e.g., 7 days) to find the nearest trading day
-                from_d = announcement_date - timedelta(days=7)
-                to_d = announcement_date
+            # 2. Historical Price (not needed at the "price" level)
+            if level != "price":
+                try:
+                    # Use a lookback window (e.g., 7 days) to find the nearest trading day
+                    # One request covers every requested date
+                    dates = [announcement_date, *price_dates]
+                    from_d = min(dates) - timedelta(days=7)
+                    to_d = max(dates)
 
-                hist_data = self.nse.fetch_equity_historical_data(
-                    symbol=symbol, from_date=from_d, to_date=to_d, series=active_series
-                )
+                    hist_data = self._request(
+                        "fetch_equity_historical_data",
+                        symbol=symbol,
+                        from_date=from_d,
+                        to_date=to_d,
+                        series=active_series,
+                    )
 
-                if hist_data and len(hist_data) > 0:
-                    # Data is returned in ascending order by date; use the latest available
-                    price_at_announcement = hist_data[-1].get("chClosingPrice")
-            except Exception as e:
-                if should_retry_exception(e):
-                    raise e
-                logger.warning(f"Error fetching NSE historical data for {symbol}: {e}")
+                    if hist_data and len(hist_data) > 0 and not price_dates:
+                        # Data is returned in ascending order by date; use the latest available
+                        price_at_announcement = hist_data[-1].get("chClosingPrice")
+                    elif hist_data:
+                        for target in dates:
+                            prices[target.date()] = closing_price_on(hist_data, target)
+                        price_at_announcement = prices[announcement_date.date()]
+                except Exception as e:
+                    if should_retry_exception(e):
+                        raise e
+                    logger.warning(
+                        f"Error fetching NSE historical data for {symbol}: {e}"
+                    )
 
         except Exception as e:
             if should_retry_exception(e):
                 raise e
             logger.error(f"Error getting scrip info for {symbol}: {e}")
+            errors.append(e)
 
-        return {
+        info = {
             "symbol": symbol,
             "company_name": company_name,
             "current_price": current_price,
             "price_at_announcement": price_at_announcement,
             "current_mkt_cap_cr": current_mkt_cap_cr,
         }
+        if price_dates:
+            info["prices_at_announcement"] = {
+                d.date(): prices.get(d.date())
+                for d in [announcement_date, *price_dates]
+            }
+        return info
+
+    @retry_exchange
+    def bulk_prices(self, day: datetime) -> Optional[Dict[str, float]]:
+        """Closing prices by symbol from the day's NSE equity bhavcopy."""
+        with tempfile.TemporaryDirectory() as folder:
+            try:
+                # Not hedged: a duplicate would write, unzip and delete the
+                # same file
+                path = self._request("equityBhavcopy", day, folder, hedge=False)
+            except RuntimeError as e:
+                # Not a trading day, or not published yet
+                logger.info(f"No NSE bhavcopy for {day:%Y-%m-%d}: {e}")
+                return None
+            return read_bhavcopy(path, "TckrSymb")
@@ -0,0 +1,164 @@
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Generic, Iterator, List, Optional, TypeVar
+from . import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ClientPool(Generic[T]):
+    """
+    Thread-safe pool of reusable exchange clients.
+
+    Each pooled client owns its own library instance (and therefore its own
+    HTTP session, cookies and keep-alive connections), so concurrent workers
+    never share a session. Clients are created lazily up to ``size`` and are
+    returned to the pool after use, so later checkouts reuse warm sessions
+    instead of paying the TLS handshake and cookie bootstrap again.
+    """
+
+    def __init__(self, factory: Callable[[], T], size: Optional[int] = None):
+        self.factory = factory
+        self.size = max(1, size if size is not None else config.CLIENT_POOL_SIZE)
+        self._idle: "queue.LifoQueue[T]" = queue.LifoQueue()
+        self._clients: List[T] = []
+        self._reserved = 0
+        self._lock = threading.Lock()
+
+    @property
+    def created(self) -> int:
+        """Number of clients created so far."""
+        return self._reserved
+
+    def warm(self, count: Optional[int] = None) -> int:
+        """
+        Eagerly create clients so the first checkouts do not pay setup cost.
+
+        Args:
+            count: Number of clients to have ready. Defaults to the pool size.
+
+        Returns:
+            The number of clients created by this call.
+        """
+        target = min(self.size, count if count is not None else self.size)
+        new_clients = 0
+        while self.created < target:
+            client = self._create()
+            if client is None:
+                break
+            self._idle.put(client)
+            new_clients += 1
+        return new_clients
+
+    def acquire(self, timeout: Optional[float] = None) -> T:
+        """
+        Check a client out of the pool, creating one if capacity allows.
+
+        Blocks until a client is returned when the pool is exhausted.
+
+        Raises:
+            TimeoutError: If no client becomes available within ``timeout``.
+        """
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        client = self._create()
+        if client is not None:
+            return client
+
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No pooled client available after {timeout}s (size={self.size})"
+            ) from None
+
+    def release(self, client: T) -> None:
+        """Return a client to the pool for reuse."""
+        self._idle.put(client)
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[T]:
+        """Context manager that acquires a client and always releases it."""
+        client = self.acquire(timeout=timeout)
+        try:
+            yield client
+        finally:
+            self.release(client)
+
+    def close(self) -> None:
+        """Close every session owned by the pool's clients."""
+        with self._lock:
+            clients, self._clients = self._clients, []
+            self._reserved = 0
+        self._idle = queue.LifoQueue()
+        for client in clients:
+            close = getattr(client, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    logger.warning(f"Error closing pooled client: {e}")
+
+    def _create(self) -> Optional[T]:
+        """Create a new client if the pool has spare capacity."""
+        with self._lock:
+            if self._reserved >= self.size:
+                return None
+            # Reserve the slot before the (slow) construction happens
+            self._reserved += 1
+
+        try:
+            client = self.factory()
+        except Exception:
+            with self._lock:
+                self._reserved -= 1
+            raise
+
+        with self._lock:
+            self._clients.append(client)
+        logger.info(f"Created pooled client {self._reserved}/{self.size}")
+        return client
+
+
+def tune_http_session(session, pool_maxsize: Optional[int] = None) -> None:
+    """
+    Grow the keep-alive connection pools of a ``requests`` session's HTTP
+    adapters to ``pool_maxsize`` (default ``HTTP_POOL_MAXSIZE``).
+
+    The default adapter keeps only 10 connections per host and discards
+    extras under load, which forces fresh TLS handshakes. Adapters are
+    resized in place, so retries or other settings the exchange library
+    mounted are kept; pools already large enough and adapters that are not
+    ``HTTPAdapter``s are left alone. Sessions that are not
+    ``requests``-style (no ``get_adapter``) are left untouched.
+    """
+    get_adapter = getattr(session, "get_adapter", None)
+    if not callable(get_adapter):
+        return
+
+    try:
+        from requests.adapters import HTTPAdapter
+    except ImportError:
+        return
+
+    maxsize = pool_maxsize if pool_maxsize is not None else config.HTTP_POOL_MAXSIZE
+    for prefix in ("https://", "http://"):
+        try:
+            adapter = get_adapter(prefix)
+        except Exception:
+            # No adapter for the scheme
+            session.mount(
+                prefix, HTTPAdapter(pool_connections=maxsize, pool_maxsize=maxsize)
+            )
+            continue
+        if isinstance(adapter, HTTPAdapter) and adapter._pool_maxsize < maxsize:
+            adapter.init_poolmanager(
+                adapter._pool_connections, maxsize, block=adapter._pool_block
+            )
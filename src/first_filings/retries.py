@@ -8,6 +8,9 @@ logger = logging.getLogger(__name__)
 # Status codes to retry
 RETRY_STATUS_CODES = {408, 429, 502, 503, 504}
 
+# Status codes that indicate a rejected session (stale cookies)
+AUTH_FAILURE_STATUS_CODES = {401, 403}
+
 def should_retry_exception(exception: Exception) -> bool:
     """
     Predicate to determine if an exception should trigger a retry.
@@ -37,6 +40,19 @@ def should_retry_exception(exception: Exception) -> bool:
 
     return False
 
+def is_auth_failure(exception: Exception) -> bool:
+    """
+    Predicate to determine if an exception means the server rejected the
+    session (e.g. expired cookies), i.e. a ConnectionError carrying 401 or 403.
+    """
+    if isinstance(exception, ConnectionError):
+        msg = str(exception)
+        for code in AUTH_FAILURE_STATUS_CODES:
+            if re.search(rf"\b{code}\b", msg):
+                return True
+
+    return False
+
 def get_retry_decorator():
     """
     Returns a configured tenacity retry decorator.
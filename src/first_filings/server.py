@@ -0,0 +1,219 @@
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from . import config, utils
+from .api import (
+    EXCHANGES,
+    PERIODS,
+    parse_categories,
+    parse_date,
+    parse_lookback_years,
+    run,
+)
+from .clients import create_client
+from .core import FirstFilingAnalyzer
+from .negative_cache import NegativeCache, load_cache
+from .pool import ClientPool
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisService:
+    """
+    Runs first-filing analyses against warm, pooled exchange clients.
+
+    One ClientPool is kept per exchange for the lifetime of the service, so
+    sessions, cookies, rate limiters and feed buffers stay warm across
+    requests, and up to ``pool_size`` analyses per exchange run concurrently.
+    Requests for an exchange share its negative cache of unresolved scrips.
+    """
+
+    def __init__(self, pool_size: Optional[int] = None):
+        self.pool_size = pool_size
+        self._pools: Dict[str, ClientPool] = {}
+        self._negative_caches: Dict[str, NegativeCache] = {}
+        self._lock = threading.Lock()
+
+    def pool(self, exchange: str) -> ClientPool:
+        """Return the client pool for an exchange, creating it on first use."""
+        with self._lock:
+            if exchange not in self._pools:
+                self._pools[exchange] = ClientPool(
+                    lambda: create_client(exchange), size=self.pool_size
+                )
+            return self._pools[exchange]
+
+    def negative_cache(self, exchange: str) -> NegativeCache:
+        """Return the exchange's negative cache, loading it on first use."""
+        with self._lock:
+            if exchange not in self._negative_caches:
+                self._negative_caches[exchange] = load_cache(exchange)
+            return self._negative_caches[exchange]
+
+    def analyze(self, request: dict) -> dict:
+        """
+        Run an analysis described by a JSON request.
+
+        Request keys (all optional): ``exchange`` (bse, nse-main, nse-sme),
+        ``period`` (day, wtd, mtd, qtd), ``date`` (DD-MM-YYYY or YYYY-MM-DD),
+        ``categories`` (category labels or CLI flag names),
+        ``lookback_years`` (an integer or a list of integers),
+        ``enrich_level`` (none, price or full) and ``deadline`` (seconds).
+
+        Returns:
+            The same document the CLI writes to its output file.
+
+        Raises:
+            ValueError: If the request is invalid.
+        """
+        exchange = str(request.get("exchange", "bse")).lower()
+        if exchange not in EXCHANGES:
+            raise ValueError(f"Invalid exchange: {exchange}")
+
+        period = str(request.get("period", "day")).lower()
+        if period not in PERIODS:
+            raise ValueError(f"Invalid period: {period}")
+
+        date = parse_date(request.get("date"))
+        categories = parse_categories(request.get("categories"))
+
+        lookback_years = parse_lookback_years(request.get("lookback_years", 2))
+
+        enrich_level = str(request.get("enrich_level", config.ENRICH_LEVEL)).lower()
+        if enrich_level not in config.ENRICH_LEVELS:
+            raise ValueError(f"Invalid enrich level: {enrich_level}")
+
+        deadline = request.get("deadline")
+        if deadline is not None:
+            try:
+                deadline = float(deadline)
+            except (TypeError, ValueError):
+                raise ValueError("deadline must be a number of seconds") from None
+
+        logger.info(
+            f"Serving analysis: exchange={exchange}, date={date:%Y-%m-%d}, period={period}, categories={categories}"
+        )
+
+        filings_data = {}
+        negative_cache = self.negative_cache(exchange)
+        with self.pool(exchange).checkout() as client:
+            analyzer = FirstFilingAnalyzer(
+                client, enrich_level=enrich_level, negative_cache=negative_cache
+            )
+            for filing in run(
+                exchange,
+                date=date,
+                period=period,
+                categories=categories,
+                lookback_years=lookback_years,
+                analyzer=analyzer,
+                deadline=deadline,
+            ):
+                filings_data.setdefault(filing.category, []).append(filing.to_dict())
+        negative_cache.save()
+
+        output = utils.build_output(
+            filings_data,
+            analyzer.failed_checks_count,
+            lookback_years,
+            enrich_level,
+            analyzer.deadline_report(),
+        )
+        output["meta"]["exchange"] = exchange
+        output["meta"]["total_filings_found"] = sum(
+            len(filings) for filings in filings_data.values()
+        )
+        return output
+
+    def health(self) -> dict:
+        """Return service status with the number of warm clients per exchange."""
+        with self._lock:
+            pools = {name: pool.created for name, pool in self._pools.items()}
+        return {"status": "ok", "warm_clients": pools}
+
+    def close(self) -> None:
+        """Close all pooled client sessions."""
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.close()
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """JSON API: ``GET /health`` and ``POST /analyze``."""
+
+    server_version = "FirstFilings"
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/health":
+            self._send_json(200, self.server.service.health())
+        else:
+            self._send_json(404, {"status": "error", "error": "Not found"})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/analyze":
+            self._send_json(404, {"status": "error", "error": "Not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b"{}"
+            request = json.loads(body or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("Request body must be a JSON object")
+        except ValueError as e:
+            self._send_json(400, {"status": "error", "error": f"Invalid JSON: {e}"})
+            return
+
+        try:
+            output = self.server.service.analyze(request)
+        except ValueError as e:
+            self._send_json(400, {"status": "error", "error": str(e)})
+            return
+        except Exception as e:
+            logger.exception("Error serving analysis request")
+            self._send_json(500, {"status": "error", "error": str(e)})
+            return
+
+        self._send_json(200, {"status": "success", **output})
+
+    def log_message(self, format, *args):
+        # Keep the terminal silent; access logs go to the log file
+        logger.info(f"{self.address_string()} - {format % args}")
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class AnalysisServer(ThreadingHTTPServer):
+    """Threaded HTTP server bound to an AnalysisService."""
+
+    daemon_threads = True
+
+    def __init__(self, address, service: AnalysisService):
+        super().__init__(address, AnalysisRequestHandler)
+        self.service = service
+
+
+def serve_forever(host: str, port: int, pool_size: Optional[int] = None) -> None:
+    """
+    Serve the JSON API until interrupted, then close all sessions.
+    """
+    service = AnalysisService(pool_size=pool_size)
+    server = AnalysisServer((host, port), service)
+    logger.info(f"Serving first-filings API on http://{host}:{port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down first-filings API")
+    finally:
+        server.server_close()
+        service.close()
@@ -0,0 +1,122 @@
+import logging
+import re
+from dataclasses import asdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+from . import config
+from .exchange import Announcement, announcement_key
+from .utils import load_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+SHARD_VERSION = 1
+
+
+def shard_ranges(
+    from_date: datetime, to_date: datetime, days: int
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Split a date range into consecutive shards of ``days`` calendar days
+    (the last one may be shorter). Each shard is an inclusive
+    (from_date, to_date) pair, like the range itself.
+    """
+    if days < 1:
+        raise ValueError("Shard size must be at least one day")
+    shards = []
+    start = from_date
+    while start.date() <= to_date.date():
+        end = min(start + timedelta(days=days - 1), to_date)
+        shards.append((start, end))
+        start = start + timedelta(days=days)
+    return shards
+
+
+def is_closed(shard_end: datetime, today: Optional[date] = None) -> bool:
+    """
+    Whether no more announcements can arrive for a shard: every day in it
+    is over. Only closed shards are cached.
+    """
+    return shard_end.date() < (today or date.today())
+
+
+def merge_shards(shards: Iterable[List[Announcement]]) -> List[Announcement]:
+    """
+    Merge per-shard announcement lists, dropping duplicates (e.g. a filing
+    returned by two overlapping shards), newest first.
+    """
+    seen = set()
+    merged = []
+    for announcements in shards:
+        for announcement in announcements:
+            key = announcement_key(announcement)
+            if key not in seen:
+                seen.add(key)
+                merged.append(announcement)
+    merged.sort(key=lambda a: a.date, reverse=True)
+    return merged
+
+
+class ShardCache:
+    """
+    On-disk cache of closed shards of an exchange's period feed, one JSON
+    file per (category, shard), so a later run over an overlapping period
+    only fetches the days it has not seen.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def path(self, category: str, start: datetime, end: datetime) -> Path:
+        slug = re.sub(r"[^a-z0-9]+", "_", category.lower()).strip("_")
+        return self.root / slug / f"{start:%Y%m%d}_{end:%Y%m%d}.json"
+
+    def get(
+        self, category: str, start: datetime, end: datetime
+    ) -> Optional[List[Announcement]]:
+        """Cached announcements of a shard, or None if it was not cached."""
+        data = load_json(self.path(category, start, end))
+        if not data or data.get("version") != SHARD_VERSION:
+            return None
+        return [
+            Announcement(**{**row, "date": datetime.fromisoformat(row["date"])})
+            for row in data["announcements"]
+        ]
+
+    def put(
+        self,
+        category: str,
+        start: datetime,
+        end: datetime,
+        announcements: List[Announcement],
+    ) -> None:
+        rows = [{**asdict(a), "date": a.date.isoformat()} for a in announcements]
+        write_json_atomic(
+            self.path(category, start, end),
+            {"version": SHARD_VERSION, "announcements": rows},
+        )
+
+    def prune(
+        self,
+        today: Optional[date] = None,
+        retention_days: int = config.SHARD_CACHE_RETENTION_DAYS,
+    ) -> int:
+        """Delete shards that ended more than ``retention_days`` ago. Returns the count."""
+        cutoff = (today or date.today()) - timedelta(days=retention_days)
+        removed = 0
+        for path in self.root.glob("*/*_*.json"):
+            try:
+                end = datetime.strptime(path.stem.split("_")[1], "%Y%m%d").date()
+            except (IndexError, ValueError):
+                continue
+            if end < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+        if removed:
+            logger.info(f"Pruned {removed} cached shards under {self.root}")
+        return removed
+
+
+def cache_root(exchange: str) -> Path:
+    """Default on-disk location of an exchange's shard cache."""
+    return Path(config.SHARD_CACHE_DIR) / exchange.replace("-", "_")
@@ -1,3 +1,4 @@
+import csv
 import json
 import logging
 import os
@@ -24,9 +25,9 @@ def setup_logging(log_file=config.LOG_FILE):
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
 
-def save_output(filings_data, failed_checks_count, lookback_years, filename="first_filings_output.json"):
+def build_output(filings_data, failed_checks_count, lookback_years, enrich_level=config.ENRICH_LEVEL, deadline_report=None, hedge_report=None):
     """
-    Save the rich, structured output JSON to disk.
+    Build the rich, structured output document.
 
     Structure:
     Category -> Date -> List of Filings
@@ -37,6 +38,10 @@ def save_output(filings_data, failed_checks_count, lookback_years, filename="fir
 
     nested_data = {}
 
+    lookbacks = None
+    if isinstance(lookback_years, (list, tuple)) and len(lookback_years) > 1:
+        lookbacks = sorted(set(lookback_years))
+
     for category, filings_list in filings_data.items():
         if category not in nested_data:
             nested_data[category] = {}
@@ -62,18 +67,43 @@ def save_output(filings_data, failed_checks_count, lookback_years, filename="fir
                 filing.get('financial_snapshot')
             ]
 
+            # Multi-lookback runs append days since the previous filing and a verdict per lookback
+            if lookbacks:
+                verdicts = filing.get('first_within_years') or {}
+                row.append(filing.get('days_since_previous'))
+                row.extend(verdicts.get(years) for years in lookbacks)
+
             nested_data[category][date_str].append(row)
 
-    output = {
-        "meta": {
-            "generated_at": datetime.now().isoformat(),
-            "columns": ["scrip_code", "company_name", "price_announcement", "current_price", "current_mkt_cap_cr", "attachment_url", "financial_snapshot"],
-            "failed_checks_count": failed_checks_count,
-            "lookback_years": lookback_years
-        },
+    columns = ["scrip_code", "company_name", "price_announcement", "current_price", "current_mkt_cap_cr", "attachment_url", "financial_snapshot"]
+    if lookbacks:
+        columns += ["days_since_previous"] + [f"first_within_{years}y" for years in lookbacks]
+
+    meta = {
+        "generated_at": datetime.now().isoformat(),
+        "columns": columns,
+        "failed_checks_count": failed_checks_count,
+        "lookback_years": lookback_years,
+        "enrich_level": enrich_level
+    }
+    # Work skipped because of --deadline, kept apart from failed checks
+    if deadline_report is not None:
+        meta["deadline"] = deadline_report
+    # Request hedging counters of --hedge runs
+    if hedge_report is not None:
+        meta["hedging"] = hedge_report
+
+    return {
+        "meta": meta,
         "data": nested_data
     }
 
+def save_output(filings_data, failed_checks_count, lookback_years, filename="first_filings_output.json", enrich_level=config.ENRICH_LEVEL, deadline_report=None, hedge_report=None):
+    """
+    Save the rich, structured output JSON to disk (see build_output).
+    """
+    output = build_output(filings_data, failed_checks_count, lookback_years, enrich_level, deadline_report, hedge_report)
+
     try:
         with open(filename, 'w') as f:
             json.dump(output, f, indent=2)
@@ -83,6 +113,52 @@ def save_output(filings_data, failed_checks_count, lookback_years, filename="fir
         logging.error(f"Failed to save output file: {e}")
         return None
 
+def load_json(path, default=None):
+    """
+    Read a JSON file, returning default if it is missing or unreadable.
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except (OSError, ValueError) as e:
+        logging.warning(f"Could not read {path}: {e}")
+        return default
+
+def write_json_atomic(path, data):
+    """
+    Write JSON to a temporary file and rename it over path, so readers
+    never see a partially written file.
+    """
+    path = str(path)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def read_bhavcopy(path, key_field, preferred_series=("EQ",)):
+    """
+    Closing price per instrument from a bhavcopy in the common BSE/NSE CSV
+    format, keyed by ``key_field`` (BSE: ``FinInstrmId``, the scrip code;
+    NSE: ``TckrSymb``). A symbol listed in several series keeps the price of
+    a preferred one.
+    """
+    prices = {}
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            key = (row.get(key_field) or "").strip()
+            try:
+                price = float(row["ClsPric"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if key and (key not in prices or row.get("SctySrs", "").strip() in preferred_series):
+                prices[key] = price
+    return prices
+
 def print_cli_json(output_file, total_filings, failed_checks_count):
     """
     Print the minimal CLI JSON summary.
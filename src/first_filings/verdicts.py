@@ -0,0 +1,154 @@
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+from . import config
+from .exchange import Announcement, announcement_key
+from .utils import load_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# 2: announcement identity includes the category (exchange.announcement_key)
+STORE_VERSION = 2
+
+
+def verdict_key(
+    category_label: str, filing: Announcement, lookbacks: Sequence[int]
+) -> str:
+    """Key of a first-filing verdict: category, announcement identity, lookbacks."""
+    identity = "|".join(str(part) for part in announcement_key(filing))
+    return f"{category_label}|{identity}|{','.join(str(y) for y in lookbacks)}"
+
+
+def restore_history(fields: Optional[dict]) -> Optional[dict]:
+    """
+    Undo JSON's stringification of the ``first_within_years`` lookback keys
+    in stored history fields or filing dicts.
+    """
+    if fields and "first_within_years" in fields:
+        fields = dict(fields)
+        fields["first_within_years"] = {
+            int(years): verdict
+            for years, verdict in fields["first_within_years"].items()
+        }
+    return fields
+
+
+class VerdictStore:
+    """
+    Persistent first-filing verdicts of one exchange, so runs over
+    overlapping periods only check announcements they have not seen.
+
+    A verdict cannot change once made: it depends only on filings before
+    the announcement. First filings also keep their history fields and,
+    once enriched, the output filing dict and the enrichment level it was
+    made at. Entries are dropped ``VERDICT_RETENTION_DAYS`` after the
+    filing date. Thread-safe, so concurrent analyses can share one store.
+    """
+
+    def __init__(
+        self,
+        entries: Optional[Dict[str, dict]] = None,
+        path: Union[str, Path, None] = None,
+    ):
+        # verdict key -> {"date", "first", "history", "filing", "enrich_level"}
+        self.entries: Dict[str, dict] = dict(entries or {})
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: str) -> Optional[dict]:
+        """The stored verdict for ``key``, or None if there is none."""
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry is None:
+            return None
+        return dict(
+            entry,
+            history=restore_history(entry.get("history")),
+            filing=restore_history(entry.get("filing")),
+        )
+
+    def put(
+        self,
+        key: str,
+        filing_date: datetime,
+        first: bool,
+        history: Optional[dict] = None,
+        filing: Optional[dict] = None,
+        enrich_level: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            self.entries[key] = {
+                "date": filing_date.date().isoformat(),
+                "first": first,
+                "history": history,
+                "filing": filing,
+                "enrich_level": enrich_level,
+            }
+
+    def prune(
+        self,
+        today: Optional[date] = None,
+        retention_days: int = config.VERDICT_RETENTION_DAYS,
+    ) -> int:
+        """Drop verdicts for filings older than the retention. Returns the count."""
+        cutoff = ((today or date.today()) - timedelta(days=retention_days)).isoformat()
+        with self._lock:
+            expired = [
+                key for key, entry in self.entries.items() if entry["date"] < cutoff
+            ]
+            for key in expired:
+                del self.entries[key]
+        return len(expired)
+
+    def save(self, path: Union[str, Path, None] = None) -> None:
+        path = path or self.path
+        self.prune()
+        with self._lock:
+            data = {"version": STORE_VERSION, "entries": dict(self.entries)}
+            write_json_atomic(path, data)
+        logger.info(f"Saved verdict store with {len(data['entries'])} verdicts")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "VerdictStore":
+        """Load the store at ``path``, or start an empty one there."""
+        data = load_json(path, default={})
+        if data and data.get("version") != STORE_VERSION:
+            logger.warning(f"Ignoring verdict store with unknown version at {path}")
+            data = {}
+        return cls(data.get("entries"), path=path)
+
+
+def store_path(exchange: str) -> Path:
+    """Default on-disk location of an exchange's verdict store."""
+    return Path(config.VERDICT_STORE_DIR) / f"{exchange.replace('-', '_')}.json"
+
+
+def load_store(exchange: str) -> VerdictStore:
+    """Load the exchange's verdict store (empty if none was saved yet)."""
+    return VerdictStore.load(store_path(exchange))
+
+
+def refresh_price(filing: dict, prices: Dict[str, float]) -> dict:
+    """
+    Copy of a stored filing dict with its current price taken from bulk
+    ``prices`` and the market cap scaled by the price change (the share
+    count is unchanged). Filings whose scrip has no price are returned as is.
+    """
+    price = prices.get(str(filing["scrip_code"]))
+    if price is None:
+        return filing
+    refreshed = dict(filing, current_price=price)
+    try:
+        cap = filing["current_mkt_cap_cr"]
+        scaled = float(cap) * price / float(filing["current_price"])
+    except (KeyError, TypeError, ValueError, ZeroDivisionError):
+        return refreshed
+    refreshed["current_mkt_cap_cr"] = (
+        round(scaled) if isinstance(cap, int) else round(scaled, 2)
+    )
+    return refreshed
@@ -0,0 +1,101 @@
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+from .core import FirstFilingAnalyzer
+from .exchange import announcement_key
+
+logger = logging.getLogger(__name__)
+
+
+class AnnouncementWatcher:
+    """
+    Polls today's feed and runs first-filing checks only on new arrivals.
+
+    Already-seen announcements are tracked by ``announcement_key``; the set
+    is reset when the day rolls over. An announcement counts as seen once
+    it has a verdict, so failed checks are retried on the next poll.
+    """
+
+    def __init__(
+        self,
+        analyzer: FirstFilingAnalyzer,
+        categories: Optional[List[str]],
+        lookback_years: int,
+    ):
+        self.analyzer = analyzer
+        self.categories = categories
+        self.lookback_years = lookback_years
+        self.seen: Set[Tuple[Hashable, ...]] = set()
+        self.day = None
+
+    def poll(self, now: Optional[datetime] = None) -> Tuple[int, Dict[str, List[dict]]]:
+        """
+        Run one poll cycle.
+
+        Returns:
+            (number of new announcements, {category_label: [filing_dict]} for
+            the new first filings found in this cycle)
+        """
+        now = now or datetime.now()
+        if self.day != now.date():
+            self.seen.clear()
+            self.day = now.date()
+
+        # Buffered feeds would hide announcements published since the last poll
+        self.analyzer.exchange_client.clear_buffers()
+        announcements_by_cat = self.analyzer.fetch_announcements(
+            now, now, categories=self.categories
+        )
+        self.analyzer.record_feed(announcements_by_cat, now, now)
+
+        new_by_cat = {}
+        new_keys = set()
+        for category_label, announcements in announcements_by_cat.items():
+            new_announcements = []
+            for announcement in announcements:
+                key = announcement_key(announcement)
+                if key in self.seen or key in new_keys:
+                    continue
+                new_keys.add(key)
+                new_announcements.append(announcement)
+            if new_announcements:
+                new_by_cat[category_label] = new_announcements
+
+        new_count = len(new_keys)
+        logger.info(f"Watch poll found {new_count} new announcements")
+        if not new_count:
+            return 0, {}
+
+        results = self.analyzer.evaluate(new_by_cat, self.lookback_years)
+        # Only announcements with a verdict are seen; the rest are retried
+        new_keys -= {announcement_key(a) for a in self.analyzer.unchecked}
+        self.seen |= new_keys
+        return new_count, results
+
+    def run(
+        self,
+        interval: float,
+        on_cycle: Callable[[int, int, Dict[str, List[dict]]], None],
+        max_cycles: Optional[int] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Poll every ``interval`` seconds until interrupted or ``max_cycles``.
+
+        ``on_cycle(cycle, new_announcements, new_filings)`` is called after
+        every poll. Errors in a cycle are logged and the watch continues.
+        """
+        cycle = 0
+        while max_cycles is None or cycle < max_cycles:
+            cycle += 1
+            try:
+                new_count, new_filings = self.poll()
+            except Exception as e:
+                logger.error(f"Watch poll {cycle} failed: {e}")
+                new_count, new_filings = 0, {}
+
+            on_cycle(cycle, new_count, new_filings)
+
+            if max_cycles is None or cycle < max_cycles:
+                sleep(interval)
@@ -0,0 +1,138 @@
+"""Shared test helpers: synthetic announcements, a fake exchange, a temporary cache."""
+
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+from first_filings import config
+from first_filings.exchange import Announcement
+
+ANNOUNCEMENT_TIME = datetime(2026, 10, 19, 10, 0)
+
+
+def make_announcement(
+    scrip_code,
+    when=ANNOUNCEMENT_TIME,
+    category="Press Release",
+    announcement_id=None,
+):
+    """An announcement of ``scrip_code``; a ``date`` is taken as midnight."""
+    if not isinstance(when, datetime):
+        when = datetime.combine(when, datetime.min.time())
+    return Announcement(
+        scrip_code=scrip_code,
+        company_name=f"Company {scrip_code}",
+        date=when,
+        category=category,
+        description=category,
+        attachment_url=f"https://example.com/{scrip_code}.pdf",
+        announcement_id=announcement_id,
+    )
+
+
+class FakeExchange:
+    """
+    An exchange served to any number of MagicMock clients (``client()``).
+
+    Period fetches return ``feed`` if given, else one filing per category
+    and day. History fetches (with a scrip code) return one filing for
+    ``first_scrips``, two for other scrips, and fail for ``failing_scrips``.
+    A ``fail_category`` fetch raises; a ``partial_category`` fetch reports
+    a skipped error through ``errors``, like a failed BSE subcategory.
+    """
+
+    def __init__(
+        self,
+        feed=None,
+        first_scrips=(),
+        failing_scrips=(),
+        latency=0.0,
+        fail_category=None,
+        partial_category=None,
+    ):
+        self.feed = feed
+        self.first_scrips = set(first_scrips)
+        self.failing_scrips = set(failing_scrips)
+        self.latency = latency
+        self.fail_category = fail_category
+        self.partial_category = partial_category
+        self.calls = []  # (category, from date, to date) of period fetches
+        self.history_calls = []  # scrip codes of history fetches
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+
+    def client(self):
+        client = MagicMock()
+        client.fetch_announcements.side_effect = self.fetch
+        client.get_scrip_info.side_effect = self.scrip_info
+        client.bulk_prices.return_value = None
+        return client
+
+    def fetch(
+        self, from_date, to_date, category, scrip_code=None, errors=None, **kwargs
+    ):
+        if scrip_code is not None:
+            return self.history(to_date, category, scrip_code)
+
+        with self.lock:
+            self.calls.append((category, from_date.date(), to_date.date()))
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        time.sleep(self.latency)
+        with self.lock:
+            self.in_flight -= 1
+
+        if category == self.fail_category:
+            raise ConnectionError("503: Service Unavailable")
+        if category == self.partial_category:
+            errors.append(ConnectionError("503: Service Unavailable"))
+            return []
+        if self.feed is not None:
+            return list(self.feed)
+        days = (to_date.date() - from_date.date()).days
+        return [
+            make_announcement(
+                f"{category[:2]}{i}",
+                from_date + timedelta(days=i, hours=10),
+                category,
+                f"{category}-{(from_date + timedelta(days=i)).date()}",
+            )
+            for i in range(days + 1)
+        ]
+
+    def history(self, to_date, category, scrip_code):
+        with self.lock:
+            self.history_calls.append(scrip_code)
+        if scrip_code in self.failing_scrips:
+            raise ConnectionError("404: Not Found")
+        count = 1 if scrip_code in self.first_scrips else 2
+        return [make_announcement(scrip_code, to_date, category)] * count
+
+    def scrip_info(self, scrip_code, announcement_date, **kwargs):
+        return {
+            "symbol": f"SYM{scrip_code}",
+            "company_name": f"Company {scrip_code} Ltd",
+            "current_price": 100.0,
+            "price_at_announcement": 90.0,
+            "current_mkt_cap_cr": 1000,
+        }
+
+
+def use_temp_cache(test):
+    """
+    Point every ``config`` location under ``CACHE_DIR`` at a temporary
+    directory for the duration of ``test``, so state loaded and saved by the
+    code under test never touches the working directory's ``.cache``.
+    """
+    tmp = tempfile.TemporaryDirectory()
+    test.addCleanup(tmp.cleanup)
+    root = config.CACHE_DIR
+    for name in dir(config):
+        value = getattr(config, name)
+        if isinstance(value, str) and (value == root or value.startswith(f"{root}/")):
+            patcher = patch.object(config, name, tmp.name + value[len(root) :])
+            patcher.start()
+            test.addCleanup(patcher.stop)
+    return tmp.name
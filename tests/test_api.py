@@ -0,0 +1,110 @@
+import unittest
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+import first_filings
+from conftest import make_announcement
+from first_filings.api import FirstFiling, parse_categories, parse_date
+from first_filings.core import FirstFilingAnalyzer
+
+
+class TestRun(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.fetch_announcements.side_effect = self.fetch
+        self.client.get_scrip_info.side_effect = lambda scrip_code, when, **kwargs: {
+            "symbol": f"SYM{scrip_code}",
+            "current_price": 10.0,
+            "price_at_announcement": 9.0,
+            "current_mkt_cap_cr": 100.0,
+        }
+
+    def fetch(self, from_date, to_date, category, scrip_code=None, **kwargs):
+        if scrip_code is None:
+            if category == "Press Release":
+                return [
+                    make_announcement("1", category=category),
+                    make_announcement("2", category=category),
+                ]
+            return []
+        # Scrip 2 has an earlier filing in the lookback window
+        history = [make_announcement(scrip_code, category=category)]
+        if scrip_code == "2":
+            history.append(make_announcement(scrip_code, category=category))
+        return history
+
+    def test_yields_typed_results(self):
+        analyzer = FirstFilingAnalyzer(self.client)
+        filings = list(
+            first_filings.run(
+                "bse",
+                date="19-10-2026",
+                categories=["press_releases"],
+                analyzer=analyzer,
+            )
+        )
+
+        self.assertEqual(len(filings), 1)
+        filing = filings[0]
+        self.assertIsInstance(filing, FirstFiling)
+        self.assertEqual(filing.category, "Press Release")
+        self.assertEqual(filing.scrip_code, "1")
+        self.assertEqual(filing.date, date(2026, 10, 19))
+        self.assertEqual(filing.to_dict()["date"], "2026-10-19")
+        self.assertNotIn("category", filing.to_dict())
+
+    def test_results_are_streamed(self):
+        analyzer = FirstFilingAnalyzer(self.client)
+        results = first_filings.run(
+            "bse", date="2026-10-19", categories="Press Release", analyzer=analyzer
+        )
+        self.client.fetch_announcements.assert_not_called()
+
+        next(results)
+        results.close()
+
+    def test_enrich_level_applies_to_the_run_only(self):
+        analyzer = FirstFilingAnalyzer(self.client)
+        filings = list(
+            first_filings.run(
+                "bse",
+                date="19-10-2026",
+                categories=["press_releases"],
+                analyzer=analyzer,
+                enrich_level="none",
+            )
+        )
+
+        self.client.get_scrip_info.assert_not_called()
+        self.assertEqual([f.scrip_code for f in filings], ["1"])
+        self.assertEqual(analyzer.enrich_level, "full")
+
+    def test_owned_client_is_closed(self):
+        with patch("first_filings.api.create_client", return_value=self.client):
+            list(first_filings.run("nse-main", categories=["Press Release"]))
+        self.client.close.assert_called_once()
+
+    def test_invalid_arguments_raise_immediately(self):
+        with self.assertRaises(ValueError):
+            first_filings.run("lse")
+        with self.assertRaises(ValueError):
+            first_filings.run("bse", period="ytd")
+        with self.assertRaises(ValueError):
+            first_filings.run("bse", categories=["dividends"])
+
+
+class TestParsing(unittest.TestCase):
+    def test_parse_date(self):
+        self.assertEqual(parse_date("19-10-2026"), datetime(2026, 10, 19))
+        self.assertEqual(parse_date(date(2026, 10, 19)), datetime(2026, 10, 19))
+        with self.assertRaises(ValueError):
+            parse_date("10/19/2026")
+
+    def test_parse_categories(self):
+        self.assertEqual(
+            parse_categories(["analyst_calls", "PPT"]),
+            ["Analyst Call Intimation", "PPT"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
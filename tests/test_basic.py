@@ -33,7 +33,8 @@ class TestFirstFilingAnalyzer(unittest.TestCase):
         mock_client.fetch_announcements.assert_called_with(
             from_date=from_date,
             to_date=to_date,
-            category="PPT"
+            category="PPT",
+            errors=[]
         )
 
     def test_is_first_filing_true(self):
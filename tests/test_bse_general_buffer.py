@@ -0,0 +1,74 @@
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from first_filings import config
+from first_filings.bse_client import BSEClient
+
+GENERAL_ROWS = [
+    {"SCRIP_CD": 1, "NEWSSUB": "Investor Presentation", "DT_TM": "2023-10-27T10:00:00"},
+    {
+        "SCRIP_CD": 2,
+        "HEADLINE": "Earnings Call Transcript",
+        "DT_TM": "2023-10-27T11:00:00",
+    },
+    {"SCRIP_CD": 3, "NEWSSUB": "Change in Directors", "DT_TM": "2023-10-27T12:00:00"},
+]
+
+
+class TestBSEGeneralBuffer(unittest.TestCase):
+    def setUp(self):
+        self.subcategories = patch.dict(
+            config.FILING_SUBCATEGORY,
+            {"Transcript": [config.SUBCATEGORY_GENERAL]},
+        )
+        self.keywords = patch.dict(
+            config.FILING_SUBCATEGORY_GENERAL_KEYWORD, {"Transcript": "Transcript"}
+        )
+        self.subcategories.start()
+        self.keywords.start()
+        self.addCleanup(self.subcategories.stop)
+        self.addCleanup(self.keywords.stop)
+
+        self.client = BSEClient(bse=MagicMock())
+        self.client.iter_paginated_announcements = MagicMock(
+            side_effect=lambda **kwargs: iter(
+                GENERAL_ROWS
+                if kwargs["subcategory"] == config.SUBCATEGORY_GENERAL
+                else []
+            )
+        )
+
+    def test_general_fetched_once_for_all_keyword_categories(self):
+        day = datetime(2023, 10, 27)
+
+        ppt = self.client.fetch_announcements(day, day, category="PPT")
+        transcripts = self.client.fetch_announcements(day, day, category="Transcript")
+
+        general_calls = [
+            c
+            for c in self.client.iter_paginated_announcements.call_args_list
+            if c.kwargs["subcategory"] == config.SUBCATEGORY_GENERAL
+        ]
+        self.assertEqual(len(general_calls), 1)
+        self.assertEqual([a.scrip_code for a in ppt], ["1"])
+        self.assertEqual([a.scrip_code for a in transcripts], ["2"])
+
+    def test_buffer_is_keyed_by_range_and_scrip(self):
+        day = datetime(2023, 10, 27)
+
+        self.client.fetch_announcements(day, day, category="PPT")
+        self.client.fetch_announcements(day, day, category="PPT", scrip_code="1")
+        self.client.clear_buffers()
+        self.client.fetch_announcements(day, day, category="PPT")
+
+        self.assertEqual(
+            sum(
+                c.kwargs["subcategory"] == config.SUBCATEGORY_GENERAL
+                for c in self.client.iter_paginated_announcements.call_args_list
+            ),
+            3,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -19,7 +19,6 @@ mock_tenacity.retry = mock_retry
 sys.modules['tenacity'] = mock_tenacity
 
 from first_filings.bse_client import BSEClient
-from first_filings import config
 
 class TestBSEPagination(unittest.TestCase):
     def setUp(self):
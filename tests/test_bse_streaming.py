@@ -0,0 +1,87 @@
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from first_filings import config
+from first_filings.bse_client import BSEClient
+
+PAGE_SIZE = 2
+TOTAL_ROWS = 10
+
+
+def page(page_no, subcategory=None, **kwargs):
+    start = (page_no - 1) * PAGE_SIZE
+    rows = [
+        {
+            "SCRIP_CD": 500000 + i,
+            "NEWSSUB": "Investor Presentation",
+            "DT_TM": "2026-10-19T10:00:00",
+            "XML_NAME": f"{i}.xml",
+        }
+        for i in range(start, min(start + PAGE_SIZE, TOTAL_ROWS))
+    ]
+    return {"Table": rows, "Table1": [{"ROWCNT": TOTAL_ROWS}]}
+
+
+class TestBSEStreaming(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("first_filings.bse_client.time.sleep")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.bse = MagicMock()
+        self.bse.announcements.side_effect = page
+        self.client = BSEClient(bse=self.bse)
+        self.day = datetime(2026, 10, 19)
+
+    def test_pages_are_requested_lazily(self):
+        rows = self.client.iter_paginated_announcements(
+            self.day, self.day, config.FILING_CATEGORY, "Investor Presentation"
+        )
+        self.bse.announcements.assert_not_called()
+
+        next(rows)
+        self.assertEqual(self.bse.announcements.call_count, 1)
+
+    def test_rows_are_projected(self):
+        rows = self.client.fetch_paginated_announcements(
+            self.day, self.day, config.FILING_CATEGORY, "Investor Presentation"
+        )
+        self.assertEqual(len(rows), TOTAL_ROWS)
+        self.assertNotIn("XML_NAME", rows[0])
+        self.assertEqual(self.bse.announcements.call_count, TOTAL_ROWS // PAGE_SIZE)
+
+    def test_limit_skips_remaining_pages(self):
+        found = self.client.fetch_announcements(
+            self.day, self.day, "Press Release", limit=3
+        )
+        self.assertEqual(len(found), 3)
+        self.assertEqual(self.bse.announcements.call_count, 2)
+
+    def test_truncated_general_feed_is_not_buffered(self):
+        # Read only the General subcategory for PPT
+        with patch.dict(config.FILING_SUBCATEGORY, {"PPT": ["General"]}):
+            self.client.fetch_announcements(self.day, self.day, "PPT", limit=1)
+            self.client.fetch_announcements(self.day, self.day, "PPT")
+            self.client.fetch_announcements(self.day, self.day, "PPT")
+
+        # 1 page for the limited read, 5 for the full read, 0 for the buffered one
+        self.assertEqual(self.bse.announcements.call_count, 6)
+
+    def test_failed_subcategory_is_reported(self):
+        def failing_page(page_no, **kwargs):
+            if page_no == 2:
+                raise ConnectionError("404: Not Found")
+            return page(page_no)
+
+        self.bse.announcements.side_effect = failing_page
+        errors = []
+        with patch.dict(config.FILING_SUBCATEGORY, {"PPT": ["Investor Presentation"]}):
+            found = self.client.fetch_announcements(
+                self.day, self.day, "PPT", errors=errors
+            )
+        # The first page is kept, the failure is reported rather than hidden
+        self.assertEqual(len(found), PAGE_SIZE)
+        self.assertEqual([str(e) for e in errors], ["404: Not Found"])
+
+
+if __name__ == "__main__":
+    unittest.main()
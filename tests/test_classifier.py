@@ -0,0 +1,103 @@
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+from first_filings import config
+from first_filings.buffers import FeedBuffer
+from first_filings.classifier import KeywordClassifier
+from first_filings.nse_client import NSEClient
+
+
+class TestKeywordClassifier(unittest.TestCase):
+    def setUp(self):
+        self.classifier = KeywordClassifier(config.NSE_CATEGORY_KEYWORDS)
+
+    def test_classifies_into_every_matching_category(self):
+        result = self.classifier.classify(
+            "Press Release and Investor Presentation for Analyst Meet"
+        )
+        self.assertEqual(
+            result, {"Press Release", "Presentation", "Analyst Call Intimation"}
+        )
+
+    def test_case_insensitive(self):
+        self.assertEqual(self.classifier.classify("MEDIA RELEASE"), {"Press Release"})
+
+    def test_no_match(self):
+        self.assertEqual(self.classifier.classify("Trading Window Closure"), set())
+        self.assertEqual(self.classifier.classify(""), set())
+
+    def test_redundant_keywords_are_dropped(self):
+        # "Investor Presentation" contains "Presentation"
+        self.assertEqual(self.classifier.keywords("Presentation"), ("presentation",))
+
+    def test_overlapping_keywords_across_categories(self):
+        classifier = KeywordClassifier({"A": ["ab"], "B": ["bc"]})
+        self.assertEqual(classifier.classify("xabcx"), {"A", "B"})
+
+    def test_matches_single_category(self):
+        self.assertTrue(
+            self.classifier.matches("Con. Call on Q2", "Analyst Call Intimation")
+        )
+        self.assertFalse(self.classifier.matches("Con. Call on Q2", "Press Release"))
+        self.assertFalse(self.classifier.matches("anything", "Unknown"))
+
+
+class TestFeedBuffer(unittest.TestCase):
+    def test_lru_eviction(self):
+        buffer = FeedBuffer(max_entries=2, ttl=60)
+        buffer.put("a", 1)
+        buffer.put("b", 2)
+        buffer.get("a")
+        buffer.put("c", 3)
+
+        self.assertEqual(buffer.get("a"), 1)
+        self.assertIsNone(buffer.get("b"))
+
+    def test_ttl_expiry(self):
+        buffer = FeedBuffer(max_entries=2, ttl=0)
+        buffer.put("a", 1)
+
+        with patch("first_filings.buffers.time.monotonic", return_value=1e12):
+            self.assertIsNone(buffer.get("a"))
+
+
+class TestNSESharedFeed(unittest.TestCase):
+    @patch("first_filings.nse_client.NSE")
+    def test_feed_fetched_once_for_all_categories(self, MockNSE):
+        with tempfile.TemporaryDirectory() as session_dir:
+            client = NSEClient(session_dir=session_dir)
+        client.nse.announcements.return_value = [
+            {"symbol": "A", "desc": "Press Release", "an_dt": "27-Oct-2023 10:30:00"},
+            {
+                "symbol": "B",
+                "desc": "Investor Presentation",
+                "an_dt": "27-Oct-2023 11:00:00",
+            },
+            {
+                "symbol": "C",
+                "desc": "Analysts/Institutional Investor Meet",
+                "an_dt": "27-Oct-2023 12:00:00",
+            },
+        ]
+        day = datetime(2023, 10, 27)
+
+        results = {
+            category: client.fetch_announcements(day, day, category=category)
+            for category in config.NSE_CATEGORY_KEYWORDS
+        }
+
+        self.assertEqual(client.nse.announcements.call_count, 1)
+        self.assertEqual([a.scrip_code for a in results["Press Release"]], ["A"])
+        self.assertEqual([a.scrip_code for a in results["Presentation"]], ["B"])
+        self.assertEqual(
+            [a.scrip_code for a in results["Analyst Call Intimation"]], ["C"]
+        )
+
+        client.clear_buffers()
+        client.fetch_announcements(day, day, category="Press Release")
+        self.assertEqual(client.nse.announcements.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from click.testing import CliRunner
+from conftest import use_temp_cache
+from first_filings.cli import main, select_categories
+from first_filings.last_filing import LastFilingTable
+
+
+class TestCLI(unittest.TestCase):
+    def test_default_command_is_run(self):
+        with patch("first_filings.cli.run.callback") as mock_run:
+            result = CliRunner().invoke(main, ["--exchange", "nse-sme", "-a"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(mock_run.call_args.kwargs["exchange"], "nse-sme")
+        self.assertTrue(mock_run.call_args.kwargs["analyst_calls"])
+
+    def test_help_lists_subcommands(self):
+        for option in ("--help", "-h"):
+            result = CliRunner().invoke(main, [option])
+            self.assertEqual(result.exit_code, 0, result.output)
+            for command in ("run", "serve", "build-index", "update-table"):
+                self.assertIn(command, result.output)
+
+    def test_run_help_shows_run_options(self):
+        result = CliRunner().invoke(main, ["run", "--help"])
+        self.assertIn("--lookback-years", result.output)
+
+    def test_serve_subcommand(self):
+        with (
+            patch("first_filings.server.serve_forever") as mock_serve,
+            patch("first_filings.cli.utils.setup_logging"),
+        ):
+            result = CliRunner().invoke(main, ["serve", "--port", "9999"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(mock_serve.call_args.args, ("127.0.0.1", 9999))
+
+    def test_watch_option(self):
+        use_temp_cache(self)
+        with (
+            patch("first_filings.cli.watch_announcements") as mock_watch,
+            patch("first_filings.cli.create_client"),
+            patch("first_filings.cli.utils.setup_logging"),
+        ):
+            result = CliRunner().invoke(
+                main, ["--watch", "--interval", "60", "-p", "-e", "nse-main"]
+            )
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        _, categories, lookback_years, interval, filename = mock_watch.call_args.args
+        self.assertEqual(categories, ["Press Release"])
+        self.assertEqual((lookback_years, interval), (2, 60))
+        self.assertEqual(filename, "nse_main_output.json")
+
+    def test_update_table_skips_partial_feeds(self):
+        def fetch(from_date, to_date, category, errors, **kwargs):
+            if category == "PPT":
+                errors.append(ConnectionError("404: Not Found"))
+            return []
+
+        client = MagicMock()
+        client.fetch_announcements.side_effect = fetch
+        table = LastFilingTable()
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            patch("first_filings.cli.create_client", return_value=client),
+            patch("first_filings.cli.load_table", return_value=table),
+            patch("first_filings.cli.table_path", return_value=Path(tmp) / "t.json"),
+            patch("first_filings.cli.utils.setup_logging"),
+        ):
+            result = CliRunner().invoke(main, ["update-table", "--date", "19-10-2026"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(json.loads(result.output)["incomplete_categories"], ["PPT"])
+        self.assertIsNone(table.covered_through("PPT"))
+        self.assertIsNotNone(table.covered_through("Press Release"))
+
+    def test_select_categories(self):
+        self.assertEqual(
+            select_categories(True, False, False), ["Analyst Call Intimation"]
+        )
+        self.assertEqual(
+            select_categories(False, False, False),
+            ["Analyst Call Intimation", "Press Release", "PPT"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
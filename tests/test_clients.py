@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+from first_filings.clients import create_client
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+
+
+class TestCreateClient(unittest.TestCase):
+    @patch("first_filings.bse_client.BSE")
+    def test_bse(self, MockBSE):
+        from first_filings.bse_client import BSEClient
+
+        client = create_client("bse")
+
+        self.assertIsInstance(client, BSEClient)
+        MockBSE.assert_called_once()
+
+    @patch("first_filings.nse_client.NSEClient._bootstrap")
+    def test_nse_segments(self, mock_bootstrap):
+        self.assertEqual(create_client("nse-main").segment, "equities")
+        self.assertEqual(create_client("NSE-SME").segment, "sme")
+
+    def test_invalid_exchange(self):
+        with self.assertRaises(ValueError):
+            create_client("lse")
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_cli_import_does_not_load_exchange_libraries(self):
+        code = (
+            "import sys, first_filings.cli; "
+            "print(','.join(m for m in ('bse', 'nse') if m in sys.modules))"
+        )
+        env = dict(os.environ, PYTHONPATH=SRC_DIR)
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+
+        if result.returncode != 0:
+            self.skipTest(f"CLI dependencies unavailable: {result.stderr.strip()}")
+        self.assertEqual(result.stdout.strip(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
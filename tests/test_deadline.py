@@ -0,0 +1,108 @@
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from conftest import make_announcement
+from first_filings.core import FirstFilingAnalyzer
+from first_filings.last_filing import LastFilingTable
+from first_filings.utils import build_output
+
+TODAY = datetime(2026, 10, 19, 10, 0)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDeadline(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch("first_filings.core.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.feed = [make_announcement(code) for code in ("1", "2", "3", "4")]
+        # The table settles scrips 3 and 4 (filed last year); it starts too
+        # late to rule out earlier filings of 1 and 2 within two years
+        earlier = datetime(2025, 6, 6)
+        self.table = LastFilingTable()
+        self.table.update(
+            "Press Release",
+            [make_announcement(code, earlier) for code in ("3", "4")],
+            datetime(2025, 1, 1),
+            TODAY,
+        )
+
+        self.client = MagicMock()
+        self.client.fetch_announcements.side_effect = self.fetch
+        self.client.get_scrip_info.side_effect = self.scrip_info
+        self.history_calls = []
+        self.analyzer = FirstFilingAnalyzer(self.client, last_filing_table=self.table)
+
+    def fetch(self, from_date, to_date, category, scrip_code=None, **kwargs):
+        if scrip_code is None:
+            return list(self.feed)
+        # Each remote history check takes 10 seconds
+        self.history_calls.append(scrip_code)
+        self.clock.now += 10
+        return [make_announcement(scrip_code)]
+
+    def scrip_info(self, scrip_code, when, **kwargs):
+        self.clock.now += 5
+        return {"symbol": f"SYM{scrip_code}", "current_price": 1.0}
+
+    def test_local_checks_first_and_skipped_checks_reported(self):
+        self.analyzer.start_deadline(15)
+        filings = dict(self.analyzer.analyze(TODAY, TODAY, ["Press Release"], 2))
+
+        # Table-answered scrips cost nothing; one remote check fits in 15s
+        self.assertEqual(self.history_calls, ["1"])
+        report = self.analyzer.deadline_report()
+        self.assertTrue(report["reached"])
+        self.assertEqual(
+            [skipped["scrip_code"] for skipped in report["skipped_checks"]], ["2"]
+        )
+        self.assertEqual(self.analyzer.failed_checks_count, 0)
+
+        # Enrichment that would overrun is skipped, the filing is kept
+        self.assertEqual([f["scrip_code"] for f in filings["Press Release"]], ["1"])
+        self.assertEqual(report["unenriched_scrips"], ["1"])
+        self.assertIsNone(filings["Press Release"][0]["current_price"])
+
+        output = build_output(filings, 0, 2, deadline_report=report)
+        self.assertEqual(
+            output["meta"]["deadline"]["skipped_checks"][0]["date"], "2026-10-19"
+        )
+
+    def test_generous_deadline_skips_nothing(self):
+        self.analyzer.start_deadline(1000)
+        filings = self.analyzer.analyze(TODAY, TODAY, ["Press Release"], 2)
+
+        self.assertEqual(self.history_calls, ["1", "2"])
+        self.assertEqual(
+            [f["scrip_code"] for f in filings["Press Release"]], ["1", "2"]
+        )
+        self.assertEqual(filings["Press Release"][1]["current_price"], 1.0)
+        self.assertFalse(self.analyzer.deadline_report()["reached"])
+
+    def test_categories_not_fetched_after_deadline(self):
+        self.analyzer.start_deadline(1)
+        self.clock.now += 2
+        filings = self.analyzer.analyze(TODAY, TODAY, ["Press Release", "PPT"], 2)
+
+        self.assertEqual(filings, {})
+        self.assertEqual(
+            self.analyzer.deadline_report()["skipped_categories"],
+            ["Press Release", "PPT"],
+        )
+
+    def test_no_deadline(self):
+        self.assertIsNone(self.analyzer.deadline_report())
+        self.assertNotIn("deadline", build_output({}, 0, 2)["meta"])
+
+
+if __name__ == "__main__":
+    unittest.main()
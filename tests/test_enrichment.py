@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import MagicMock, patch
 from datetime import datetime, timedelta
+from conftest import make_announcement
 from first_filings.core import FirstFilingAnalyzer
 from first_filings.bse_client import BSEClient
 from first_filings.nse_client import NSEClient
@@ -64,7 +65,7 @@ class TestEnrichment(unittest.TestCase):
 
     @patch('first_filings.nse_client.NSE')
     def test_nse_lookback_and_series(self, MockNSE):
-        client = NSEClient()
+        client = NSEClient(nse=MockNSE())
         mock_nse_instance = client.nse
 
         # Mock quote with activeSeries='BE'
@@ -93,5 +94,140 @@ class TestEnrichment(unittest.TestCase):
         # Verify price
         self.assertEqual(info["price_at_announcement"], 90.0)
 
+    @patch('first_filings.bse_client.BSE')
+    def test_bse_prices_for_several_dates(self, MockBSE):
+        client = BSEClient()
+        mock_bse_instance = client.bse
+        mock_bse_instance.lookup.return_value = {"symbol": "TEST", "company_name": "Test Co"}
+        mock_bse_instance.equityPriceVolumeT12M.return_value = {
+            "Data": {
+                "data": [
+                    ["Mon Oct 12 2026 00:00:00", "80.0", "1000"],
+                    ["Fri Oct 16 2026 00:00:00", "95.0", "1000"],
+                ]
+            }
+        }
+
+        info = client.get_scrip_info(
+            "500000", datetime(2026, 10, 19), price_dates=[datetime(2026, 10, 13)]
+        )
+
+        # One T12M download serves both dates
+        mock_bse_instance.equityPriceVolumeT12M.assert_called_once()
+        self.assertEqual(info["price_at_announcement"], 95.0)
+        self.assertEqual(info["prices_at_announcement"][datetime(2026, 10, 13).date()], 80.0)
+
+    @patch('first_filings.nse_client.NSE')
+    def test_nse_prices_for_several_dates(self, MockNSE):
+        client = NSEClient(nse=MockNSE())
+        mock_nse_instance = client.nse
+        mock_nse_instance.quote.return_value = {"info": {"activeSeries": ["EQ"]}}
+        mock_nse_instance.fetch_equity_historical_data.return_value = [
+            {"chClosingPrice": 80.0, "mtimestamp": "12-Oct-2026"},
+            {"chClosingPrice": 95.0, "mtimestamp": "16-Oct-2026"},
+        ]
+
+        info = client.get_scrip_info(
+            "TEST", datetime(2026, 10, 19), price_dates=[datetime(2026, 10, 13)]
+        )
+
+        args, kwargs = mock_nse_instance.fetch_equity_historical_data.call_args
+        self.assertEqual(kwargs.get('from_date'), datetime(2026, 10, 6))
+        self.assertEqual(info["price_at_announcement"], 95.0)
+        self.assertEqual(info["prices_at_announcement"][datetime(2026, 10, 13).date()], 80.0)
+
+
+class TestEnrichmentStage(unittest.TestCase):
+    def test_each_scrip_is_enriched_once(self):
+        monday, tuesday = datetime(2026, 10, 12), datetime(2026, 10, 13)
+        client = MagicMock()
+        client.get_scrip_info.side_effect = lambda scrip_code, when, price_dates=(), **kwargs: {
+            "symbol": f"SYM{scrip_code}",
+            "current_price": 100.0,
+            "current_mkt_cap_cr": 10,
+            "price_at_announcement": 90.0,
+            "prices_at_announcement": {monday.date(): 90.0, tuesday.date(): 91.0} if price_dates else None,
+        }
+        analyzer = FirstFilingAnalyzer(client)
+        analyzer.is_first_filing = MagicMock(return_value=True)
+
+        announcements = {
+            "Press Release": [make_announcement("1", monday, "Press Release"), make_announcement("2", monday, "Press Release")],
+            "PPT": [make_announcement("1", monday, "PPT"), make_announcement("1", tuesday, "PPT")],
+        }
+        filings = list(analyzer.iter_evaluate(announcements, 2))
+
+        # Scrip 1 (three filings, two dates) and scrip 2: one call each
+        self.assertEqual(client.get_scrip_info.call_count, 2)
+        first_call = client.get_scrip_info.call_args_list[0]
+        self.assertEqual(first_call.kwargs["price_dates"], [tuesday])
+
+        self.assertEqual([(cat, f["scrip_code"], f["date"]) for cat, f in filings], [
+            ("Press Release", "1", "2026-10-12"),
+            ("Press Release", "2", "2026-10-12"),
+            ("PPT", "1", "2026-10-12"),
+            ("PPT", "1", "2026-10-13"),
+        ])
+        self.assertEqual([f["price_at_announcement"] for _, f in filings], [90.0, 90.0, 90.0, 91.0])
+        self.assertEqual({f["current_mkt_cap_cr"] for _, f in filings}, {10})
+
+    def test_enrich_level_none_makes_no_calls(self):
+        client = MagicMock()
+        analyzer = FirstFilingAnalyzer(client, enrich_level="none")
+        announcement = make_announcement("1", datetime(2026, 10, 12), "PPT")
+
+        filings = list(analyzer.iter_enrich([("PPT", announcement, {})]))
+
+        client.get_scrip_info.assert_not_called()
+        self.assertEqual(filings[0][1]["company_name"], "Company 1")
+        self.assertIsNone(filings[0][1]["current_price"])
+
+    def test_enrich_level_price_is_passed_to_client(self):
+        client = MagicMock()
+        client.get_scrip_info.return_value = {"symbol": "SYM", "current_price": 10.0}
+        analyzer = FirstFilingAnalyzer(client, enrich_level="price")
+        monday, tuesday = datetime(2026, 10, 12), datetime(2026, 10, 13)
+
+        filings = list(analyzer.iter_enrich([
+            ("PPT", make_announcement("1", monday, "PPT"), {}),
+            ("PPT", make_announcement("1", tuesday, "PPT"), {}),
+        ]))
+
+        client.get_scrip_info.assert_called_once_with(
+            "1", monday, level="price", errors=[]
+        )
+        self.assertEqual([f["current_price"] for _, f in filings], [10.0, 10.0])
+
+
+class TestEnrichLevelClients(unittest.TestCase):
+    @patch('first_filings.bse_client.BSE')
+    def test_bse_price_level_skips_snapshot_and_history(self, MockBSE):
+        client = BSEClient()
+        mock_bse_instance = client.bse
+        mock_bse_instance.lookup.return_value = {"symbol": "TEST", "company_name": "Test Co"}
+        mock_bse_instance.quote.return_value = {"LTP": 100}
+        mock_bse_instance.getScripTradingStats.return_value = {"MktCapFull": "1,234.50"}
+
+        info = client.get_scrip_info("500000", datetime.now(), level="price")
+
+        mock_bse_instance.resultsSnapshot.assert_not_called()
+        mock_bse_instance.equityPriceVolumeT12M.assert_not_called()
+        self.assertEqual(info["current_price"], 100)
+        self.assertEqual(info["current_mkt_cap_cr"], 1234.5)
+
+    @patch('first_filings.nse_client.NSE')
+    def test_nse_price_level_skips_history(self, MockNSE):
+        client = NSEClient(nse=MockNSE())
+        mock_nse_instance = client.nse
+        mock_nse_instance.quote.return_value = {
+            "priceInfo": {"lastPrice": 100},
+            "securityInfo": {"issuedSize": 10000000}
+        }
+
+        info = client.get_scrip_info("TEST", datetime.now(), level="price")
+
+        mock_nse_instance.fetch_equity_historical_data.assert_not_called()
+        self.assertEqual(info["current_mkt_cap_cr"], 100)
+
 if __name__ == '__main__':
     unittest.main()
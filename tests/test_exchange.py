@@ -0,0 +1,51 @@
+import unittest
+from datetime import datetime
+from first_filings.exchange import Announcement, project_fields
+
+
+class TestAnnouncement(unittest.TestCase):
+    def make(self, company_name):
+        return Announcement(
+            scrip_code="500001",
+            company_name=company_name,
+            date=datetime(2026, 10, 19),
+            category="".join(["Press ", "Release"]),
+            description="Press Release",
+        )
+
+    def test_is_slotted(self):
+        announcement = self.make("Test Co")
+        self.assertFalse(hasattr(announcement, "__dict__"))
+        with self.assertRaises(AttributeError):
+            announcement.extra = 1
+
+    def test_interns_repeated_strings(self):
+        a = self.make("".join(["Test ", "Co"]))
+        b = self.make("".join(["Test ", "Co"]))
+        self.assertIs(a.company_name, b.company_name)
+        self.assertIs(a.category, b.category)
+
+    def test_allows_missing_company_name(self):
+        self.assertIsNone(self.make(None).company_name)
+
+
+class TestProjectFields(unittest.TestCase):
+    def test_keeps_only_requested_fields(self):
+        row = {"SCRIP_CD": 500001, "SLONGNAME": "Test Co", "XML_NAME": "x.xml"}
+        self.assertEqual(
+            project_fields(row, ("SCRIP_CD", "SLONGNAME", "NEWSID")),
+            {"SCRIP_CD": 500001, "SLONGNAME": "Test Co"},
+        )
+
+    def test_interns_named_fields(self):
+        a = project_fields(
+            {"SLONGNAME": "".join(["Test ", "Co"])}, ("SLONGNAME",), ("SLONGNAME",)
+        )
+        b = project_fields(
+            {"SLONGNAME": "".join(["Test ", "Co"])}, ("SLONGNAME",), ("SLONGNAME",)
+        )
+        self.assertIs(a["SLONGNAME"], b["SLONGNAME"])
+
+
+if __name__ == "__main__":
+    unittest.main()
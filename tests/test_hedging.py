@@ -0,0 +1,151 @@
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock
+from first_filings.bse_client import BSEClient
+from first_filings.hedging import Hedger, LatencyTracker
+from first_filings.nse_client import NSEClient
+
+
+def warmed_tracker(endpoint="quote", seconds=0.01, samples=20):
+    tracker = LatencyTracker(percentile=95, min_samples=samples, min_delay=0.05)
+    for _ in range(samples):
+        tracker.record(endpoint, seconds)
+    return tracker
+
+
+class SlowOnce:
+    """Endpoint whose first call hangs and later calls return at once."""
+
+    def __init__(self, hang=1.0, error=None):
+        self.hang = hang
+        self.error = error
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, value):
+        with self.lock:
+            self.calls += 1
+            call = self.calls
+        if call == 1:
+            time.sleep(self.hang)
+            if self.error:
+                raise self.error
+            return f"slow {value}"
+        return f"fast {value}"
+
+
+class TestLatencyTracker(unittest.TestCase):
+    def test_threshold_needs_samples_and_has_floor(self):
+        tracker = LatencyTracker(percentile=90, min_samples=10, min_delay=0.2)
+        for i in range(9):
+            tracker.record("quote", i)
+        self.assertIsNone(tracker.threshold("quote"))
+        tracker.record("quote", 9)
+        self.assertEqual(tracker.threshold("quote"), 9)
+        self.assertIsNone(tracker.threshold("lookup"))
+
+        fast = LatencyTracker(percentile=90, min_samples=1, min_delay=0.2)
+        fast.record("quote", 0.01)
+        self.assertEqual(fast.threshold("quote"), 0.2)
+
+
+class TestHedger(unittest.TestCase):
+    def hedger(self, tracker, **kwargs):
+        hedger = Hedger(tracker, **kwargs)
+        self.addCleanup(hedger.close)
+        return hedger
+
+    def test_slow_request_is_hedged_and_first_response_wins(self):
+        hedger = self.hedger(warmed_tracker())
+        endpoint = SlowOnce()
+
+        started = time.monotonic()
+        self.assertEqual(hedger.call("quote", endpoint, "500001"), "fast 500001")
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(endpoint.calls, 2)
+
+        report = hedger.report()
+        self.assertEqual(
+            (report["requests"], report["hedged"], report["hedge_wins"]), (1, 1, 1)
+        )
+        self.assertEqual(report["endpoints"]["quote"]["abandoned"], 1)
+
+    def test_fast_or_unmeasured_requests_are_not_hedged(self):
+        hedger = self.hedger(warmed_tracker())
+        fn = MagicMock(return_value="ok")
+        self.assertEqual(hedger.call("quote", fn, "500001"), "ok")
+        # No latency history for this endpoint yet
+        self.assertEqual(
+            hedger.call("lookup", SlowOnce(hang=0.2), "500001"), "slow 500001"
+        )
+        self.assertEqual(hedger.report()["hedged"], 0)
+
+    def test_failed_request_falls_back_to_the_other(self):
+        hedger = self.hedger(warmed_tracker())
+        endpoint = SlowOnce(hang=0.2, error=ConnectionError("503: Service Unavailable"))
+        self.assertEqual(hedger.call("quote", endpoint, "500001"), "fast 500001")
+
+        def failing(value):
+            raise ConnectionError("404: Not Found")
+
+        with self.assertRaises(ConnectionError):
+            hedger.call("quote", failing, "500001")
+
+    def test_hedging_is_capped(self):
+        hedger = self.hedger(warmed_tracker(), max_ratio=0.5)
+        hedger.call("quote", SlowOnce(hang=0.3), "1")
+        # One of two requests hedged already: the next slow one is not
+        self.assertEqual(hedger.call("quote", SlowOnce(hang=0.3), "2"), "slow 2")
+        self.assertEqual(hedger.report()["hedged"], 1)
+
+
+class TestClientHedging(unittest.TestCase):
+    def test_bse_requests_go_through_the_hedger(self):
+        bse = MagicMock()
+        bse.announcements.return_value = {"Table": [], "Table1": [{"ROWCNT": 0}]}
+        bse.lookup.return_value = {"symbol": "ABC", "company_name": "ABC Ltd"}
+        hedger = Hedger(warmed_tracker())
+        self.addCleanup(hedger.close)
+        client = BSEClient(bse=bse, hedger=hedger)
+
+        client._fetch_page.__wrapped__(
+            client, 1, "20261019", "20261019", "Company Update", "-1", None, "equity"
+        )
+        client.get_scrip_info("500001", datetime(2026, 10, 19), level="price")
+
+        endpoints = hedger.report()["endpoints"]
+        self.assertEqual(
+            sorted(endpoints),
+            ["announcements", "getScripTradingStats", "quote"],
+        )
+        bse.lookup.assert_called_once_with("500001")
+
+    def test_bhavcopy_downloads_are_not_hedged(self):
+        def write_bhavcopy(day, folder):
+            path = Path(folder) / "bhav.csv"
+            path.write_text("FinInstrmId,TckrSymb,ClsPric\n500001,ABC,10.5\n")
+            return path
+
+        bse, nse = MagicMock(), MagicMock()
+        bse.bhavcopyReport.side_effect = write_bhavcopy
+        nse.equityBhavcopy.side_effect = write_bhavcopy
+        hedger = Hedger(warmed_tracker("bhavcopyReport"))
+        self.addCleanup(hedger.close)
+        day = datetime(2026, 10, 19)
+
+        bse_prices = BSEClient(bse=bse, hedger=hedger).bulk_prices(day)
+        with tempfile.TemporaryDirectory() as session_dir:
+            nse_prices = NSEClient(
+                nse=nse, session_dir=session_dir, hedger=hedger
+            ).bulk_prices(day)
+
+        self.assertEqual((bse_prices, nse_prices), ({"500001": 10.5}, {"ABC": 10.5}))
+        self.assertEqual(hedger.report()["requests"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
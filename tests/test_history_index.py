@@ -0,0 +1,165 @@
+import tempfile
+import unittest
+from datetime import date, datetime
+from unittest.mock import MagicMock
+from conftest import make_announcement
+from first_filings.core import FirstFilingAnalyzer
+
+try:
+    import numpy
+    from first_filings.history_index import HistoryIndex
+except ImportError:
+    numpy = None
+
+
+HISTORY = [
+    make_announcement("1", date(2025, 3, 1)),
+    make_announcement("1", date(2026, 10, 19)),
+    make_announcement("2", date(2026, 10, 19)),
+    make_announcement("3", date(2022, 1, 5)),
+    make_announcement("3", date(2026, 10, 19)),
+]
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestHistoryIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = HistoryIndex()
+        self.index.extend(
+            "Press Release",
+            HISTORY,
+            date(2021, 10, 19),
+            date(2026, 10, 19),
+            today=date(2026, 10, 19),
+        )
+
+    def test_first_filing_verdicts(self):
+        verdicts = self.index.first_filing_verdicts(
+            ["1", "2", "3", "4"],
+            ["Press Release"] * 4,
+            [date(2026, 10, 19)] * 4,
+            lookback_years=2,
+        )
+        self.assertEqual(verdicts, [False, True, True, True])
+
+    def test_previous_filing_dates(self):
+        previous = self.index.previous_filing_dates(
+            ["1", "2", "3"], ["Press Release"] * 3, [date(2026, 10, 19)] * 3
+        )
+        self.assertEqual(previous, [date(2025, 3, 1), None, date(2022, 1, 5)])
+
+    def test_categories_are_separate(self):
+        counts = self.index.count_filings(
+            ["1"], ["PPT"], [date(2021, 10, 19)], [date(2026, 10, 19)]
+        )
+        self.assertEqual(counts.tolist(), [0])
+
+    def test_coverage(self):
+        self.assertTrue(
+            self.index.covers("Press Release", date(2024, 10, 19), date(2026, 10, 19))
+        )
+        self.assertFalse(
+            self.index.covers("Press Release", date(2024, 10, 19), date(2026, 10, 20))
+        )
+        self.assertFalse(self.index.covers("PPT", date(2026, 1, 1), date(2026, 1, 2)))
+
+        # The next feed starts at the open day; re-adding a range is idempotent
+        feed = HISTORY[1:3] + HISTORY[4:] + [make_announcement("2", date(2026, 10, 20))]
+        for _ in range(2):
+            self.index.extend(
+                "Press Release",
+                feed,
+                date(2026, 10, 19),
+                date(2026, 10, 20),
+                today=date(2026, 10, 20),
+            )
+        self.assertTrue(
+            self.index.covers("Press Release", date(2024, 10, 20), date(2026, 10, 20))
+        )
+        self.assertEqual(len(self.index), len(HISTORY) + 1)
+
+    def test_open_day_is_not_covered(self):
+        # 2026-10-19 was added while open; a feed from the next day leaves a gap
+        later = date(2026, 10, 25)
+        self.index.extend(
+            "Press Release",
+            [make_announcement("4", later)],
+            date(2026, 10, 20),
+            later,
+            today=later,
+        )
+        self.assertFalse(self.index.covers("Press Release", date(2024, 10, 25), later))
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.index.save(tmp)
+            loaded = HistoryIndex.load(tmp)
+            # Saving over a memory-mapped index must not corrupt it
+            loaded.save(tmp)
+
+            self.assertEqual(loaded.keys.tolist(), self.index.keys.tolist())
+            self.assertTrue(
+                loaded.covers("Press Release", date(2025, 1, 1), date(2026, 10, 18))
+            )
+            # The open day is not saved as covered
+            self.assertFalse(
+                loaded.covers("Press Release", date(2025, 1, 1), date(2026, 10, 19))
+            )
+            self.assertEqual(
+                loaded.first_filing_verdicts(
+                    ["1", "2"], ["Press Release"] * 2, [date(2026, 10, 19)] * 2, 2
+                ),
+                [False, True],
+            )
+
+    def test_analyzer_uses_index_for_covered_checks(self):
+        client = MagicMock()
+        client.get_scrip_info.return_value = {"symbol": "SYM"}
+        analyzer = FirstFilingAnalyzer(client, history_index=self.index)
+
+        candidates = {
+            "Press Release": [a for a in HISTORY if a.date.date() == date(2026, 10, 19)]
+        }
+        filings = analyzer.evaluate(candidates, lookback_years=2)
+
+        client.fetch_announcements.assert_not_called()
+        self.assertEqual(
+            [f["scrip_code"] for f in filings["Press Release"]], ["2", "3"]
+        )
+
+    def test_analyzer_multi_lookback_from_index(self):
+        client = MagicMock()
+        client.get_scrip_info.return_value = {"symbol": "SYM"}
+        analyzer = FirstFilingAnalyzer(client, history_index=self.index)
+
+        candidates = {
+            "Press Release": [a for a in HISTORY if a.date.date() == date(2026, 10, 19)]
+        }
+        filings = analyzer.evaluate(candidates, lookback_years=[1, 2])
+
+        client.fetch_announcements.assert_not_called()
+        by_scrip = {f["scrip_code"]: f for f in filings["Press Release"]}
+        self.assertEqual(by_scrip["1"]["days_since_previous"], 597)
+        self.assertEqual(by_scrip["1"]["first_within_years"], {1: True, 2: False})
+        self.assertIsNone(by_scrip["2"]["days_since_previous"])
+
+    def test_partial_feed_does_not_extend_coverage(self):
+        def partial_fetch(from_date, to_date, category, errors, **kwargs):
+            errors.append(ConnectionError("404: Not Found"))
+            return [make_announcement("2", date(2026, 10, 20))]
+
+        client = MagicMock()
+        client.fetch_announcements.side_effect = partial_fetch
+        analyzer = FirstFilingAnalyzer(client, history_index=self.index)
+        day = datetime(2026, 10, 20)
+        feed = analyzer.fetch_announcements(day, day, ["Press Release"])
+        analyzer.record_feed(feed, day, day)
+
+        self.assertFalse(
+            self.index.covers("Press Release", date(2026, 10, 20), date(2026, 10, 20))
+        )
+        self.assertEqual(len(self.index), len(HISTORY))
+
+
+if __name__ == "__main__":
+    unittest.main()
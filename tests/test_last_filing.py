@@ -0,0 +1,177 @@
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock
+from conftest import make_announcement
+from first_filings.core import FirstFilingAnalyzer
+from first_filings.last_filing import LastFilingTable
+
+TODAY = datetime(2026, 10, 19, 10, 0)
+
+
+# Scrip 1 filed 500 days ago, scrip 2 a month ago, scrip 3 twice today
+HISTORY = [
+    make_announcement("1", datetime(2025, 6, 6), announcement_id="1-old"),
+    make_announcement("2", datetime(2026, 9, 19), announcement_id="2-old"),
+]
+TODAY_FEED = [
+    make_announcement("1", TODAY, announcement_id="1-new"),
+    make_announcement("2", TODAY, announcement_id="2-new"),
+    make_announcement("3", TODAY, announcement_id="3-a"),
+    make_announcement("3", TODAY, announcement_id="3-b"),
+    make_announcement("4", TODAY, announcement_id="4-new"),
+]
+
+
+class TestLastFilingTable(unittest.TestCase):
+    def setUp(self):
+        self.table = LastFilingTable()
+        self.table.update(
+            "Press Release",
+            HISTORY,
+            datetime(2023, 10, 19),
+            datetime(2026, 10, 18),
+            today=TODAY.date(),
+        )
+        self.table.update("Press Release", TODAY_FEED, TODAY, TODAY, today=TODAY.date())
+
+    def previous(self, scrip_code, years=2, category="Press Release"):
+        lookback_start = TODAY.replace(year=TODAY.year - years)
+        return self.table.previous_filing_date(
+            scrip_code, category, TODAY, lookback_start
+        )
+
+    def test_previous_filing_date(self):
+        self.assertEqual(self.previous("1"), (True, date(2025, 6, 6)))
+        self.assertEqual(self.previous("3"), (True, TODAY.date()))
+        # Not in the table: no filing since coverage started
+        self.assertEqual(self.previous("4"), (True, None))
+        self.assertEqual(self.previous("5"), (True, None))
+
+    def test_unanswered_outside_coverage(self):
+        # Coverage starts after the lookback window does
+        self.assertEqual(self.previous("5", years=5), (False, None))
+        self.assertEqual(self.previous("1", category="PPT"), (False, None))
+        self.assertEqual(
+            self.table.previous_filing_date(
+                "1", "Press Release", datetime(2026, 10, 20), TODAY
+            ),
+            (False, None),
+        )
+
+    def test_update_is_incremental_and_idempotent(self):
+        self.table.update("Press Release", TODAY_FEED, TODAY, TODAY, today=TODAY.date())
+        self.assertEqual(self.previous("2"), (True, date(2026, 9, 19)))
+        # Today is still open, so only the days before it are covered
+        self.assertEqual(
+            self.table.covered_through("Press Release"), date(2026, 10, 18)
+        )
+
+        later = datetime(2026, 10, 20)
+        self.table.update(
+            "Press Release",
+            TODAY_FEED + [make_announcement("2", later, announcement_id="2-later")],
+            TODAY,
+            later,
+            today=later.date(),
+        )
+        self.assertEqual(self.table.covered_through("Press Release"), TODAY.date())
+        # Only the two latest filings are kept; older candidates fall back
+        self.assertEqual(self.previous("2"), (False, None))
+
+    def test_open_day_filed_later_is_not_missed(self):
+        # A later run cannot rely on the day recorded while it was open
+        later = datetime(2026, 10, 25)
+        self.assertEqual(
+            self.table.previous_filing_date("5", "Press Release", later, TODAY),
+            (False, None),
+        )
+
+        # The next update starts at the open day and records its late filings
+        late = make_announcement("5", TODAY.replace(hour=20), announcement_id="5-late")
+        self.table.update("Press Release", [late], TODAY, later, today=later.date())
+        self.assertEqual(
+            self.table.previous_filing_date("5", "Press Release", later, TODAY),
+            (True, TODAY.date()),
+        )
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "bse.json"
+            self.table.save(path)
+            loaded = LastFilingTable.load(path)
+
+        self.assertEqual(loaded.entries, self.table.entries)
+        self.assertEqual(loaded.coverage, self.table.coverage)
+
+
+class TestAnalyzerUsesTable(unittest.TestCase):
+    def setUp(self):
+        self.table = LastFilingTable()
+        self.table.update(
+            "Press Release", HISTORY, datetime(2023, 10, 19), datetime(2026, 10, 18)
+        )
+        self.client = MagicMock()
+        self.client.fetch_announcements.return_value = TODAY_FEED
+        self.client.get_scrip_info.return_value = {"symbol": "SYM"}
+        self.analyzer = FirstFilingAnalyzer(self.client, last_filing_table=self.table)
+
+    def test_checks_answered_from_table(self):
+        filings = self.analyzer.analyze(TODAY, TODAY, ["Press Release"], 2)
+
+        # Only the period feed is fetched; no per-scrip history requests
+        self.client.fetch_announcements.assert_called_once()
+        self.assertEqual([f["scrip_code"] for f in filings["Press Release"]], ["4"])
+
+    def test_multi_lookback_from_table(self):
+        filings = self.analyzer.analyze(TODAY, TODAY, ["Press Release"], [1, 2])
+
+        self.client.fetch_announcements.assert_called_once()
+        by_scrip = {f["scrip_code"]: f for f in filings["Press Release"]}
+        self.assertEqual(by_scrip["1"]["days_since_previous"], 500)
+        self.assertEqual(by_scrip["1"]["first_within_years"], {1: True, 2: False})
+
+    def test_run_records_the_day_left_open(self):
+        today = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+        yesterday = today - timedelta(days=1)
+        table = LastFilingTable()
+        table.update(
+            "Press Release",
+            [],
+            yesterday - timedelta(days=30),
+            yesterday,
+            today=yesterday.date(),
+        )
+        # Filed after yesterday's run recorded the feed
+        late = make_announcement("5", yesterday.replace(hour=20))
+        self.client.fetch_announcements.return_value = [late]
+        analyzer = FirstFilingAnalyzer(self.client, last_filing_table=table)
+        analyzer.record_feed(
+            {"Press Release": [make_announcement("6", today)]}, today, today
+        )
+
+        self.client.fetch_announcements.assert_called_once_with(
+            from_date=yesterday.replace(hour=0),
+            to_date=yesterday,
+            category="Press Release",
+            errors=[],
+        )
+        self.assertEqual(table.covered_through("Press Release"), yesterday.date())
+        self.assertEqual(
+            table.previous_filing_date("5", "Press Release", today, yesterday),
+            (True, yesterday.date()),
+        )
+
+    def test_falls_back_when_table_cannot_answer(self):
+        self.client.fetch_announcements.return_value = [TODAY_FEED[0]]
+        result = self.analyzer.is_first_filing(
+            "9", "Press Release", TODAY, 5, "Company 9"
+        )
+
+        self.assertTrue(result)
+        self.assertEqual(self.client.fetch_announcements.call_args.kwargs["limit"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from first_filings.ledger import DeliveryLedger
+
+
+class TestDeliveryLedger(unittest.TestCase):
+    def test_key(self):
+        self.assertEqual(
+            DeliveryLedger.key("BSE", "PPT", "500001", "2026-10-19", None),
+            "bse|PPT|500001|2026-10-19|",
+        )
+        self.assertNotEqual(
+            DeliveryLedger.key("bse", "PPT", "500001", "2026-10-19", "a.pdf"),
+            DeliveryLedger.key("bse", "PPT", "500001", "2026-10-19", "b.pdf"),
+        )
+
+    def test_mark_prune_save_and_load(self):
+        ledger = DeliveryLedger()
+        today = date.today()
+        ledger.mark(["old"], when=today - timedelta(days=200))
+        ledger.mark(["new"])
+        self.assertIn("new", ledger)
+        self.assertEqual(ledger.prune(retention_days=120, today=today), 1)
+        self.assertNotIn("old", ledger)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "state", "delivered.json")
+            self.assertEqual(len(DeliveryLedger.load(path)), 0)
+            ledger.save(path)
+            loaded = DeliveryLedger.load(path)
+
+        self.assertEqual(loaded.delivered, ledger.delivered)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+from datetime import date, datetime
+from unittest.mock import MagicMock
+from conftest import make_announcement
+from first_filings.api import parse_lookback_years
+from first_filings.core import FirstFilingAnalyzer, first_within
+from first_filings.utils import build_output
+
+TODAY = datetime(2026, 10, 19, 10, 0)
+
+
+# Scrip 1: previous filing 500 days ago; scrip 2: 30 days ago; scrip 3: none
+HISTORY = {
+    "1": [make_announcement("1", datetime(2025, 6, 6), announcement_id="old-1")],
+    "2": [make_announcement("2", datetime(2026, 9, 19), announcement_id="old-2")],
+    "3": [],
+}
+
+
+class TestMultiLookback(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.fetch_announcements.side_effect = self.fetch
+        self.client.get_scrip_info.return_value = {"symbol": "SYM"}
+        self.analyzer = FirstFilingAnalyzer(self.client)
+        self.candidates = [
+            make_announcement(code, TODAY, announcement_id=f"new-{code}")
+            for code in ("1", "2", "3")
+        ]
+
+    def fetch(self, from_date, to_date, category, scrip_code=None, **kwargs):
+        candidate = make_announcement(
+            scrip_code, TODAY, announcement_id=f"new-{scrip_code}"
+        )
+        return [a for a in HISTORY[scrip_code] if a.date >= from_date] + [candidate]
+
+    def test_single_history_fetch_per_candidate(self):
+        filings = self.analyzer.evaluate(
+            {"Press Release": self.candidates}, lookback_years=[1, 2, 3]
+        )
+
+        self.assertEqual(self.client.fetch_announcements.call_count, 3)
+        for call in self.client.fetch_announcements.call_args_list:
+            self.assertEqual((TODAY - call.kwargs["from_date"]).days, 3 * 365)
+            self.assertNotIn("limit", call.kwargs)
+
+        by_scrip = {f["scrip_code"]: f for f in filings["Press Release"]}
+        # Scrip 2 filed 30 days ago, so it is not first within the shortest lookback
+        self.assertEqual(sorted(by_scrip), ["1", "3"])
+        self.assertEqual(by_scrip["1"]["days_since_previous"], 500)
+        self.assertEqual(
+            by_scrip["1"]["first_within_years"], {1: True, 2: False, 3: False}
+        )
+        self.assertIsNone(by_scrip["3"]["days_since_previous"])
+        self.assertEqual(
+            by_scrip["3"]["first_within_years"], {1: True, 2: True, 3: True}
+        )
+
+    def test_previous_filing_date_excludes_candidate(self):
+        self.assertEqual(
+            self.analyzer.previous_filing_date(self.candidates[1], "Press Release", 3),
+            date(2026, 9, 19),
+        )
+        self.assertIsNone(
+            self.analyzer.previous_filing_date(self.candidates[2], "Press Release", 3)
+        )
+
+    def test_failed_history_fetch_is_counted(self):
+        self.client.fetch_announcements.side_effect = ConnectionError("503")
+        filings = self.analyzer.evaluate(
+            {"Press Release": self.candidates}, lookback_years=[1, 2]
+        )
+        self.assertEqual(filings, {})
+        self.assertEqual(self.analyzer.failed_checks_count, 3)
+
+    def test_first_within(self):
+        self.assertEqual(
+            first_within(TODAY, date(2025, 10, 18), [1, 2]), {1: True, 2: False}
+        )
+        self.assertEqual(
+            first_within(TODAY, date(2025, 10, 19), [1, 2]), {1: False, 2: False}
+        )
+
+
+class TestMultiLookbackOutput(unittest.TestCase):
+    def test_columns_are_appended(self):
+        filing = {
+            "scrip_code": "1",
+            "company_name": "Company 1",
+            "date": "2026-10-19",
+            "price_at_announcement": 9.0,
+            "current_price": 10.0,
+            "current_mkt_cap_cr": 100,
+            "days_since_previous": 500,
+            "first_within_years": {1: True, 3: False},
+        }
+        output = build_output({"Press Release": [filing]}, 0, [1, 3])
+
+        self.assertEqual(
+            output["meta"]["columns"][-3:],
+            ["days_since_previous", "first_within_1y", "first_within_3y"],
+        )
+        row = output["data"]["Press Release"]["2026-10-19"][0]
+        self.assertEqual(row[-3:], [500, True, False])
+
+    def test_parse_lookback_years(self):
+        self.assertEqual(parse_lookback_years("2"), 2)
+        self.assertEqual(parse_lookback_years("3,1,2,1"), [1, 2, 3])
+        self.assertEqual(parse_lookback_years([2]), 2)
+        with self.assertRaises(ValueError):
+            parse_lookback_years("1,x")
+        with self.assertRaises(ValueError):
+            parse_lookback_years(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
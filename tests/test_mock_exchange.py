@@ -0,0 +1,140 @@
+import importlib
+import importlib.util
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+# HTTP stacks of the real libraries, imported once so they outlive the
+# per-test sys.modules patch below
+import httpx  # noqa: F401
+import requests  # noqa: F401
+
+SCRIPT = Path(__file__).resolve().parents[1] / "benchmarks" / "mock_exchange.py"
+spec = importlib.util.spec_from_file_location("mock_exchange", SCRIPT)
+mock_exchange = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(mock_exchange)
+
+NOW = datetime.now().replace(microsecond=0)
+PRESS_RELEASE = "Press Release / Media Release"
+
+
+class TestMockExchange(unittest.TestCase):
+    """Real bse/nse libraries and clients against the local mock exchange."""
+
+    def setUp(self):
+        # Other test modules replace bse/nse/tenacity with MagicMocks; import
+        # a real stack for this test and restore sys.modules afterwards.
+        modules = patch.dict(sys.modules)
+        modules.start()
+        self.addCleanup(modules.stop)
+        for name in list(sys.modules):
+            if name.split(".")[0] in ("bse", "nse", "tenacity", "first_filings"):
+                del sys.modules[name]
+        self.config = importlib.import_module("first_filings.config")
+        self.BSEClient = importlib.import_module("first_filings.bse_client").BSEClient
+        self.NSEClient = importlib.import_module("first_filings.nse_client").NSEClient
+        self.ClientPool = importlib.import_module("first_filings.pool").ClientPool
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        for p in (
+            patch.object(self.config, "BSE_REQUEST_DELAY", 0),
+            mock_exchange.fast_retries(self.BSEClient, self.NSEClient),
+        ):
+            p.__enter__()
+            self.addCleanup(p.__exit__, None, None, None)
+
+    def serve(self, **kwargs):
+        server = mock_exchange.MockExchange(**kwargs).start()
+        self.addCleanup(server.stop)
+        return server
+
+    def bse_client(self, server):
+        return self.BSEClient(bse=server.connect_bse(self.tmp.name))
+
+    def test_bse_pagination_and_scrip_info(self):
+        rows = [
+            mock_exchange.bse_row(
+                500000 + i, NOW - timedelta(days=i % 5), PRESS_RELEASE, i
+            )
+            for i in range(120)
+        ]
+        server = self.serve(bse_announcements=rows)
+        client = self.bse_client(server)
+
+        announcements = client.fetch_announcements(
+            NOW - timedelta(days=10), NOW, "Press Release"
+        )
+        self.assertEqual(len(announcements), 120)
+        self.assertEqual(server.stats["/bse/api/AnnSubCategoryGetData/w"], 3)
+
+        info = client.get_scrip_info("500001", NOW)
+        self.assertEqual(info["symbol"], "SYM500001")
+        self.assertEqual(info["current_price"], 100.0)
+
+    def test_retries_injected_errors(self):
+        rows = [mock_exchange.bse_row(500001, NOW, PRESS_RELEASE, 0)]
+        server = self.serve(bse_announcements=rows, fail_first=2)
+        announcements = self.bse_client(server).fetch_announcements(
+            NOW - timedelta(days=1), NOW, "Press Release"
+        )
+        self.assertEqual(len(announcements), 1)
+        self.assertEqual(server.stats["status_503"], 2)
+        self.assertEqual(server.stats["status_200"], 1)
+
+    def test_rate_limit_answers_429(self):
+        server = self.serve(rate_limit=1, fail_status=429)
+        self.assertIsNone(server.admit())
+        self.assertEqual(server.admit(), (429, {"Retry-After": "1"}))
+
+    def test_nse_feed_and_scrip_info(self):
+        rows = [
+            mock_exchange.nse_row(
+                f"SYM{i}",
+                NOW - timedelta(hours=i),
+                "Press Release" if i % 2 else "Board Meeting",
+                i,
+            )
+            for i in range(20)
+        ]
+        server = self.serve(nse_announcements=rows)
+        folder = Path(self.tmp.name) / "nse"
+        client = self.NSEClient(nse=server.connect_nse(folder), session_dir=folder)
+
+        announcements = client.fetch_announcements(
+            NOW - timedelta(days=3), NOW, "Press Release"
+        )
+        self.assertEqual(len(announcements), 10)
+        info = client.get_scrip_info("SYM1", NOW - timedelta(days=3))
+        self.assertEqual(info["symbol"], "SYM1")
+        self.assertEqual(info["price_at_announcement"], 100.0)
+
+    def test_pooled_clients_run_concurrently(self):
+        rows = [
+            mock_exchange.bse_row(500000 + i, NOW, PRESS_RELEASE, i) for i in range(4)
+        ]
+        server = self.serve(bse_announcements=rows, latency=0.2)
+        pool = self.ClientPool(lambda: self.bse_client(server), size=4)
+        self.addCleanup(pool.close)
+
+        def lookup(code):
+            with pool.checkout() as client:
+                client.bse.lookup(code)
+
+        threads = [
+            threading.Thread(target=lookup, args=(str(500000 + i),)) for i in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(server.stats["/bse/api/PeerSmartSearch/w"], 4)
+        self.assertGreater(server.stats["peak_in_flight"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
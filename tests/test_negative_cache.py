@@ -0,0 +1,108 @@
+import tempfile
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import MagicMock
+from conftest import make_announcement
+from first_filings.bse_client import BSEClient
+from first_filings.core import FirstFilingAnalyzer
+from first_filings.negative_cache import NO_QUOTE, NO_SYMBOL, NegativeCache
+
+TODAY = datetime(2026, 10, 19, 10, 0)
+
+
+SCRIP_INFO = {
+    # Delisted: lookup finds nothing
+    "1": {"symbol": None, "current_price": None},
+    # Suspended: no quote
+    "2": {"symbol": "SUSP", "current_price": None},
+    "3": {"symbol": "LIVE", "current_price": 10.0},
+}
+
+
+class TestNegativeCache(unittest.TestCase):
+    def test_entries_expire(self):
+        cache = NegativeCache()
+        cache.add("1", NO_SYMBOL, ttl_days=7, today=date(2026, 10, 19))
+
+        self.assertEqual(cache.get("1", today=date(2026, 10, 25)), NO_SYMBOL)
+        self.assertIsNone(cache.get("1", today=date(2026, 10, 26)))
+        self.assertIsNone(cache.get("2", today=date(2026, 10, 25)))
+
+        self.assertEqual(cache.prune(today=date(2026, 10, 26)), 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "bse.json"
+            cache = NegativeCache(path=path)
+            cache.add(500001, NO_QUOTE)
+            cache.save()
+            loaded = NegativeCache.load(path)
+
+            self.assertEqual(loaded.get("500001"), NO_QUOTE)
+            self.assertEqual(len(NegativeCache.load(Path(tmp) / "missing.json")), 0)
+
+
+class TestAnalyzerUsesNegativeCache(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.fetch_announcements.side_effect = self.fetch
+        self.client.get_scrip_info.side_effect = lambda scrip_code, when, **kwargs: (
+            dict(SCRIP_INFO[scrip_code])
+        )
+        self.cache = NegativeCache()
+
+    def fetch(self, from_date, to_date, category, scrip_code=None, **kwargs):
+        if scrip_code is None:
+            return [make_announcement(code) for code in ("1", "2", "3")]
+        return [make_announcement(scrip_code)]
+
+    def analyze(self):
+        analyzer = FirstFilingAnalyzer(self.client, negative_cache=self.cache)
+        filings = analyzer.analyze(TODAY, TODAY, ["Press Release"], 2)
+        return filings.get("Press Release", [])
+
+    def enriched_scrips(self):
+        return [c.args[0] for c in self.client.get_scrip_info.call_args_list]
+
+    def test_unresolved_scrips_are_skipped_until_expiry(self):
+        first = self.analyze()
+        self.assertEqual(self.enriched_scrips(), ["1", "2", "3"])
+        self.assertEqual(self.cache.get("1"), NO_SYMBOL)
+        self.assertEqual(self.cache.get("2"), NO_QUOTE)
+        self.assertIsNone(self.cache.get("3"))
+
+        self.client.get_scrip_info.reset_mock()
+        second = self.analyze()
+
+        # Only the live scrip is requested again; the output is unchanged
+        self.assertEqual(self.enriched_scrips(), ["3"])
+        self.assertEqual(
+            [f["scrip_code"] for f in second], [f["scrip_code"] for f in first]
+        )
+        self.assertEqual([f["scrip_code"] for f in second], ["2", "3"])
+        self.assertIsNone(second[0]["current_price"])
+
+    def test_resolved_scrip_leaves_cache(self):
+        self.cache.add("3", NO_QUOTE, ttl_days=0)
+        self.analyze()
+        self.assertNotIn("3", self.cache.entries)
+
+    def test_failed_calls_are_not_cached(self):
+        self.client.get_scrip_info.side_effect = ConnectionError("timed out")
+        self.assertEqual(self.analyze(), [])
+        self.assertEqual(len(self.cache), 0)
+
+    def test_failed_lookup_is_not_cached_as_no_symbol(self):
+        bse = MagicMock()
+        bse.lookup.side_effect = ConnectionError("500: Internal Server Error")
+        bse.quote.return_value = {"LTP": 10.0}
+        self.client.get_scrip_info.side_effect = BSEClient(bse=bse).get_scrip_info
+        # Still dropped for lack of a symbol, but retried next run
+        self.assertEqual(self.analyze(), [])
+        self.assertEqual(len(self.cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -24,8 +24,7 @@ from first_filings.nse_client import NSEClient
 
 class TestNSEClientDateParsing(unittest.TestCase):
     def setUp(self):
-        self.client = NSEClient()
-        self.client.nse = MagicMock()
+        self.client = NSEClient(nse=MagicMock())
 
     @patch('first_filings.nse_client.config')
     def test_fetch_announcements_date_parsing_an_dt(self, mock_config):
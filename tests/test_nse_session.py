@@ -0,0 +1,84 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from first_filings import config
+from first_filings.nse_client import NSEClient
+from first_filings.retries import is_auth_failure
+
+
+class TestNSESessionPersistence(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.session_dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _cookie_file(self, age_seconds):
+        cookie_file = self.session_dir / "nse_cookies_httpx.pkl"
+        cookie_file.write_bytes(b"cookies")
+        mtime = time.time() - age_seconds
+        os.utime(cookie_file, (mtime, mtime))
+        return cookie_file
+
+    @patch("first_filings.nse_client.NSE")
+    def test_reuses_fresh_cookies(self, MockNSE):
+        cookie_file = self._cookie_file(age_seconds=60)
+
+        NSEClient(session_dir=self.session_dir)
+
+        self.assertTrue(cookie_file.exists())
+        MockNSE.assert_called_once_with(download_folder=self.session_dir, server=True)
+
+    @patch("first_filings.nse_client.NSE")
+    def test_discards_expired_cookies(self, MockNSE):
+        cookie_file = self._cookie_file(age_seconds=config.NSE_SESSION_TTL + 60)
+
+        NSEClient(session_dir=self.session_dir)
+
+        self.assertFalse(cookie_file.exists())
+
+    @patch("first_filings.nse_client.NSE")
+    def test_rebootstraps_only_on_auth_failure(self, MockNSE):
+        stale, fresh = MagicMock(), MagicMock()
+        MockNSE.side_effect = [stale, fresh]
+        stale.announcements.side_effect = ConnectionError(
+            "https://www.nseindia.com/api/corporate-announcements 401: Unauthorized"
+        )
+        fresh.announcements.return_value = [
+            {"symbol": "TEST", "desc": "Press Release", "an_dt": "27-Oct-2023 10:30:00"}
+        ]
+        cookie_file = self._cookie_file(age_seconds=60)
+
+        client = NSEClient(session_dir=self.session_dir)
+        results = client.fetch_announcements(
+            from_date=None, to_date=None, category="Press Release"
+        )
+
+        self.assertEqual(len(results), 1)
+        self.assertIs(client.nse, fresh)
+        self.assertFalse(cookie_file.exists())
+        self.assertEqual(MockNSE.call_count, 2)
+
+    @patch("first_filings.nse_client.NSE")
+    def test_other_errors_do_not_rebootstrap(self, MockNSE):
+        MockNSE.return_value.quote.side_effect = ValueError("bad payload")
+
+        client = NSEClient(session_dir=self.session_dir)
+        with self.assertRaises(ValueError):
+            client._request("quote", "TEST")
+
+        self.assertEqual(MockNSE.call_count, 1)
+
+    def test_is_auth_failure(self):
+        self.assertTrue(is_auth_failure(ConnectionError("url 401: Unauthorized")))
+        self.assertTrue(is_auth_failure(ConnectionError("403: Forbidden")))
+        self.assertFalse(is_auth_failure(ConnectionError("503: Service Unavailable")))
+        self.assertFalse(is_auth_failure(TimeoutError("401")))
+
+
+if __name__ == "__main__":
+    unittest.main()
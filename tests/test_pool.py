@@ -0,0 +1,124 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+import requests
+from requests.adapters import HTTPAdapter
+from first_filings import config
+from first_filings.pool import ClientPool, tune_http_session
+
+
+class TestClientPool(unittest.TestCase):
+    def test_reuses_released_clients(self):
+        factory = MagicMock(side_effect=lambda: object())
+        pool = ClientPool(factory, size=2)
+
+        with pool.checkout() as first:
+            pass
+        with pool.checkout() as second:
+            pass
+
+        self.assertIs(first, second)
+        self.assertEqual(factory.call_count, 1)
+
+    def test_creates_up_to_size_then_blocks(self):
+        pool = ClientPool(lambda: object(), size=2)
+
+        a = pool.acquire()
+        b = pool.acquire()
+        self.assertIsNot(a, b)
+        self.assertEqual(pool.created, 2)
+
+        with self.assertRaises(TimeoutError):
+            pool.acquire(timeout=0.05)
+
+        pool.release(a)
+        self.assertIs(pool.acquire(timeout=0.05), a)
+
+    def test_warm_creates_clients_eagerly(self):
+        factory = MagicMock(side_effect=lambda: object())
+        pool = ClientPool(factory, size=3)
+
+        self.assertEqual(pool.warm(), 3)
+        self.assertEqual(pool.warm(), 0)
+        self.assertEqual(factory.call_count, 3)
+
+    def test_failed_factory_frees_slot(self):
+        factory = MagicMock(side_effect=[ConnectionError("503"), object()])
+        pool = ClientPool(factory, size=1)
+
+        with self.assertRaises(ConnectionError):
+            pool.acquire()
+
+        self.assertIsNotNone(pool.acquire(timeout=0.05))
+        self.assertEqual(pool.created, 1)
+
+    def test_concurrent_checkouts_never_share_a_client(self):
+        pool = ClientPool(lambda: object(), size=3)
+        in_use = set()
+        lock = threading.Lock()
+        errors = []
+
+        def worker():
+            for _ in range(50):
+                with pool.checkout(timeout=5) as client:
+                    with lock:
+                        if id(client) in in_use:
+                            errors.append(client)
+                        in_use.add(id(client))
+                    with lock:
+                        in_use.discard(id(client))
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(pool.created, 3)
+
+    def test_close_closes_clients(self):
+        client = MagicMock()
+        pool = ClientPool(lambda: client, size=1)
+        pool.warm()
+
+        pool.close()
+
+        client.close.assert_called_once()
+        self.assertEqual(pool.created, 0)
+
+
+class TestTuneHttpSession(unittest.TestCase):
+    def test_grows_adapters_in_place(self):
+        session = requests.Session()
+        retrying = HTTPAdapter(max_retries=3)
+        session.mount("https://", retrying)
+        tune_http_session(session, pool_maxsize=32)
+
+        # The library's adapter and its retries are kept
+        self.assertIs(session.get_adapter("https://example.com"), retrying)
+        self.assertEqual(retrying.max_retries.total, 3)
+        for url in ("https://example.com", "http://example.com"):
+            adapter = session.get_adapter(url)
+            self.assertEqual(adapter._pool_maxsize, 32)
+            self.assertEqual(adapter.poolmanager.connection_pool_kw["maxsize"], 32)
+
+    def test_default_size_covers_pool_and_hedge_workers(self):
+        session = requests.Session()
+        tune_http_session(session)
+        self.assertEqual(
+            session.get_adapter("https://example.com")._pool_maxsize,
+            config.CLIENT_POOL_SIZE + config.HEDGE_MAX_WORKERS,
+        )
+        # Never shrinks a larger pool
+        tune_http_session(session, pool_maxsize=2)
+        self.assertGreater(session.get_adapter("https://example.com")._pool_maxsize, 2)
+
+    def test_ignores_sessions_without_mount(self):
+        # Should not raise for non-requests sessions
+        tune_http_session(None)
+        tune_http_session(object())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -32,9 +32,8 @@ class TestRetries(unittest.TestCase):
         # Check if methods are decorated by inspecting if they have tenacity attributes
         # Or by mocking the underlying call and seeing if it retries.
 
-        client = NSEClient()
         # Mock the underlying nse object
-        client.nse = MagicMock()
+        client = NSEClient(nse=MagicMock())
 
         # Mock nse.announcements to fail twice then succeed
         client.nse.announcements.side_effect = [
@@ -78,8 +77,7 @@ class TestRetries(unittest.TestCase):
             self.assertEqual(client.bse.announcements.call_count, 2)
 
     def test_non_retryable_error_propagates(self):
-        client = NSEClient()
-        client.nse = MagicMock()
+        client = NSEClient(nse=MagicMock())
         client.nse.announcements.side_effect = ConnectionError("404 Not Found")
 
         with patch('time.sleep'):
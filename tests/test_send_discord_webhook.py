@@ -0,0 +1,197 @@
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from first_filings.ledger import DeliveryLedger
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "send_discord_webhook.py"
+spec = importlib.util.spec_from_file_location("send_discord_webhook", SCRIPT)
+webhook = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(webhook)
+
+
+class MockWebhook(ThreadingHTTPServer):
+    """Local Discord webhook: replays scripted responses, records payloads."""
+
+    def __init__(self, responses=()):
+        super().__init__(("127.0.0.1", 0), MockWebhookHandler)
+        self.responses = list(responses)
+        self.payloads = []
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/api/webhooks/1/token"
+
+
+class MockWebhookHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        with self.server.lock:
+            self.server.requests += 1
+            if self.server.responses:
+                status, headers = self.server.responses.pop(0)
+            else:
+                status, headers = 204, {}
+            if status in (200, 204):
+                self.server.payloads.append(json.loads(body))
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def fast_sleep(seconds):
+    time.sleep(min(seconds, 0.01))
+
+
+def output_document(rows_per_date=3):
+    row = ["500001", "Company", 10.0, 11.0, 100, "https://example.com/a.pdf", None]
+    return {
+        "meta": {"columns": webhook.ROW_FIELDS},
+        "data": {
+            "Press Release": {"2026-10-19": [row] * rows_per_date},
+            "PPT": {"2026-10-18": [row], "2026-10-19": [row]},
+        },
+    }
+
+
+class TestSendDiscordWebhook(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def start_server(self, responses=()):
+        server = MockWebhook(responses)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_json_output_is_delivered_through_rate_limits(self):
+        server = self.start_server(
+            [
+                (429, {"Retry-After": "0.05"}),
+                (
+                    204,
+                    {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "0.05"},
+                ),
+            ]
+        )
+        path = self.write("bse_output.json", json.dumps(output_document(), indent=2))
+
+        sender = webhook.WebhookSender(server.url, sleep=fast_sleep)
+        messages = webhook.iter_messages(
+            webhook.iter_embeds(webhook.iter_filings(path), "BSE")
+        )
+        self.assertEqual(sender.send_all(messages), (1, 0))
+
+        # The rate-limited post was retried, not dropped
+        self.assertEqual(server.requests, 2)
+        description = server.payloads[0]["embeds"][0]["description"]
+        self.assertTrue(description.startswith("## PPT\n### 2026-10-18\n"))
+        self.assertIn("## Press Release\n### 2026-10-19\n", description)
+
+    def test_ndjson_stream(self):
+        filing = {
+            "category": "PPT",
+            "scrip_code": "500001",
+            "company_name": "Company",
+            "date": "2026-10-19",
+            "price_at_announcement": 10.0,
+            "current_price": 11.0,
+            "current_mkt_cap_cr": 100,
+            "attachment_url": None,
+            "financial_snapshot": None,
+        }
+        path = self.write("filings.ndjson", "\n".join([json.dumps(filing)] * 2))
+
+        filings = list(webhook.iter_filings(path))
+        self.assertEqual(len(filings), 2)
+        self.assertEqual(filings[0][:2], ("PPT", "2026-10-19"))
+        self.assertEqual(filings[0][2][:2], ["500001", "Company"])
+
+        embeds = list(webhook.iter_embeds(filings, "BSE"))
+        self.assertEqual(embeds[0]["description"].count("## PPT\n"), 1)
+
+    def test_large_output_is_split_within_discord_limits(self):
+        path = self.write(
+            "bse_output.json", json.dumps(output_document(rows_per_date=200))
+        )
+        embeds = list(webhook.iter_embeds(webhook.iter_filings(path), "BSE"))
+        self.assertGreater(len(embeds), 1)
+        self.assertTrue(
+            embeds[1]["description"].startswith("## Press Release (cont.)\n")
+        )
+
+        for message in webhook.iter_messages(embeds):
+            self.assertLessEqual(len(message["embeds"]), 10)
+            self.assertLessEqual(
+                sum(len(e["title"]) + len(e["description"]) for e in message["embeds"]),
+                webhook.MAX_MESSAGE_CHARS,
+            )
+
+    def test_concurrent_workers_and_server_errors(self):
+        server = self.start_server([(503, {}), (502, {})])
+        sender = webhook.WebhookSender(server.url, workers=3, sleep=fast_sleep)
+        messages = ({"content": str(i)} for i in range(8))
+
+        self.assertEqual(sender.send_all(messages), (8, 0))
+        self.assertEqual(
+            sorted(int(p["content"]) for p in server.payloads), list(range(8))
+        )
+
+    def test_client_error_is_not_retried(self):
+        server = self.start_server([(400, {})])
+        sender = webhook.WebhookSender(server.url, sleep=fast_sleep)
+
+        self.assertEqual(sender.send_all([{"content": "x"}]), (0, 1))
+        self.assertEqual(server.requests, 1)
+
+    def test_ledger_skips_delivered_filings(self):
+        server = self.start_server([(500, {})] * webhook.MAX_ATTEMPTS)
+        path = self.write("bse_output.json", json.dumps(output_document()))
+        ledger = DeliveryLedger()
+        sender = webhook.WebhookSender(server.url, sleep=fast_sleep)
+
+        # A message Discord never accepted is not recorded
+        self.assertEqual(webhook.send_file(path, "BSE", sender, ledger), (0, 1))
+        self.assertEqual(len(ledger), 0)
+
+        self.assertEqual(webhook.send_file(path, "BSE", sender, ledger), (1, 0))
+        # Identical rows share one key (same scrip, date and attachment)
+        self.assertEqual(len(ledger), 3)
+        self.assertEqual(webhook.send_file(path, "BSE", sender, ledger), (0, 0))
+
+        # Only the new filing of an overlapping run is sent
+        document = output_document()
+        document["data"]["PPT"]["2026-10-20"] = [["500002", "New", 1, 1, 1, None, None]]
+        path = self.write("bse_output.json", json.dumps(document))
+        self.assertEqual(webhook.send_file(path, "BSE", sender, ledger), (1, 0))
+        self.assertEqual(len(server.payloads), 2)
+        self.assertIn("New", server.payloads[-1]["embeds"][0]["description"])
+        self.assertNotIn("Company", server.payloads[-1]["embeds"][0]["description"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import json
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from conftest import use_temp_cache
+from first_filings.exchange import Announcement
+from first_filings.server import AnalysisServer, AnalysisService
+
+
+def make_client():
+    client = MagicMock()
+    announcement = Announcement(
+        scrip_code="500001",
+        company_name="Test Corp",
+        date=datetime(2026, 3, 2, 10, 0),
+        category="PPT",
+        description="Investor Presentation",
+    )
+    client.fetch_announcements.side_effect = lambda **kwargs: (
+        [announcement] if "scrip_code" in kwargs or kwargs["category"] == "PPT" else []
+    )
+    client.get_scrip_info.return_value = {
+        "symbol": "TEST",
+        "company_name": "Test Corp",
+        "current_price": 110.0,
+        "price_at_announcement": 100.0,
+        "current_mkt_cap_cr": 500,
+    }
+    return client
+
+
+class TestAnalysisServer(unittest.TestCase):
+    def setUp(self):
+        use_temp_cache(self)
+        patcher = patch(
+            "first_filings.server.create_client", side_effect=lambda _: make_client()
+        )
+        self.create_client = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.service = AnalysisService(pool_size=2)
+        self.server = AnalysisServer(("127.0.0.1", 0), self.service)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def post(self, payload):
+        request = urllib.request.Request(
+            f"{self.url}/analyze",
+            data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_analyze(self):
+        status, body = self.post(
+            {"exchange": "bse", "date": "02-03-2026", "categories": ["presentations"]}
+        )
+
+        self.assertEqual(status, 200)
+        self.assertEqual(body["status"], "success")
+        self.assertEqual(body["meta"]["total_filings_found"], 1)
+        row = body["data"]["PPT"]["2026-03-02"][0]
+        self.assertEqual(row[:5], ["500001", "Test Corp", 100.0, 110.0, 500])
+
+    def test_clients_are_reused_across_requests(self):
+        for _ in range(3):
+            self.post({"exchange": "bse", "categories": ["PPT"]})
+
+        self.assertEqual(self.create_client.call_count, 1)
+        with urllib.request.urlopen(f"{self.url}/health", timeout=10) as response:
+            self.assertEqual(json.loads(response.read())["warm_clients"], {"bse": 1})
+
+    def test_concurrent_requests(self):
+        results = []
+
+        def worker():
+            results.append(self.post({"exchange": "nse-main", "categories": ["PPT"]}))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual([status for status, _ in results], [200] * 4)
+        self.assertLessEqual(self.create_client.call_count, 2)
+
+    def test_invalid_request(self):
+        status, body = self.post({"exchange": "lse"})
+        self.assertEqual(status, 400)
+        self.assertIn("Invalid exchange", body["error"])
+
+        status, body = self.post({"categories": ["Unknown"]})
+        self.assertEqual(status, 400)
+
+        status, body = self.post({"date": "2026/03/02"})
+        self.assertEqual(status, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+from conftest import FakeExchange, make_announcement
+from first_filings.core import FirstFilingAnalyzer
+from first_filings.pool import ClientPool
+from first_filings.shards import ShardCache, merge_shards, shard_ranges
+
+TODAY = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class TestShardHelpers(unittest.TestCase):
+    def test_shard_ranges(self):
+        start, end = datetime(2026, 7, 1), datetime(2026, 7, 16)
+        weeks = shard_ranges(start, end, 7)
+        self.assertEqual(
+            [(s.day, e.day) for s, e in weeks], [(1, 7), (8, 14), (15, 16)]
+        )
+        self.assertEqual(len(shard_ranges(start, end, 1)), 16)
+        self.assertEqual(shard_ranges(end, end, 7), [(end, end)])
+
+    def test_merge_dedupes_newest_first(self):
+        day = datetime(2026, 7, 1, 10)
+        a = make_announcement("1", day, announcement_id="a")
+        b = make_announcement("2", day + timedelta(days=1), announcement_id="b")
+        no_id = make_announcement("3", day)
+        merged = merge_shards([[a, no_id], [b, a, make_announcement("3", day)]])
+        self.assertEqual([x.scrip_code for x in merged], ["2", "1", "3"])
+
+
+class TestShardedFetch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = ShardCache(self.tmp.name)
+        # Two weeks up to today: the first shard is closed, the second is not
+        self.from_date, self.to_date = TODAY - timedelta(days=13), TODAY
+
+    def analyzer(self, exchange, pool_size=None):
+        pool = None
+        if pool_size:
+            pool = ClientPool(exchange.client, size=pool_size)
+            self.addCleanup(pool.close)
+        return FirstFilingAnalyzer(
+            exchange.client(), shard_days=7, client_pool=pool, shard_cache=self.cache
+        )
+
+    def test_shards_run_concurrently_and_merge(self):
+        exchange = FakeExchange(latency=0.1)
+        results = self.analyzer(exchange, pool_size=4).fetch_announcements(
+            self.from_date, self.to_date, ["Press Release", "PPT"]
+        )
+        self.assertEqual(len(exchange.calls), 4)
+        self.assertGreater(exchange.peak_in_flight, 1)
+        for category in ("Press Release", "PPT"):
+            dates = [a.date for a in results[category]]
+            self.assertEqual(len(dates), 14)
+            self.assertEqual(dates, sorted(dates, reverse=True))
+
+    def test_rerun_fetches_only_open_shards(self):
+        first = FakeExchange()
+        expected = self.analyzer(first).fetch_announcements(
+            self.from_date, self.to_date, ["Press Release"]
+        )
+
+        second = FakeExchange()
+        results = self.analyzer(second).fetch_announcements(
+            self.from_date, self.to_date, ["Press Release"]
+        )
+        self.assertEqual(
+            second.calls,
+            [("Press Release", (TODAY - timedelta(days=6)).date(), TODAY.date())],
+        )
+        self.assertEqual(results, {"Press Release": expected["Press Release"]})
+
+    def test_failed_shard_drops_only_its_category(self):
+        exchange = FakeExchange(fail_category="PPT")
+        results = self.analyzer(exchange, pool_size=2).fetch_announcements(
+            self.from_date, self.to_date, ["Press Release", "PPT"]
+        )
+        self.assertEqual(list(results), ["Press Release"])
+        self.assertIsNone(
+            self.cache.get("PPT", self.from_date, self.from_date + timedelta(days=6))
+        )
+
+    def test_partial_shard_is_not_cached(self):
+        analyzer = self.analyzer(FakeExchange(partial_category="PPT"))
+        results = analyzer.fetch_announcements(
+            self.from_date, self.to_date, ["Press Release", "PPT"]
+        )
+        self.assertEqual(results["PPT"], [])
+        self.assertEqual(analyzer.incomplete_categories, {"PPT"})
+        shard_end = self.from_date + timedelta(days=6)
+        self.assertIsNone(self.cache.get("PPT", self.from_date, shard_end))
+        self.assertEqual(
+            len(self.cache.get("Press Release", self.from_date, shard_end)), 7
+        )
+
+    def test_single_day_is_not_sharded(self):
+        client = MagicMock()
+        client.fetch_announcements.return_value = []
+        analyzer = FirstFilingAnalyzer(client, shard_days=1, shard_cache=self.cache)
+        analyzer.fetch_announcements(TODAY, TODAY, ["PPT"])
+        client.fetch_announcements.assert_called_once_with(
+            from_date=TODAY, to_date=TODAY, category="PPT", errors=[]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import io
+import json
+import tarfile
+import tempfile
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+from first_filings.last_filing import LastFilingTable
+from first_filings.negative_cache import NO_SYMBOL, NegativeCache
+from first_filings.snapshot import (
+    MANIFEST_FILE,
+    export_snapshot,
+    import_snapshot,
+)
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = Path(self.tmp.name)
+        self.source = root / "source"
+        self.target = root / "target"
+        self.snapshot = root / "artifacts" / "snapshot.tar.gz"
+
+        table = LastFilingTable()
+        table.update("Press Release", [], datetime(2026, 1, 1), datetime(2026, 10, 18))
+        table.save(self.source / "last_filing" / "bse.json")
+        cache = NegativeCache()
+        cache.add("500001", NO_SYMBOL)
+        cache.save(self.source / "unresolved" / "bse.json")
+        index_dir = self.source / "history" / "nse_main"
+        index_dir.mkdir(parents=True)
+        (index_dir / "vocab.json").write_text('{"version": 1}')
+        (index_dir / "keys.npy").write_bytes(bytes(range(256)) * 64)
+
+    def test_round_trip(self):
+        manifest = export_snapshot(self.snapshot, ["bse", "nse-main"], self.source)
+        self.assertEqual(manifest["exchanges"], ["bse", "nse-main"])
+        self.assertEqual(len(manifest["files"]), 4)
+
+        # Restoring replaces stale local state
+        stale = self.target / "last_filing" / "bse.json"
+        stale.parent.mkdir(parents=True)
+        stale.write_text("{}")
+        import_snapshot(self.snapshot, self.target)
+
+        for f in manifest["files"]:
+            self.assertEqual(
+                (self.target / f["path"]).read_bytes(),
+                (self.source / f["path"]).read_bytes(),
+            )
+        table = LastFilingTable.load(stale)
+        self.assertEqual(table.covered_through("Press Release"), date(2026, 10, 18))
+        cache = NegativeCache.load(self.target / "unresolved" / "bse.json")
+        self.assertEqual(cache.get("500001"), NO_SYMBOL)
+
+    def test_only_requested_exchanges(self):
+        manifest = export_snapshot(self.snapshot, ["nse-main"], self.source)
+        self.assertEqual(
+            [f["component"] for f in manifest["files"]],
+            ["history_index", "history_index"],
+        )
+        with self.assertRaises(ValueError):
+            export_snapshot(self.snapshot, ["nse-sme"], self.source)
+
+    def rewrite_snapshot(self, edit):
+        """Rebuild the snapshot with ``edit(manifest, contents)`` applied."""
+        with tarfile.open(self.snapshot, "r:gz") as tar:
+            members = {m.name: tar.extractfile(m).read() for m in tar}
+        manifest = json.loads(members.pop(MANIFEST_FILE))
+        edit(manifest, members)
+        with tarfile.open(self.snapshot, "w:gz") as tar:
+            for name, data in [(MANIFEST_FILE, json.dumps(manifest).encode())] + list(
+                members.items()
+            ):
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+
+    def test_corrupt_snapshot_leaves_cache_untouched(self):
+        export_snapshot(self.snapshot, ["bse", "nse-main"], self.source)
+
+        def corrupt(manifest, members):
+            members["history/nse_main/keys.npy"] = b"truncated"
+
+        self.rewrite_snapshot(corrupt)
+        with self.assertRaises(ValueError):
+            import_snapshot(self.snapshot, self.target)
+        self.assertEqual([p for p in self.target.rglob("*") if p.is_file()], [])
+
+    def test_rejects_unknown_version_and_unsafe_paths(self):
+        export_snapshot(self.snapshot, ["bse"], self.source)
+        self.rewrite_snapshot(lambda manifest, members: manifest.update(version=99))
+        with self.assertRaises(ValueError):
+            import_snapshot(self.snapshot, self.target)
+
+        def escape(manifest, members):
+            manifest["version"] = 1
+            manifest["files"][0]["path"] = "../escaped.json"
+            members["../escaped.json"] = members.pop("last_filing/bse.json")
+
+        self.rewrite_snapshot(escape)
+        with self.assertRaises(ValueError):
+            import_snapshot(self.snapshot, self.target)
+        self.assertFalse((Path(self.tmp.name) / "escaped.json").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 from unittest.mock import patch, mock_open, MagicMock
-from first_filings.utils import save_output, setup_logging
+from first_filings.utils import build_output, save_output, setup_logging
 
 class TestUtils(unittest.TestCase):
     def test_setup_logging_dir_creation(self):
@@ -110,5 +110,9 @@ class TestUtils(unittest.TestCase):
                 self.assertIn("Failed to save output file", args[0])
                 self.assertIn("Permission denied", args[0])
 
+    def test_build_output_records_enrich_level(self):
+        self.assertEqual(build_output({}, 0, 2)["meta"]["enrich_level"], "full")
+        self.assertEqual(build_output({}, 0, 2, "none")["meta"]["enrich_level"], "none")
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,101 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from conftest import FakeExchange, make_announcement
+from first_filings.core import FirstFilingAnalyzer
+from first_filings.utils import read_bhavcopy
+from first_filings.verdicts import VerdictStore, refresh_price
+
+TODAY = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+
+
+class TestVerdictStore(unittest.TestCase):
+    def test_round_trip_and_prune(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "verdicts" / "bse.json"
+            store = VerdictStore(path=path)
+            history = {"days_since_previous": 400, "first_within_years": {1: True}}
+            store.put("new", TODAY, first=True, history=history)
+            store.put("old", TODAY - timedelta(days=200), first=False)
+            self.assertEqual(store.prune(today=TODAY.date()), 1)
+            self.assertIsNone(store.get("old"))
+            store.save()
+
+            loaded = VerdictStore.load(path)
+            self.assertEqual(loaded.get("new")["history"], history)
+            self.assertIs(loaded.get("new")["first"], True)
+
+    def test_refresh_price_scales_market_cap(self):
+        filing = {"scrip_code": "1", "current_price": 100.0, "current_mkt_cap_cr": 1000}
+        refreshed = refresh_price(filing, {"1": 150.0})
+        self.assertEqual(refreshed["current_price"], 150.0)
+        self.assertEqual(refreshed["current_mkt_cap_cr"], 1500)
+        self.assertIs(refresh_price(filing, {"2": 1.0}), filing)
+
+    def test_read_bhavcopy_prefers_eq_series(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "bhav.csv"
+            path.write_text(
+                "TradDt,FinInstrmId,TckrSymb,SctySrs,ClsPric\n"
+                "2026-10-19,500001,ABC,BE,10.5\n"
+                "2026-10-19,500001,ABC,EQ,11.0\n"
+                "2026-10-19,500002,XYZ,A,-\n"
+            )
+            self.assertEqual(read_bhavcopy(path, "TckrSymb"), {"ABC": 11.0})
+
+
+class TestIncrementalEvaluation(unittest.TestCase):
+    def setUp(self):
+        self.feed = [make_announcement(code) for code in ("1", "2", "3")]
+        self.store = VerdictStore()
+
+    def exchange(self):
+        # Scrip 1 is a first filing, 2 is not, and history for 3 fails
+        exchange = FakeExchange(self.feed, first_scrips={"1"}, failing_scrips={"3"})
+        return exchange, exchange.client()
+
+    def evaluate(self, client, **kwargs):
+        analyzer = FirstFilingAnalyzer(client, verdict_store=self.store, **kwargs)
+        return analyzer, analyzer.evaluate({"Press Release": self.feed}, 2)
+
+    def test_rerun_checks_only_new_or_failed_announcements(self):
+        first, client = self.exchange()
+        _, results = self.evaluate(client)
+        self.assertEqual(first.history_calls, ["1", "2", "3"])
+        self.assertEqual([f["scrip_code"] for f in results["Press Release"]], ["1"])
+
+        self.feed.append(make_announcement("4"))
+        second, client = self.exchange()
+        analyzer, rerun = self.evaluate(client)
+        # 3 failed last time, so it is checked again; 4 is new
+        self.assertEqual(second.history_calls, ["3", "4"])
+        client.get_scrip_info.assert_not_called()
+        self.assertEqual(rerun, results)
+        self.assertEqual(analyzer.failed_checks_count, 1)
+
+    def test_reused_filings_get_bulk_prices(self):
+        self.evaluate(self.exchange()[1])
+
+        _, client = self.exchange()
+        client.bulk_prices.side_effect = [None, {"1": 120.0}]
+        _, results = self.evaluate(client, refresh_prices=True)
+        filing = results["Press Release"][0]
+        self.assertEqual(filing["current_price"], 120.0)
+        self.assertEqual(filing["current_mkt_cap_cr"], 1200)
+        # Walked back one day to the last published report
+        self.assertEqual(client.bulk_prices.call_count, 2)
+        client.get_scrip_info.assert_not_called()
+
+    def test_other_enrich_level_reenriches_without_rechecking(self):
+        self.evaluate(self.exchange()[1], enrich_level="none")
+
+        second, client = self.exchange()
+        _, results = self.evaluate(client)
+        self.assertEqual(second.history_calls, ["3"])
+        client.get_scrip_info.assert_called_once()
+        self.assertEqual(results["Press Release"][0]["current_price"], 100.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
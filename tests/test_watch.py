@@ -0,0 +1,111 @@
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock
+from conftest import make_announcement
+from first_filings.core import FirstFilingAnalyzer
+from first_filings.exchange import announcement_key
+from first_filings.watch import AnnouncementWatcher
+
+
+class TestAnnouncementKey(unittest.TestCase):
+    def test_uses_exchange_id(self):
+        a = make_announcement("500001", announcement_id="N1")
+        b = make_announcement("999", announcement_id="N1")
+        self.assertEqual(announcement_key(a), announcement_key(b))
+
+    def test_category_is_part_of_key(self):
+        a = make_announcement("500001", category="PPT", announcement_id="N1")
+        b = make_announcement("500001", announcement_id="N1")
+        self.assertNotEqual(announcement_key(a), announcement_key(b))
+
+    def test_fallback_without_id(self):
+        a = make_announcement("500001")
+        b = make_announcement("999")
+        self.assertNotEqual(announcement_key(a), announcement_key(b))
+
+
+class TestAnnouncementWatcher(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.analyzer = FirstFilingAnalyzer(self.client)
+        self.feed = [make_announcement("500001", announcement_id="N1")]
+        self.client.fetch_announcements.side_effect = (
+            lambda from_date, to_date, category, **kwargs: (
+                list(self.feed) if category == "Press Release" else []
+            )
+        )
+        self.analyzer.evaluate = MagicMock(
+            side_effect=lambda by_cat, lookback: {
+                cat: [{"scrip_code": a.scrip_code} for a in anns]
+                for cat, anns in by_cat.items()
+            }
+        )
+        self.watcher = AnnouncementWatcher(self.analyzer, ["Press Release"], 2)
+
+    def test_only_new_announcements_are_evaluated(self):
+        now = datetime(2026, 10, 19, 10, 5)
+
+        new_count, filings = self.watcher.poll(now)
+        self.assertEqual(new_count, 1)
+        self.assertEqual(filings, {"Press Release": [{"scrip_code": "500001"}]})
+
+        self.feed.append(make_announcement("500002", announcement_id="N2"))
+        new_count, filings = self.watcher.poll(now)
+        self.assertEqual(new_count, 1)
+        self.assertEqual(filings, {"Press Release": [{"scrip_code": "500002"}]})
+
+        new_count, filings = self.watcher.poll(now)
+        self.assertEqual((new_count, filings), (0, {}))
+        self.assertEqual(self.analyzer.evaluate.call_count, 2)
+
+    def test_failed_checks_are_retried(self):
+        history = [ConnectionError("404: Not Found"), list(self.feed)]
+
+        def fetch(from_date, to_date, category, scrip_code=None, **kwargs):
+            if scrip_code is None:
+                return list(self.feed) if category == "Press Release" else []
+            result = history.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        self.client.fetch_announcements.side_effect = fetch
+        self.client.get_scrip_info.return_value = {"symbol": "SYM"}
+        watcher = AnnouncementWatcher(
+            FirstFilingAnalyzer(self.client), ["Press Release"], 2
+        )
+        now = datetime(2026, 10, 19, 10, 5)
+
+        self.assertEqual(watcher.poll(now), (1, {}))
+        new_count, filings = watcher.poll(now)
+        self.assertEqual(new_count, 1)
+        self.assertEqual(filings["Press Release"][0]["scrip_code"], "500001")
+        self.assertEqual(watcher.poll(now), (0, {}))
+
+    def test_buffers_are_cleared_each_poll(self):
+        now = datetime(2026, 10, 19, 10, 5)
+        self.watcher.poll(now)
+        self.watcher.poll(now)
+        self.assertEqual(self.client.clear_buffers.call_count, 2)
+
+    def test_seen_set_resets_on_new_day(self):
+        self.watcher.poll(datetime(2026, 10, 19, 23, 55))
+        new_count, _ = self.watcher.poll(datetime(2026, 10, 20, 0, 5))
+        self.assertEqual(new_count, 1)
+
+    def test_run_continues_after_failed_cycle(self):
+        self.client.clear_buffers.side_effect = [RuntimeError("boom"), None]
+        cycles = []
+        sleeps = []
+        self.watcher.run(
+            5,
+            lambda cycle, new, filings: cycles.append((cycle, new)),
+            max_cycles=2,
+            sleep=sleeps.append,
+        )
+        self.assertEqual(cycles, [(1, 0), (2, 1)])
+        self.assertEqual(sleeps, [5])
+
+
+if __name__ == "__main__":
+    unittest.main()